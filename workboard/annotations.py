@@ -0,0 +1,67 @@
+"""
+annotations.py
+
+A side layer of text annotations: strings at anchor points, kept next to a
+model instead of as solid geometry in it, for a viewer to draw.
+
+Usage::
+
+    easel = Easel({"label_mode": "annotation"})
+    asm = easel.render()
+    write_annotations(easel.annotations, "out/easel.annotations.json")
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Tuple
+
+Point = Tuple[float, float, float]
+
+
+@dataclass
+class Annotation:
+    """
+    A text label.
+
+    Attributes:
+        text (str): the label's text.
+        position (tuple): (x, y, z) where the label is drawn, in mm.
+        anchor (tuple): (x, y, z) of the point it labels, e.g. a part's
+            bounding box center.
+        size (float): font size in mm.
+        target (str): label of the annotated part.
+    """
+
+    text: str
+    position: Point
+    anchor: Point
+    size: float = 40.0
+    target: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def write_annotations(annotations: Iterable[Annotation], path: str) -> str:
+    """Write annotations as JSON: {"annotations": [{text, position, anchor, size, target}]}."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"annotations": [a.to_dict() for a in annotations]}, f, indent=1)
+    return path
+
+
+def read_annotations(path: str) -> list[Annotation]:
+    with open(path) as f:
+        data = json.load(f)
+    return [
+        Annotation(
+            text=a["text"],
+            position=tuple(a["position"]),
+            anchor=tuple(a["anchor"]),
+            size=a["size"],
+            target=a["target"],
+        )
+        for a in data["annotations"]
+    ]
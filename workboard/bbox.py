@@ -0,0 +1,96 @@
+"""
+bbox.py
+
+Memoized bounding boxes for layout math.
+
+``bounding_box(shape)`` returns the same result as ``shape.bounding_box()``
+but computes it once per shape: results are kept in an LRU cache keyed by
+the shape's OCCT identity (its TShape, location and orientation). Moving a
+shape, in place (``move()``/``locate()``) or not (``translate()``,
+``rotate()``, ...), changes its location and therefore its key, so a moved
+shape is never served a stale box; shapes that share geometry at the same
+location (see instancing.py) share an entry.
+
+``optimal=False`` uses OCCT's fast bounding box, which may be larger than
+the shape by its tolerances (and triangulation), for coarse checks.
+
+Usage::
+
+    from workboard.bbox import bounding_box, center, extent
+
+    x = center(leg_a).X
+    width, depth, height = extent(board)
+    bounding_box(part, optimal=False).max.Z
+
+Treat the returned boxes as read-only: they're shared by every caller.
+"""
+
+from collections import OrderedDict
+from typing import Any, List, Tuple
+
+from build123d import BoundBox, Vector
+
+
+class BoundingBoxCache:
+    """
+    An LRU cache of BoundBoxes keyed by OCCT shape identity.
+
+    Args:
+        maxsize (int): maximum number of boxes kept.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        # {(hash of the TopoDS shape, optimal): [(snapshot of the TopoDS shape, BoundBox)]}
+        self._entries: "OrderedDict[Tuple[int, bool], List[Tuple[Any, BoundBox]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, shape, optimal: bool = True) -> BoundBox:
+        """Return shape's BoundBox, computing it if it isn't cached."""
+        wrapped = shape.wrapped
+        key = (hash(wrapped), optimal)
+        bucket = self._entries.get(key)
+        if bucket is not None:
+            for snapshot, bbox in bucket:
+                if snapshot.IsEqual(wrapped):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return bbox
+        self.misses += 1
+        bbox = BoundBox.from_topo_ds(wrapped, optimal=optimal)
+        # a separate TopoDS value, so that moving shape in place doesn't move the key
+        snapshot = wrapped.Located(wrapped.Location())
+        self._entries.setdefault(key, []).append((snapshot, bbox))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return bbox
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._entries.values())
+
+
+CACHE = BoundingBoxCache()
+
+
+def bounding_box(shape, optimal: bool = True) -> BoundBox:
+    """Return shape.bounding_box(optimal=optimal), memoized."""
+    return CACHE.get(shape, optimal)
+
+
+def center(shape, optimal: bool = True) -> Vector:
+    """Return the center of shape's bounding box."""
+    return bounding_box(shape, optimal).center()
+
+
+def extent(shape, optimal: bool = True) -> Vector:
+    """Return the size (X, Y, Z) of shape's bounding box."""
+    return bounding_box(shape, optimal).size
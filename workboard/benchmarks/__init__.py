@@ -0,0 +1,7 @@
+"""
+workboard.benchmarks
+
+Benchmarks of render and export of every project model.
+
+See ``python -m workboard.benchmarks --help``.
+"""
@@ -0,0 +1,90 @@
+"""
+python -m workboard.benchmarks
+
+Usage::
+
+    $ python -m workboard.benchmarks --list
+    $ python -m workboard.benchmarks --save benchmarks/baseline.json
+    $ python -m workboard.benchmarks render: export:.step --baseline benchmarks/baseline.json --threshold 0.5
+"""
+
+import argparse
+import sys
+from typing import Optional, Sequence
+
+from workboard.benchmarks import cases, runner
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m workboard.benchmarks",
+        description="Benchmark render and export of the project models.",
+    )
+    parser.add_argument(
+        "patterns", nargs="*", help="only run cases whose names contain one of these"
+    )
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timed runs per case (default: 3)"
+    )
+    parser.add_argument(
+        "--no-isolate", action="store_true", help="run cases in this process"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument(
+        "--save",
+        metavar="PATH",
+        help="write the results as a new baseline to this path",
+    )
+    parser.add_argument(
+        "--baseline", help="compare the results to this baseline; exit 1 on regressions"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown (default: 0.25)",
+    )
+    parser.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=None,
+        help="allowed relative peak RSS growth (default: --threshold)",
+    )
+    args = parser.parse_args(argv)
+
+    selected = cases.select(args.patterns)
+    if args.list:
+        for case in selected:
+            print(case.name)
+        return 0
+    if not selected:
+        parser.error(f"no cases match {args.patterns}")
+
+    results = runner.run(
+        selected,
+        repeat=args.repeat,
+        isolate=not args.no_isolate,
+        progress=lambda name, result: print(
+            runner.format_result(name, result), flush=True
+        ),
+    )
+    for path in (args.output, args.save):
+        if path:
+            runner.save(path, results)
+
+    if args.baseline:
+        comparison = runner.compare(
+            runner.load(args.baseline), results, args.threshold, args.rss_threshold
+        )
+        for note in comparison["notes"]:
+            print(f"NOTE: {note}")
+        for regression in comparison["regressions"]:
+            print(f"REGRESSION: {regression}")
+        if comparison["regressions"]:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+cases.py
+
+Benchmark cases: render of every project model, linspace_rational,
+export of each format and the startup time of the command-line tools.
+
+A case is a setup() that returns the state to benchmark (untimed) and a
+run(state) that is timed; run() returns the shape to count (or None).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+from workboard.exporting import FORMATS
+
+
+class Case:
+    """
+    A benchmark case.
+
+    Args:
+        name (str): unique name, "<group>:<what>".
+        run: callable(state) -> shape or None; the timed part.
+        setup: optional callable() -> state; not timed.
+        teardown: optional callable(state); not timed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Any], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        teardown: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.teardown = teardown or (lambda state: None)
+
+    @property
+    def group(self) -> str:
+        return self.name.split(":", 1)[0]
+
+    def __repr__(self) -> str:
+        return f"Case({self.name!r})"
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(
+    name: str,
+    setup: Optional[Callable[[], Any]] = None,
+    teardown: Optional[Callable[[Any], Any]] = None,
+):
+    """Decorator: register run(state) as the benchmark case name."""
+
+    def decorator(run: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        CASES[name] = Case(name, run, setup, teardown)
+        return run
+
+    return decorator
+
+
+# --- render ---
+
+
+def _workboard():
+    from workboard.projects.workboard.workboard01 import Workboard
+
+    obj = Workboard(id=1, name="workboard01")
+    obj.init()
+    return obj
+
+
+@case("render:workboard", setup=_workboard)
+def render_workboard(obj):
+    from workboard.subparts import MEMO_ATTR
+
+    # neither the render cache nor memoized sub-parts
+    vars(obj).pop(MEMO_ATTR, None)
+    data = type(obj).render.uncached(obj)
+    return data["assemblies"]["workboard_assembly"]
+
+
+@case("render:easel")
+def render_easel(state):
+    from workboard.projects.easel.easel01 import Easel
+
+    return Easel().render()
+
+
+@case("render:pizzapancoolingmat")
+def render_pizzapancoolingmat(state):
+    from workboard.projects.pizzapancoolingmat.pizzapancoolingmat import (
+        PizzaPanCoolingMatAssembly,
+    )
+
+    return PizzaPanCoolingMatAssembly({}).render()
+
+
+def _mushroom_case(mode_name: str) -> None:
+    @case(f"render:mushroom[{mode_name}]")
+    def render_mushroom(state):
+        from workboard.projects.umbrellastandstopper.umbrellastandstopper01 import (
+            MushroomModes,
+            mushroom,
+        )
+
+        return mushroom(mode=getattr(MushroomModes, mode_name))
+
+
+for _mode_name in ("spherical", "ellipsoid", "cylinder_holes", "cylinder_diamond"):
+    _mushroom_case(_mode_name)
+
+
+# --- linspace_rational ---
+
+
+@case("linspace_rational:1000")
+def linspace_rational_1000(state):
+    from workboard.linspace_rational import linspace_rational
+
+    linspace_rational(0, 1, 1000)
+    linspace_rational(0, 3, 1000, endpoint=False)
+    return None
+
+
+# --- export ---
+
+
+def _export_case(ext: str, profile: Optional[str] = None) -> None:
+    def setup():
+        obj = _workboard()
+        data = obj.render()
+        return data, tempfile.mkdtemp(prefix="workboard-bench-")
+
+    def teardown(state):
+        shutil.rmtree(state[1], ignore_errors=True)
+
+    @case(
+        f"export:{ext}" + (f":{profile}" if profile else ""),
+        setup=setup,
+        teardown=teardown,
+    )
+    def export(state):
+        from workboard.exporting import export_parts
+
+        data, directory = state
+        export_parts(
+            data["assemblies"].items(),
+            filename_prefix=os.path.join(directory, "bench_"),
+            formats=(ext,),
+            max_workers=0,
+            force=True,
+            profile=profile,
+        )
+        return data["assemblies"]["workboard_assembly"]
+
+
+for _ext in FORMATS:
+    _export_case(_ext)
+_export_case(".gltf", "preview")
+
+
+# --- startup ---
+
+
+def _startup_case(name: str, args: List[str]) -> None:
+    @case(f"startup:{name}")
+    def startup(state):
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, check=True)
+        return None
+
+
+_startup_case("python", ["-c", "pass"])
+_startup_case("workboard --help", ["-m", "workboard.cli", "--help"])
+for _arg in ("--help", "--list-props", "--list-props-schema"):
+    _startup_case(
+        f"pizzapancoolingmat {_arg}",
+        ["-m", "workboard.projects.pizzapancoolingmat.main", _arg],
+    )
+
+
+def select(patterns: Optional[List[str]] = None) -> List[Case]:
+    """Return the cases whose names contain any of patterns (default: all)."""
+    if not patterns:
+        return list(CASES.values())
+    return [c for name, c in CASES.items() if any(p in name for p in patterns)]
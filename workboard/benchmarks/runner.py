@@ -0,0 +1,204 @@
+"""
+runner.py
+
+Run benchmark cases, each in a fresh forked process, and compare the
+results to a JSON baseline.
+
+For every case the runner records the wall time of each repeat (and their
+min/median), the peak RSS of the case's process and the OCCT shape counts
+(solids, faces, edges, vertices) of the shape the case returns.
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from workboard.benchmarks.cases import CASES, Case
+
+
+def shape_counts(shape) -> Optional[Dict[str, int]]:
+    """Return the numbers of unique solids, faces, edges and vertices of shape."""
+    if shape is None:
+        return None
+    return {
+        "solids": len(shape.solids()),
+        "faces": len(shape.faces()),
+        "edges": len(shape.edges()),
+        "vertices": len(shape.vertices()),
+    }
+
+
+def _rss_kb() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def run_case(case: Case, repeat: int = 3) -> Dict[str, Any]:
+    """Run case repeat times in this process and return its result."""
+    result: Dict[str, Any] = {
+        "wall_s": None,
+        "wall_s_median": None,
+        "wall_s_all": [],
+        "rss_start_kb": _rss_kb(),
+        "peak_rss_kb": None,
+        "shapes": None,
+        "error": None,
+    }
+    try:
+        state = case.setup()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                shape = case.run(state)
+                result["wall_s_all"].append(time.perf_counter() - start)
+            result["shapes"] = shape_counts(shape)
+        finally:
+            case.teardown(state)
+        result["wall_s"] = min(result["wall_s_all"])
+        result["wall_s_median"] = statistics.median(result["wall_s_all"])
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        result["traceback"] = traceback.format_exc()
+    result["peak_rss_kb"] = _peak_rss_kb()
+    return result
+
+
+def _run_case_by_name(name: str, repeat: int) -> Dict[str, Any]:
+    return run_case(CASES[name], repeat)
+
+
+def run_isolated(case: Case, repeat: int = 3) -> Dict[str, Any]:
+    """Run case in a fresh forked process, so its peak RSS is its own."""
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_case_by_name, case.name, repeat).result()
+
+
+def metadata() -> Dict[str, Any]:
+    import build123d
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "build123d": build123d.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(
+    cases: List[Case], repeat: int = 3, isolate: bool = True, progress=None
+) -> Dict[str, Any]:
+    """
+    Run cases and return {"meta": ..., "cases": {name: result}}.
+
+    Args:
+        cases: Case objects, e.g. from cases.select().
+        repeat (int): timed runs per case.
+        isolate (bool): run each case in a fresh forked process.
+        progress: optional callable(name, result) called after each case.
+    """
+    results = {"meta": metadata(), "cases": {}}
+    for case in cases:
+        result = run_isolated(case, repeat) if isolate else run_case(case, repeat)
+        results["cases"][case.name] = result
+        if progress is not None:
+            progress(case.name, result)
+    return results
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.25,
+    rss_threshold: Optional[float] = None,
+) -> Dict[str, List[str]]:
+    """
+    Compare benchmark results to a baseline.
+
+    Args:
+        baseline: results of run() (e.g. loaded from a baseline file).
+        current: results of run().
+        threshold (float): allowed relative wall-time slowdown (0.25: 25%).
+        rss_threshold (float): allowed relative peak-RSS growth (None: threshold).
+
+    Returns:
+        dict: {"regressions": [...], "notes": [...]} messages; any
+        regression should fail the run.
+    """
+    if rss_threshold is None:
+        rss_threshold = threshold
+    regressions: List[str] = []
+    notes: List[str] = []
+    for name, now in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            notes.append(f"{name}: not in baseline")
+            continue
+        if now["error"]:
+            if not base["error"]:
+                regressions.append(f"{name}: fails: {now['error']}")
+            continue
+        if base["error"]:
+            notes.append(f"{name}: fixed (baseline: {base['error']})")
+            continue
+        if now["wall_s"] > base["wall_s"] * (1 + threshold):
+            regressions.append(
+                f"{name}: wall time {now['wall_s']:.4f}s > {base['wall_s']:.4f}s "
+                f"(+{now['wall_s'] / base['wall_s'] - 1:.0%}, threshold +{threshold:.0%})"
+            )
+        if base.get("peak_rss_kb") and now["peak_rss_kb"] > base["peak_rss_kb"] * (
+            1 + rss_threshold
+        ):
+            regressions.append(
+                f"{name}: peak RSS {now['peak_rss_kb']} KiB > {base['peak_rss_kb']} KiB "
+                f"(threshold +{rss_threshold:.0%})"
+            )
+        if now["shapes"] != base["shapes"]:
+            notes.append(
+                f"{name}: shape counts changed: {base['shapes']} -> {now['shapes']}"
+            )
+    return {"regressions": regressions, "notes": notes}
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """Return a one-line summary of a case result."""
+    if result["error"]:
+        return f"{name:32s} ERROR {result['error']}"
+    shapes = result["shapes"] or {}
+    return (
+        f"{name:32s} {result['wall_s']:9.4f}s (median {result['wall_s_median']:.4f}s)  "
+        f"peak RSS {result['peak_rss_kb'] / 1024:7.1f} MiB  "
+        f"solids {shapes.get('solids', '-')} faces {shapes.get('faces', '-')}"
+    )
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: str, results: Dict[str, Any]) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
@@ -0,0 +1,65 @@
+"""
+test_benchmarks.py
+"""
+
+from workboard.benchmarks import cases, runner
+from workboard.benchmarks.__main__ import main
+
+
+def _results(**cases_):
+    return {"meta": {}, "cases": cases_}
+
+
+def _case(wall_s=1.0, peak_rss_kb=1000, shapes=None, error=None):
+    return {
+        "wall_s": wall_s,
+        "peak_rss_kb": peak_rss_kb,
+        "shapes": shapes,
+        "error": error,
+    }
+
+
+def test_cases_cover_every_model_and_format():
+    names = set(cases.CASES)
+    assert {"render:workboard", "render:easel", "render:pizzapancoolingmat"} <= names
+    assert {"export:.step", "export:.stl", "export:.txt.stl", "export:.gltf"} <= names
+    assert len([n for n in names if n.startswith("render:mushroom[")]) == 4
+    assert [c.name for c in cases.select(["linspace"])] == ["linspace_rational:1000"]
+
+
+def test_compare():
+    baseline = _results(
+        a=_case(),
+        b=_case(),
+        c=_case(),
+        d=_case(error="X"),
+        e=_case(shapes={"solids": 1}),
+    )
+    current = _results(
+        a=_case(wall_s=1.2),
+        b=_case(wall_s=1.3),
+        c=_case(peak_rss_kb=2000),
+        d=_case(),
+        e=_case(shapes={"solids": 2}),
+        f=_case(),
+    )
+    comparison = runner.compare(baseline, current, threshold=0.25)
+    assert [r.split(":")[0] for r in comparison["regressions"]] == ["b", "c"]
+    assert [n.split(":")[0] for n in comparison["notes"]] == ["d", "e", "f"]
+    assert runner.compare(baseline, current, threshold=0.25, rss_threshold=1.5)[
+        "regressions"
+    ][0].startswith("b:")
+
+
+def test_run_isolated_and_baseline(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    assert main(["linspace_rational", "--repeat", "1", "--save", baseline]) == 0
+    result = runner.load(baseline)["cases"]["linspace_rational:1000"]
+    assert result["error"] is None
+    assert result["wall_s"] > 0
+    assert result["peak_rss_kb"] > 0
+
+    results = runner.run(
+        [cases.CASES["render:mushroom[spherical]"]], repeat=1, isolate=False
+    )
+    assert results["cases"]["render:mushroom[spherical]"]["shapes"]["solids"] == 1
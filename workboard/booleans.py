@@ -0,0 +1,68 @@
+"""
+booleans.py
+
+Batched boolean operations.
+
+Cutting, fusing or intersecting features one at a time (``cap = cap -
+hole`` in a loop) runs one OCCT boolean per feature, each against a result
+that grows more complex with every step. These helpers pass all the tool
+bodies to a single multi-argument boolean (one BRepAlgoAPI_Cut or
+BRepAlgoAPI_Fuse), which intersects the faces of every body in one pass.
+
+Usage::
+
+    cap = cut_all(cap, holes)                   # == cap - h1 - h2 - ...
+    lattice = fuse_all(rods)                    # == r1 + r2 + ...
+    lattice = clip_all(rods, Cylinder(r, h))    # == (r1 & c) + (r2 & c) + ...
+"""
+
+from typing import Any, Sequence
+
+
+def cut_all(base, tools: Sequence[Any]):
+    """
+    Return base with every tool body cut from it, in one boolean.
+
+    Args:
+        base: the shape to cut from.
+        tools: the shapes to remove; they may overlap each other.
+
+    Returns:
+        Shape: base itself if there are no tools.
+    """
+    tools = list(tools)
+    if not tools:
+        return base
+    return base - tools
+
+
+def fuse_all(shapes: Sequence[Any], glue: bool = False):
+    """
+    Return the union of shapes, in one boolean.
+
+    Args:
+        shapes: at least one shape.
+        glue (bool): use OCCT's glue option, faster when the shapes only
+            share faces (touch) and don't otherwise overlap.
+
+    Raises:
+        ValueError: if shapes is empty.
+    """
+    shapes = list(shapes)
+    if not shapes:
+        raise ValueError("fuse_all() needs at least one shape")
+    first, *others = shapes
+    if not others:
+        return first
+    return first.fuse(*others, glue=glue).clean()
+
+
+def clip_all(shapes: Sequence[Any], tool):
+    """
+    Return the union of shapes, clipped to tool.
+
+    The shapes are fused first (one boolean) and then intersected with tool
+    once, instead of clipping each shape and fusing the pieces. Shapes that
+    lie outside tool contribute nothing (rather than an empty compound).
+    """
+    return fuse_all(shapes) & tool
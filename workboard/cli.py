@@ -0,0 +1,408 @@
+"""
+cli.py
+
+The ``workboard`` command.
+
+Usage::
+
+    $ workboard render
+    $ workboard sweep workboard --grid circle_diameter=28,30,32 --grid feet_height=15,20 \\
+        --output-dir out/sweep --jsonl out/sweep/results.jsonl
+    $ workboard sweep pizzapancoolingmat --grid pan.diameter=300,330 --set riser.height=12
+    $ workboard sweep mushroom --variants variants.json -j 4
+    $ workboard --quality draft sweep easel --grid leg_a_len=1400,1500
+    $ workboard --timing timing.json --trace trace.json render
+    $ workboard serve --socket /tmp/workboard.sock -j 2 --output-dir out/server
+    $ workboard svg compile workboard/projects/workboard --output groove_handles.py
+    $ workboard stl diff out/a/workboard01__part__feet.stl out/b/workboard01__part__feet.stl
+    $ workboard fingerprint snapshot easel pizzapancoolingmat -o fingerprints.json
+    $ workboard fingerprint check fingerprints.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def parse_value(text: str) -> Any:
+    """Parse a JSON value (number, list, ...), falling back to the string itself."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_assignment(text: str):
+    """Parse ``name=value``."""
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {text!r}")
+    return name, value
+
+
+def parse_grid_values(text: str) -> List[Any]:
+    """Parse a grid axis: a JSON list, or comma-separated values."""
+    value = parse_value(text)
+    if isinstance(value, list):
+        return value
+    return [parse_value(v) for v in text.split(",")]
+
+
+def sweep_variants(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Return the variants of the sweep subcommand's --variants, --grid and --set."""
+    from workboard.sweep import expand_grid
+
+    if args.variants:
+        with open(args.variants) as f:
+            variants = json.load(f)
+    else:
+        variants = [{}]
+    if args.grid:
+        grid = {name: parse_grid_values(value) for name, value in args.grid}
+        variants = [{**v, **g} for v in variants for g in expand_grid(grid)]
+    fixed = {name: parse_value(value) for name, value in args.set or ()}
+    return [{**v, **fixed} for v in variants]
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """Return a one-line, human-readable summary of a sweep result."""
+    overrides = " ".join(f"{k}={v!r}" for k, v in result["overrides"].items())
+    if result["error"]:
+        return f"{result['index']:4d}  ERROR {result['error']}  {overrides}"
+    size = (
+        "x".join(f"{hi - lo:.1f}" for lo, hi in zip(*result["bbox"]))
+        if result["bbox"]
+        else "-"
+    )
+    export_s = f"{result['export_s']:.3f}s" if result["export_s"] is not None else "-"
+    return (
+        f"{result['index']:4d}  render {result['render_s']:.3f}s  export {export_s}  "
+        f"bbox {size}  volume {result['volume']:.1f}  {overrides}"
+    )
+
+
+def cmd_render(args: argparse.Namespace) -> int:
+    from workboard.projects.workboard.workboard01 import main
+
+    return main() or 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    from workboard.sweep import sweep
+
+    variants = sweep_variants(args)
+    jsonl = None
+    if args.jsonl == "-":
+        jsonl = sys.stdout
+    elif args.jsonl:
+        jsonl = open(args.jsonl, "w")
+    errors = 0
+    try:
+        for result in sweep(
+            args.model,
+            variants,
+            max_workers=args.jobs,
+            output_dir=args.output_dir,
+            formats=args.format or (".step",),
+            profile=args.profile,
+            quality=args.quality,
+        ):
+            errors += bool(result["error"])
+            if jsonl is not None:
+                jsonl.write(json.dumps(result) + "\n")
+                jsonl.flush()
+            if jsonl is not sys.stdout:
+                print(format_result(result), flush=True)
+    finally:
+        if jsonl is not None and jsonl is not sys.stdout:
+            jsonl.close()
+    return 1 if errors else 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from workboard.server import serve
+
+    serve(
+        args.socket,
+        max_workers=args.jobs,
+        timeout=args.timeout,
+        max_pending=args.max_pending,
+        output_dir=args.output_dir,
+    )
+    return 0
+
+
+def cmd_svg_compile(args: argparse.Namespace) -> int:
+    from workboard.svgcompile import compile_to_module, render_module
+
+    output = None if args.output == "-" else args.output
+    results = compile_to_module(
+        args.sources,
+        output=output,
+        pattern=args.pattern,
+        directory=args.cache_dir,
+        max_workers=args.jobs,
+    )
+    if output is None:
+        sys.stdout.write(render_module(results, directory=args.cache_dir))
+    for r in results:
+        status = "skipped" if r["skipped"] else "cached" if r["cached"] else "compiled"
+        print(
+            f"{status:8s}  {len(r['manifest']['paths'])} paths  {r['seconds']:.3f}s  {r['source']} -> {r['name']}()",
+            file=sys.stderr if output is None else sys.stdout,
+        )
+    return 0
+
+
+def cmd_stl_diff(args: argparse.Namespace) -> int:
+    from workboard.stlio import format_diff, stl_diff
+
+    diff = stl_diff(args.a, args.b)
+    if args.json:
+        print(json.dumps(diff.to_dict()))
+    else:
+        print(format_diff(diff))
+    return 1 if diff.changed(args.tolerance) else 0
+
+
+def cmd_fingerprint_snapshot(args: argparse.Namespace) -> int:
+    from workboard.fingerprints import MODEL_PROJECTS, take_snapshot, write_snapshot
+
+    snapshot = take_snapshot(args.models or list(MODEL_PROJECTS))
+    write_snapshot(snapshot, args.output)
+    for model, entry in snapshot["models"].items():
+        print(f"{model}: {len(entry['parts'])} parts")
+    return 0
+
+
+def cmd_fingerprint_check(args: argparse.Namespace) -> int:
+    from workboard.fingerprints import check_snapshot, read_snapshot
+
+    reports = check_snapshot(
+        read_snapshot(args.snapshot),
+        args.models or None,
+        rel=args.rel,
+        tolerance=args.tolerance,
+        force=args.force,
+    )
+    for report in reports:
+        status = "ok" if report["ok"] else "FAILED"
+        how = "re-rendered" if report["rendered"] else "inputs unchanged"
+        print(f"{report['model']}: {status} ({how})")
+        for path, names in report["changed"].items():
+            print(f"  changed  {path}: {', '.join(names)}")
+        for path in report["added"]:
+            print(f"  added    {path}")
+        for path in report["removed"]:
+            print(f"  removed  {path}")
+    return 0 if all(report["ok"] for report in reports) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="workboard", description=__doc__.split("\n\n")[1]
+    )
+    parser.add_argument(
+        "--timing", metavar="PATH", help="write a JSON timing tree of the stages"
+    )
+    parser.add_argument(
+        "--trace", metavar="PATH", help="write a Chrome trace of the stages"
+    )
+    parser.add_argument(
+        "--quality",
+        choices=("draft", "final"),
+        help="render quality; draft skips fillets and chamfers (default: $WORKBOARD_QUALITY or final)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render = subparsers.add_parser("render", help="render and export workboard01")
+    render.set_defaults(func=cmd_render)
+
+    sweep = subparsers.add_parser(
+        "sweep", help="render a grid of props overrides of a model"
+    )
+    sweep.add_argument("model", help="workboard, easel, pizzapancoolingmat or mushroom")
+    sweep.add_argument(
+        "--grid",
+        action="append",
+        type=parse_assignment,
+        metavar="NAME=V1,V2,...",
+        help="sweep a prop over values (comma-separated or a JSON list); repeatable",
+    )
+    sweep.add_argument(
+        "--set",
+        action="append",
+        type=parse_assignment,
+        metavar="NAME=VALUE",
+        help="set a prop (a JSON value or a string) in every variant; repeatable",
+    )
+    sweep.add_argument("--variants", help="JSON file with a list of props overrides")
+    sweep.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (0: in-process)"
+    )
+    sweep.add_argument(
+        "--output-dir", help="export each variant's parts to this directory"
+    )
+    sweep.add_argument(
+        "--format",
+        action="append",
+        help="export format, e.g. .step or .stl; repeatable (default: .step)",
+    )
+    sweep.add_argument(
+        "--profile",
+        help="tessellation profile of the mesh formats: preview, print or archival (default: print)",
+    )
+    sweep.add_argument(
+        "--jsonl", help="write results as JSON lines to this file ('-': stdout)"
+    )
+    sweep.set_defaults(func=cmd_sweep)
+
+    serve = subparsers.add_parser(
+        "serve", help="serve render/export requests on a Unix socket"
+    )
+    serve.add_argument(
+        "--socket",
+        default="/tmp/workboard.sock",
+        help="socket path (default: %(default)s)",
+    )
+    serve.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes (default: CPU count)",
+    )
+    serve.add_argument(
+        "--timeout",
+        type=float,
+        default=120.0,
+        help="per-request timeout in seconds (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="requests in flight before 'busy' (default: 4 per worker)",
+    )
+    serve.add_argument(
+        "--output-dir",
+        default="out/server",
+        help="directory for exported files (default: %(default)s)",
+    )
+    serve.set_defaults(func=cmd_serve)
+
+    svg = subparsers.add_parser("svg", help="SVG tools")
+    svg_commands = svg.add_subparsers(dest="svg_command", required=True)
+    svg_compile = svg_commands.add_parser(
+        "compile", help="compile SVG files to a module of build123d sketch builders"
+    )
+    svg_compile.add_argument(
+        "sources", nargs="+", help="SVG files and/or directories of SVG files"
+    )
+    svg_compile.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="generated module filename ('-': stdout, the default)",
+    )
+    svg_compile.add_argument(
+        "--pattern",
+        default="*.svg",
+        help="filename pattern in directories (default: %(default)s)",
+    )
+    svg_compile.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (0: in-process)"
+    )
+    svg_compile.add_argument(
+        "--cache-dir",
+        help="compiled sketch cache directory (default: $WORKBOARD_SVG_CACHE_DIR or ~/.cache/workboard/svg)",
+    )
+    svg_compile.set_defaults(func=cmd_svg_compile)
+
+    stl = subparsers.add_parser("stl", help="STL tools")
+    stl_commands = stl.add_subparsers(dest="stl_command", required=True)
+    stl_diff = stl_commands.add_parser(
+        "diff", help="compare two STL exports (exit status 1 if the geometry changed)"
+    )
+    stl_diff.add_argument("a", help="binary or ASCII STL file")
+    stl_diff.add_argument("b", help="binary or ASCII STL file")
+    stl_diff.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.0,
+        help="vertex deviation in mm to ignore (default: %(default)s)",
+    )
+    stl_diff.add_argument("--json", action="store_true", help="print the diff as JSON")
+    stl_diff.set_defaults(func=cmd_stl_diff)
+
+    fingerprint = subparsers.add_parser(
+        "fingerprint", help="geometry fingerprint snapshots of the models"
+    )
+    fingerprint_commands = fingerprint.add_subparsers(
+        dest="fingerprint_command", required=True
+    )
+    snapshot = fingerprint_commands.add_parser(
+        "snapshot", help="render models and write a snapshot"
+    )
+    snapshot.add_argument("models", nargs="*", help="models to snapshot (default: all)")
+    snapshot.add_argument("-o", "--output", required=True, help="snapshot JSON file")
+    snapshot.set_defaults(func=cmd_fingerprint_snapshot)
+    check = fingerprint_commands.add_parser(
+        "check",
+        help="check models against a snapshot (exit status 1 if a part changed)",
+    )
+    check.add_argument("snapshot", help="snapshot JSON file")
+    check.add_argument(
+        "models", nargs="*", help="models to check (default: all of the snapshot's)"
+    )
+    check.add_argument(
+        "--rel",
+        type=float,
+        default=1e-6,
+        help="relative tolerance of volume, area and inertia (default: %(default)s)",
+    )
+    check.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-6,
+        help="absolute tolerance in mm (default: %(default)s)",
+    )
+    check.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render even if a model's inputs are unchanged",
+    )
+    check.set_defaults(func=cmd_fingerprint_check)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from workboard import quality
+
+    args = build_parser().parse_args(argv)
+    with quality.use(args.quality):
+        return run(args)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run a parsed command, timing it if --timing or --trace was given."""
+    if not (args.timing or args.trace):
+        return args.func(args)
+
+    from workboard import timing
+
+    timing.enable()
+    try:
+        with timing.span(f"workboard {args.command}"):
+            return args.func(args)
+    finally:
+        if args.timing:
+            timing.write_json(args.timing)
+        if args.trace:
+            timing.write_chrome_trace(args.trace)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+client.py
+
+A client for the render server (see server.py).
+
+Usage::
+
+    from workboard.client import RenderClient
+
+    with RenderClient("/tmp/workboard.sock") as client:
+        client.ping()
+        row = client.render("workboard", {"feet_height": 20})
+        row["bbox"], row["volume"], row["render_s"]
+        files = client.export("easel", {}, formats=[".step", ".stl"])["files"]
+"""
+
+import itertools
+import json
+import socket
+from typing import Any, Dict, Optional, Sequence
+
+
+class ServerError(Exception):
+    """An error response from the render server."""
+
+    def __init__(self, message: str, response: Dict[str, Any]):
+        super().__init__(message)
+        self.response = response
+
+
+class RenderClient:
+    """
+    A connection to a render server.
+
+    Args:
+        path (str): the server's socket path.
+        timeout (float): socket timeout in seconds (None: wait forever);
+            it should be longer than the server's per-request timeout.
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile("rb")
+        self.ids = itertools.count()
+
+    def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Send a request and return its response.
+
+        Returns:
+            dict: {"id", "ok", "result", "error"}.
+        """
+        request = {"id": next(self.ids), "op": op, **fields}
+        self.sock.sendall(json.dumps(request).encode() + b"\n")
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError(f"render server at {self.path} closed the connection")
+        return json.loads(line)
+
+    def call(self, op: str, **fields: Any) -> Any:
+        """Send a request and return its result; raise ServerError if it failed."""
+        response = self.request(op, **fields)
+        if not response["ok"]:
+            raise ServerError(response["error"], response)
+        return response["result"]
+
+    def ping(self) -> Dict[str, Any]:
+        return self.call("ping")
+
+    def render(
+        self,
+        model: str,
+        overrides: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        quality: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Render a variant of model ("draft" or "final" quality); return its sweep.render_variant() row."""
+        return self.call(
+            "render",
+            model=model,
+            overrides=overrides or {},
+            timeout=timeout,
+            quality=quality,
+        )
+
+    def export(
+        self,
+        model: str,
+        overrides: Optional[Dict[str, Any]] = None,
+        formats: Sequence[str] = (".step",),
+        timeout: Optional[float] = None,
+        profile: Optional[str] = None,
+        quality: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Render and export a variant of model; the row's "files" are {name: {ext: path}}.
+
+        profile is the tessellation profile of the mesh formats (e.g. "preview"),
+        quality the render quality ("draft" or "final").
+        """
+        return self.call(
+            "export",
+            model=model,
+            overrides=overrides or {},
+            formats=list(formats),
+            timeout=timeout,
+            profile=profile,
+            quality=quality,
+        )
+
+    def shutdown(self) -> Dict[str, Any]:
+        """Ask the server to stop."""
+        return self.call("shutdown")
+
+    def close(self) -> None:
+        self.rfile.close()
+        self.sock.close()
+
+    def __enter__(self) -> "RenderClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
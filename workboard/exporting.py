@@ -0,0 +1,367 @@
+"""
+exporting.py
+
+Parallel multi-format export of build123d parts and assemblies.
+
+Each part's STEP export and its mesh exports are scheduled as separate jobs
+on a process pool. The mesh formats (binary STL, ASCII STL, glTF) share one
+tessellation per part (see ``workboard.tessellation``). Shapes are packed
+with ``workboard.shapeio`` (so colored shapes and assemblies can cross the
+process boundary), written to a temporary directory next to the outputs and
+then renamed into place, so readers never see a partially written file.
+
+Exports are incremental: an ``export_manifest.json`` next to the outputs
+records, for every output file, the geometry fingerprint of the part and the
+export settings it was written with, including the tessellation profile
+(see ``workboard.tessellation.PROFILES``) of mesh files. Files whose part and
+settings haven't changed since are skipped. Exports into the same directory
+(sweep workers, server requests, batch lines) each merge their entries into
+the manifest under a file lock, so none of them loses the others'.
+
+Usage::
+
+    report = export_parts(data["parts"].items(), filename_prefix="out/workboard01__part_")
+    report.files
+    # {"feet": {".step": "out/workboard01__part__feet.step", ".stl": ...}, ...}
+    report.written, report.skipped
+
+    # coarse meshes for a viewer
+    export_parts(parts, filename_prefix="out/preview/part_", formats=(".gltf",), profile="preview")
+"""
+
+import contextlib
+import dataclasses
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import build123d
+from build123d import export_step
+
+from workboard import timing
+from workboard.shapeio import pack_shape, shape_fingerprint, unpack_shape
+from workboard.tessellation import (
+    TessellationProfile,
+    get_profile,
+    tessellate,
+    write_gltf,
+    write_stl,
+)
+
+# writers of the exact B-rep, called with (shape, path)
+WRITERS: Dict[str, Callable[[Any, str], Any]] = {
+    ".step": lambda shape, path: export_step(shape, path),
+}
+
+# writers of a tessellation, called with (meshes, path)
+MESH_WRITERS: Dict[str, Callable[[Any, str], Any]] = {
+    ".stl": lambda meshes, path: write_stl(meshes, path),
+    ".txt.stl": lambda meshes, path: write_stl(meshes, path, ascii_format=True),
+    ".gltf": lambda meshes, path: write_gltf(meshes, path),
+}
+
+FORMATS: Tuple[str, ...] = (*WRITERS, *MESH_WRITERS)
+
+MANIFEST_FILENAME = "export_manifest.json"
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest updates aren't locked
+    fcntl = None  # type: ignore[assignment]
+
+# bump when a writer's output changes for the same inputs
+EXPORTER_VERSION = 2
+
+
+@dataclass
+class ExportReport:
+    """
+    Result of export_parts().
+
+    Attributes:
+        files (dict): {name: {ext: path}} for every exported part.
+        written (list): paths of the files written by this export.
+        skipped (list): paths of the files left as they were because their
+            part and export settings didn't change.
+    """
+
+    files: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    written: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+
+def export_profile(
+    profile: Union[str, TessellationProfile, None] = None,
+    tolerance: Optional[float] = None,
+    angular_tolerance: Optional[float] = None,
+) -> TessellationProfile:
+    """Return the tessellation profile by name, with tolerance and angular_tolerance overridden if given."""
+    profile = get_profile(profile)
+    overrides = {"tolerance": tolerance, "angular_tolerance": angular_tolerance}
+    overrides = {k: v for k, v in overrides.items() if v is not None}
+    return dataclasses.replace(profile, **overrides) if overrides else profile
+
+
+def export_settings(ext: str, profile: TessellationProfile) -> Dict[str, Any]:
+    """Return the settings that, with the geometry, determine an output file."""
+    settings: Dict[str, Any] = {"format": ext, "exporter": EXPORTER_VERSION}
+    if ext in MESH_WRITERS:
+        settings.update(profile.settings())
+    else:
+        settings.update(build123d=build123d.__version__)
+    return settings
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    """Return the export manifest of directory, {} if there is none."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+    path = os.path.join(directory, MANIFEST_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _manifest_lock(directory: str) -> Iterator[None]:
+    """Hold an exclusive lock on directory's manifest (across processes)."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, f"{MANIFEST_FILENAME}.lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def update_manifest(directory: str, entries: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge entries into directory's export manifest and return it.
+
+    The manifest is re-read and rewritten under a file lock, so concurrent
+    exports into the same directory keep each other's entries.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with _manifest_lock(directory):
+        manifest = read_manifest(directory)
+        manifest.update(entries)
+        write_manifest(directory, manifest)
+    return manifest
+
+
+def _is_current(
+    entry: Optional[Dict[str, Any]],
+    fingerprint: str,
+    settings: Dict[str, Any],
+    directory: str,
+) -> bool:
+    return (
+        entry is not None
+        and entry.get("fingerprint") == fingerprint
+        and entry.get("settings") == settings
+        and all(
+            os.path.exists(os.path.join(directory, f)) for f in entry.get("files", ())
+        )
+    )
+
+
+def export_filenames(
+    filename_prefix: str, name: str, formats: Iterable[str] = FORMATS
+) -> Dict[str, str]:
+    """Return {ext: path} for exporting part ``name`` with ``filename_prefix``."""
+    return {ext: f"{filename_prefix}_{name}{ext}" for ext in formats}
+
+
+def write_atomic(path: str, write: Callable[[str], Any]) -> list[str]:
+    """
+    Call write(tmp_path) in a temporary directory next to path, then rename
+    every file it produced (e.g. a glTF's .bin buffer) into path's directory.
+
+    Returns:
+        list[str]: paths of the files moved into place.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmpdir = tempfile.mkdtemp(prefix=".export-", dir=directory)
+    try:
+        write(os.path.join(tmpdir, os.path.basename(path)))
+        written = []
+        for filename in sorted(os.listdir(tmpdir)):
+            dest = os.path.join(os.path.dirname(path), filename)
+            os.replace(os.path.join(tmpdir, filename), dest)
+            written.append(dest)
+        return written
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _export_job(packed: Dict[str, Any], ext: str, path: str) -> Dict[str, list[str]]:
+    """Worker: rebuild a packed shape and write it as ``ext`` to ``path``."""
+    shape = unpack_shape(packed)
+    writer = WRITERS[ext]
+    with timing.span(f"write{ext}", path=path):
+        return {ext: write_atomic(path, lambda tmp_path: writer(shape, tmp_path))}
+
+
+def _export_mesh_job(
+    packed: Dict[str, Any],
+    filenames: Dict[str, str],
+    profile: TessellationProfile,
+) -> Dict[str, list[str]]:
+    """Worker: tessellate a packed shape once and write every mesh format in filenames."""
+    with timing.span("tessellate", **profile.settings()):
+        meshes = tessellate(unpack_shape(packed), profile=profile)
+    written = {}
+    for ext, path in filenames.items():
+        writer = MESH_WRITERS[ext]
+        with timing.span(f"write{ext}", path=path):
+            written[ext] = write_atomic(path, lambda tmp_path: writer(meshes, tmp_path))
+    return written
+
+
+class InlineExecutor(Executor):
+    """
+    An Executor that runs each job in the calling process, on submit().
+
+    Used for max_workers=0 here and in sweep.py.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+@timing.timed("export_parts")
+def export_parts(
+    parts: Iterable[Tuple[str, Any]],
+    *,
+    filename_prefix: str,
+    formats: Iterable[str] = FORMATS,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    profile: Union[str, TessellationProfile, None] = None,
+    tolerance: Optional[float] = None,
+    angular_tolerance: Optional[float] = None,
+    force: bool = False,
+) -> ExportReport:
+    """
+    Export every part in every format, skipping unchanged outputs.
+
+    Each B-rep format is one job per (part, format) pair; the mesh formats
+    of a part are one job that tessellates the part once.
+
+    Args:
+        parts: iterable of (name, shape); a BuildPart's ``.part`` is used.
+        filename_prefix (str): output path prefix; files are named
+            ``f"{filename_prefix}_{name}{ext}"``.
+        formats: file extensions to write, keys of WRITERS or MESH_WRITERS.
+        max_workers (int): process pool size (None: os.cpu_count(),
+            0: export in the calling process).
+        executor (Executor): optional executor to use instead of creating
+            (and shutting down) a process pool.
+        profile: tessellation profile of the mesh formats, a
+            TessellationProfile or a name in tessellation.PROFILES
+            ("preview", "print" or "archival"; None: "print").
+        tolerance (float): if set, overrides the profile's linear deflection.
+        angular_tolerance (float): if set, overrides the profile's angular
+            deflection.
+        force (bool): write every file, even if the manifest says it's current.
+
+    Returns:
+        ExportReport: per-part filenames and the files written and skipped.
+    """
+    formats = tuple(formats)
+    profile = export_profile(profile, tolerance, angular_tolerance)
+    for ext in formats:
+        if ext not in WRITERS and ext not in MESH_WRITERS:
+            raise ValueError(f"Unsupported export format: {ext!r}")
+
+    directory = os.path.dirname(os.path.abspath(f"{filename_prefix}_"))
+    manifest = read_manifest(directory)
+    report = ExportReport()
+    entries: Dict[str, Any] = {}
+    jobs = []
+    for name, base in parts:
+        if base is None:
+            continue
+        shape = getattr(base, "part", base)
+        fingerprint = shape_fingerprint(shape)
+        filenames = export_filenames(filename_prefix, name, formats)
+        report.files[name] = filenames
+        stale = {}
+        for ext, path in filenames.items():
+            settings = export_settings(ext, profile)
+            entry = manifest.get(os.path.basename(path))
+            if not force and _is_current(entry, fingerprint, settings, directory):
+                report.skipped.append(path)
+            else:
+                stale[ext] = path
+        if stale:
+            jobs.append((name, pack_shape(shape), fingerprint, stale))
+
+    own_executor = executor is None
+    if executor is None and jobs:
+        executor = (
+            InlineExecutor()
+            if max_workers == 0
+            else ProcessPoolExecutor(max_workers=max_workers)
+        )
+    try:
+        futures = []
+        for name, packed, fingerprint, filenames in jobs:
+            mesh_filenames = {}
+            for ext, path in filenames.items():
+                if ext in MESH_WRITERS:
+                    mesh_filenames[ext] = path
+                else:
+                    futures.append(
+                        (
+                            name,
+                            fingerprint,
+                            timing.submit(executor, _export_job, packed, ext, path),
+                        )
+                    )
+            if mesh_filenames:
+                futures.append(
+                    (
+                        name,
+                        fingerprint,
+                        timing.submit(
+                            executor, _export_mesh_job, packed, mesh_filenames, profile
+                        ),
+                    )
+                )
+        for name, fingerprint, future in futures:
+            for ext, written in timing.result(future).items():
+                path = report.files[name][ext]
+                report.written.append(path)
+                entries[os.path.basename(path)] = {
+                    "part": name,
+                    "fingerprint": fingerprint,
+                    "settings": export_settings(ext, profile),
+                    "files": [os.path.basename(p) for p in written],
+                }
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        if entries:
+            update_manifest(directory, entries)
+
+    return report
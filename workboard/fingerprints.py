@@ -0,0 +1,507 @@
+"""
+fingerprints.py
+
+Geometry fingerprints of labelled parts, and golden snapshots of them.
+
+A ``Fingerprint`` is a compact, tolerance-aware signature of a part's
+geometry from OCCT mass properties: volume, surface area, centroid and
+the matrix of inertia about the centroid (at unit density; for parts
+without volume, like text outlines, the surface's). Two renders of the
+same geometry have equal fingerprints up to floating point noise;
+``Fingerprint.compare()`` tells which of them differ beyond a tolerance.
+
+Mass properties are computed once per shared geometry (see instancing.py)
+and kept in an LRU cache; a placed leaf's fingerprint is its geometry's,
+moved by its location, and an assembly's is combined from its leaves
+(with the parallel axis theorem), so fingerprinting a whole assembly
+computes mass properties once per distinct leaf.
+
+A snapshot is a JSON file of the fingerprints of every labelled part of
+some project models (see sweep.MODELS), with a hash of each model's
+inputs (its props overrides, the render quality, the workboard and project
+sources and the build123d version). ``check_snapshot()`` only re-renders the models whose
+inputs changed, so checking an unchanged tree against a golden snapshot
+takes milliseconds.
+
+Usage::
+
+    fp = fingerprint(part)
+    fp.compare(other_fp, rel=1e-6, tolerance=1e-6)  # [] or ["volume", ...]
+    part_fingerprints(easel)  # {"Easel/A. Leg (L)": Fingerprint, ...}
+
+    $ workboard fingerprint snapshot easel pizzapancoolingmat -o fingerprints.json
+    $ workboard fingerprint check fingerprints.json
+
+    $ make fingerprints-snapshot  # rewrite GOLDEN_SNAPSHOT, in draft quality
+    $ make fingerprints           # check against it
+"""
+
+import hashlib
+import json
+import math
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# bump when the fingerprint or snapshot format changes
+SNAPSHOT_VERSION = 1
+
+# significant digits of the numbers in a snapshot
+DIGITS = 12
+
+# {model name: its directory under workboard/projects}
+MODEL_PROJECTS = {
+    "workboard": "workboard",
+    "easel": "easel",
+    "pizzapancoolingmat": "pizzapancoolingmat",
+    "mushroom": "umbrellastandstopper",
+}
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# the golden snapshot of every model, in draft quality (see test_fingerprints.py)
+GOLDEN_SNAPSHOT = os.path.join(_PACKAGE_DIR, "projects", "fingerprints.json")
+
+_INERTIA_KEYS = ("xx", "yy", "zz", "xy", "xz", "yz")
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    Mass properties of a part's geometry.
+
+    Attributes:
+        volume (float): in mm^3.
+        area (float): surface area in mm^2.
+        centroid (tuple): (x, y, z) center of mass, in mm.
+        inertia (tuple): the matrix of inertia about the centroid, as
+            (Ixx, Iyy, Izz, Ixy, Ixz, Iyz).
+    """
+
+    volume: float
+    area: float
+    centroid: Tuple[float, float, float]
+    inertia: Tuple[float, float, float, float, float, float]
+
+    def inertia_matrix(self) -> np.ndarray:
+        xx, yy, zz, xy, xz, yz = self.inertia
+        return np.array([[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]])
+
+    @classmethod
+    def from_matrix(
+        cls, volume: float, area: float, centroid, inertia
+    ) -> "Fingerprint":
+        m = np.asarray(inertia, dtype=float)
+        components = (m[0, 0], m[1, 1], m[2, 2], m[0, 1], m[0, 2], m[1, 2])
+        return cls(
+            float(volume),
+            float(area),
+            tuple(float(v) for v in centroid),  # type: ignore[arg-type]
+            tuple(float(v) for v in components),  # type: ignore[arg-type]
+        )
+
+    def transformed(self, matrix) -> "Fingerprint":
+        """Return the fingerprint of this part moved by a rigid 4x4 transformation matrix."""
+        matrix = np.asarray(matrix, dtype=float)
+        rotation = matrix[:3, :3]
+        centroid = rotation @ np.array(self.centroid) + matrix[:3, 3]
+        return Fingerprint.from_matrix(
+            self.volume,
+            self.area,
+            centroid,
+            rotation @ self.inertia_matrix() @ rotation.T,
+        )
+
+    @staticmethod
+    def combine(fingerprints: Iterable["Fingerprint"]) -> "Fingerprint":
+        """
+        Return the fingerprint of an assembly of parts.
+
+        Centroids and inertia are weighted by volume, or by area if none of
+        the parts has a volume (and then parts without volume don't count).
+        """
+        fingerprints = list(fingerprints)
+        volume = sum(fp.volume for fp in fingerprints)
+        area = sum(fp.area for fp in fingerprints)
+        if volume > 0:
+            weighted = [(fp.volume, fp) for fp in fingerprints if fp.volume > 0]
+        else:
+            weighted = [(fp.area, fp) for fp in fingerprints if fp.area > 0]
+        total = sum(w for w, _ in weighted)
+        if not total:
+            return Fingerprint(volume, area, (0.0, 0.0, 0.0), (0.0,) * 6)  # type: ignore[arg-type]
+        centroid = sum(w * np.array(fp.centroid) for w, fp in weighted) / total
+        inertia = np.zeros((3, 3))
+        for w, fp in weighted:
+            d = np.array(fp.centroid) - centroid
+            inertia += fp.inertia_matrix() + w * (d @ d * np.eye(3) - np.outer(d, d))
+        return Fingerprint.from_matrix(volume, area, centroid, inertia)
+
+    def compare(
+        self, other: "Fingerprint", rel: float = 1e-6, tolerance: float = 1e-6
+    ) -> List[str]:
+        """
+        Return the names of the properties that differ from other's.
+
+        Args:
+            other (Fingerprint): the fingerprint to compare to.
+            rel (float): relative tolerance of the volume, area and inertia
+                (inertia relative to its largest component).
+            tolerance (float): absolute tolerance, in mm, of the centroid
+                (and of the others' magnitudes, for parts near zero).
+        """
+        differ = []
+        for name in ("volume", "area"):
+            if not math.isclose(
+                getattr(self, name),
+                getattr(other, name),
+                rel_tol=rel,
+                abs_tol=tolerance,
+            ):
+                differ.append(name)
+        if max(abs(a - b) for a, b in zip(self.centroid, other.centroid)) > tolerance:
+            differ.append("centroid")
+        scale = max(map(abs, (*self.inertia, *other.inertia)), default=0.0)
+        if max(abs(a - b) for a, b in zip(self.inertia, other.inertia)) > max(
+            rel * scale, tolerance
+        ):
+            differ.append("inertia")
+        return differ
+
+    def to_dict(self) -> Dict[str, Any]:
+        def r(value: float) -> float:
+            return float(f"{value:.{DIGITS}g}")
+
+        return {
+            "volume": r(self.volume),
+            "area": r(self.area),
+            "centroid": [r(v) for v in self.centroid],
+            "inertia": dict(zip(_INERTIA_KEYS, map(r, self.inertia))),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Fingerprint":
+        return cls(
+            float(data["volume"]),
+            float(data["area"]),
+            tuple(data["centroid"]),  # type: ignore[arg-type]
+            tuple(float(data["inertia"][k]) for k in _INERTIA_KEYS),  # type: ignore[arg-type]
+        )
+
+
+def _mass_properties(wrapped) -> Fingerprint:
+    """Compute the fingerprint of a TopoDS shape with OCCT."""
+    from OCP.BRepGProp import BRepGProp
+    from OCP.GProp import GProp_GProps
+
+    volume_props, surface_props = GProp_GProps(), GProp_GProps()
+    BRepGProp.VolumeProperties_s(wrapped, volume_props)
+    BRepGProp.SurfaceProperties_s(wrapped, surface_props)
+    volume, area = volume_props.Mass(), surface_props.Mass()
+    props = volume_props if abs(volume) > 0 else surface_props
+    center = props.CentreOfMass()
+    matrix = props.MatrixOfInertia()
+    inertia = [[matrix.Value(r, c) for c in (1, 2, 3)] for r in (1, 2, 3)]
+    return Fingerprint.from_matrix(
+        volume, area, (center.X(), center.Y(), center.Z()), inertia
+    )
+
+
+class FingerprintCache:
+    """
+    An LRU cache of the fingerprints of geometries (at the identity location).
+
+    Like bbox.BoundingBoxCache, but keyed on the geometry only: shapes that
+    share a TShape and orientation share an entry, wherever they're placed.
+
+    Args:
+        maxsize (int): maximum number of geometries kept.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        # {hash of the unlocated TopoDS shape: [(unlocated TopoDS shape, Fingerprint)]}
+        self._entries: "OrderedDict[int, List[Tuple[Any, Fingerprint]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, wrapped) -> Fingerprint:
+        """Return the fingerprint of a TopoDS shape, computing its geometry's once."""
+        from workboard.shapeio import location_to_matrix, unlocated
+
+        proto = unlocated(wrapped)
+        key = hash(proto)
+        bucket = self._entries.get(key)
+        fp = None
+        if bucket is not None:
+            for other, value in bucket:
+                if other.IsEqual(proto):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    fp = value
+                    break
+        if fp is None:
+            self.misses += 1
+            fp = _mass_properties(proto)
+            self._entries.setdefault(key, []).append((proto, fp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        location = wrapped.Location()
+        if location.IsIdentity():
+            return fp
+        if abs(location.Transformation().ScaleFactor() - 1) > 1e-12:
+            return _mass_properties(wrapped)
+        return fp.transformed(location_to_matrix(location))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._entries.values())
+
+
+CACHE = FingerprintCache()
+
+
+def _children(shape) -> List[Any]:
+    return list(getattr(shape, "children", ()) or ())
+
+
+def fingerprint(shape) -> Fingerprint:
+    """Return the fingerprint of a shape, combined from its leaves for a Compound with children."""
+    return _walk(shape, None, "", {})
+
+
+def _walk(
+    shape, matrix, path: str, out: Optional[Dict[str, Fingerprint]]
+) -> Fingerprint:
+    """Return shape's fingerprint; add those of its labelled descendants to out, by label path."""
+    from workboard.shapeio import location_to_matrix
+
+    children = _children(shape)
+    if not children:
+        fp = CACHE.get(shape.wrapped)
+        return fp if matrix is None else fp.transformed(matrix)
+    location = shape.wrapped.Location()
+    if not location.IsIdentity():
+        local = np.array(location_to_matrix(location))
+        matrix = local if matrix is None else matrix @ local
+    fps = []
+    seen: Dict[str, int] = {}
+    for child in children:
+        label = getattr(child, "label", "") or ""
+        child_path = f"{path}/{label}" if path and label else (label or path)
+        if label:
+            seen[child_path] = seen.get(child_path, 0) + 1
+            if seen[child_path] > 1:
+                child_path = f"{child_path}#{seen[child_path]}"
+        fp = _walk(child, matrix, child_path, out)
+        if label and out is not None:
+            out[child_path] = fp
+        fps.append(fp)
+    return Fingerprint.combine(fps)
+
+
+def part_fingerprints(shape, prefix: str = "") -> Dict[str, Fingerprint]:
+    """
+    Return the fingerprints of a shape and its labelled descendants.
+
+    Args:
+        shape: a build123d shape, usually an assembly.
+        prefix (str): key of shape itself (default: its label).
+
+    Returns:
+        dict: {label path: Fingerprint}, in tree order; paths join labels
+        with "/" (skipping unlabelled compounds), and repeated paths get a
+        "#2", "#3", ... suffix.
+    """
+    root = prefix or getattr(shape, "label", "") or ""
+    out: Dict[str, Fingerprint] = {}
+    fp = _walk(shape, None, root, out)
+    return {root: fp, **out}
+
+
+def result_fingerprints(data) -> Dict[str, Fingerprint]:
+    """Return the part fingerprints of a model's render result (see sweep.result_shapes())."""
+    from workboard.sweep import result_shapes
+
+    _, named = result_shapes(data)
+    out: Dict[str, Fingerprint] = {}
+    for name, shape in named:
+        out.update(part_fingerprints(shape, prefix=name))
+    return out
+
+
+def _source_files(model: str) -> List[str]:
+    directories = [
+        _PACKAGE_DIR,
+        os.path.join(_PACKAGE_DIR, "projects", MODEL_PROJECTS[model]),
+    ]
+    return sorted(
+        os.path.join(directory, name)
+        for directory in directories
+        for name in os.listdir(directory)
+        if name.endswith(".py") and not name.startswith("test_")
+    )
+
+
+def model_inputs(
+    model: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    quality: Optional[str] = None,
+) -> str:
+    """
+    Return a hash of everything a model's render depends on.
+
+    That's its props overrides, the render quality (None: the current
+    quality), the sources of the workboard package and of the model's
+    project (tests excluded) and the build123d version.
+    """
+    from importlib.metadata import version
+
+    from workboard import quality as render_quality
+
+    quality = render_quality.validate(quality or render_quality.get_quality())
+    if model not in MODEL_PROJECTS:
+        raise ValueError(
+            f"Unknown model {model!r}; choose from {sorted(MODEL_PROJECTS)}"
+        )
+    digest = hashlib.sha256(
+        json.dumps(
+            [SNAPSHOT_VERSION, model, overrides or {}, quality, version("build123d")],
+            sort_keys=True,
+            default=repr,
+        ).encode()
+    )
+    for path in _source_files(model):
+        digest.update(os.path.relpath(path, _PACKAGE_DIR).encode())
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def render_fingerprints(
+    model: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    quality: Optional[str] = None,
+) -> Dict[str, Fingerprint]:
+    """Render a model (see sweep.MODELS) in quality (None: the current quality) and return its part fingerprints."""
+    from workboard import quality as render_quality
+    from workboard.sweep import MODELS
+
+    with render_quality.use(quality):
+        return result_fingerprints(MODELS[model](dict(overrides or {})))
+
+
+def take_snapshot(
+    models: Iterable[str], overrides: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Render models and return a snapshot of their part fingerprints.
+
+    Args:
+        models: names of models (keys of MODEL_PROJECTS).
+        overrides (dict): optional {model: props overrides}.
+
+    Models are rendered in the current quality (see workboard.quality).
+
+    Returns:
+        dict: {"version", "models": {model: {"overrides", "quality",
+        "inputs", "parts": {label path: fingerprint dict}}}}.
+    """
+    from workboard import quality as render_quality
+
+    quality = render_quality.get_quality()
+    overrides = overrides or {}
+    snapshot: Dict[str, Any] = {"version": SNAPSHOT_VERSION, "models": {}}
+    for model in models:
+        model_overrides = overrides.get(model, {})
+        inputs = model_inputs(model, model_overrides, quality)
+        parts = render_fingerprints(model, model_overrides, quality)
+        snapshot["models"][model] = {
+            "overrides": model_overrides,
+            "quality": quality,
+            "inputs": inputs,
+            "parts": {path: fp.to_dict() for path, fp in parts.items()},
+        }
+    return snapshot
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: str) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f, indent=1)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"{path}: unsupported snapshot version {snapshot.get('version')!r}"
+        )
+    return snapshot
+
+
+def check_snapshot(
+    snapshot: Dict[str, Any],
+    models: Optional[Sequence[str]] = None,
+    rel: float = 1e-6,
+    tolerance: float = 1e-6,
+    force: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Check models against a snapshot, re-rendering only those whose inputs changed.
+
+    Args:
+        snapshot (dict): see take_snapshot().
+        models: names of the models to check (default: all of the snapshot's).
+        rel, tolerance: see Fingerprint.compare().
+        force (bool): re-render every model, even if its inputs are unchanged.
+
+    Returns:
+        list: a dict per model: {"model", "rendered", "inputs", "changed":
+        {label path: [property names]}, "added": [label paths], "removed":
+        [label paths], "ok"}.
+    """
+    reports = []
+    for model in models or list(snapshot["models"]):
+        golden = snapshot["models"][model]
+        inputs = model_inputs(model, golden.get("overrides"), golden.get("quality"))
+        report: Dict[str, Any] = {
+            "model": model,
+            "rendered": False,
+            "inputs": inputs,
+            "changed": {},
+            "added": [],
+            "removed": [],
+        }
+        if force or inputs != golden["inputs"]:
+            report["rendered"] = True
+            parts = render_fingerprints(
+                model, golden.get("overrides"), golden.get("quality")
+            )
+            expected = {
+                path: Fingerprint.from_dict(fp) for path, fp in golden["parts"].items()
+            }
+            for path, fp in parts.items():
+                if path not in expected:
+                    report["added"].append(path)
+                    continue
+                differ = fp.compare(expected[path], rel=rel, tolerance=tolerance)
+                if differ:
+                    report["changed"][path] = differ
+            report["removed"] = [path for path in expected if path not in parts]
+        report["ok"] = not (report["changed"] or report["added"] or report["removed"])
+        reports.append(report)
+    return reports
@@ -0,0 +1,117 @@
+"""
+instancing.py
+
+Build a component's shape once and place it many times.
+
+``place()`` returns a new build123d shape that shares the prototype's
+OCCT geometry (its TShape) at another location, with its own label and
+color; unlike ``translate(..., transform=True)`` or
+``BRepBuilderAPI_Copy`` it never copies the geometry. Instances keep sharing their geometry through
+pack_shape()/unpack_shape(), tessellation and export: a STEP file gets one
+product per shared geometry that each instance references, and a glTF
+file gets one mesh per shared geometry with a node per instance.
+
+Usage::
+
+    magnet = MagneticLaptopRiserSquareComponent(props).render()
+    risers = [
+        place(magnet, Location((x, y, z)) * Location((0, 0, 0), (0, 0, 90)), label=f"Riser {i}")
+        for i, (x, y, z) in enumerate(positions)
+    ]
+    len(geometry_groups(Compound(children=risers)))  # 1
+"""
+
+from typing import Any, List, Optional
+
+from build123d import Compound, Location
+from build123d.topology import downcast
+
+from workboard.shapeio import GeometryMemo
+
+
+def _topology_class(shape) -> type:
+    """Return shape's class, or for e.g. Box or Text its build123d.topology base (Part, Sketch)."""
+    return next(
+        cls
+        for cls in type(shape).__mro__
+        if cls.__module__.startswith("build123d.topology")
+    )
+
+
+def reference(shape):
+    """
+    Return a new shape tree sharing the geometry and locations of shape's.
+
+    Every node is a new object (so it can be given another parent, label or
+    location), but no geometry is copied.
+    """
+    children = list(getattr(shape, "children", ()) or ())
+    if children:
+        ref = Compound(children=[reference(child) for child in children])
+        ref.wrapped.Location(shape.wrapped.Location())
+    else:
+        ref = _topology_class(shape)(shape.wrapped)
+    ref.label = shape.label
+    if shape.color is not None:
+        ref.color = shape.color
+    material = getattr(shape, "material", "")
+    if material:
+        ref.material = material
+    return ref
+
+
+def place(shape, location, label: Optional[str] = None, color=None):
+    """
+    Return an instance of shape moved by location, sharing shape's geometry.
+
+    Like ``shape.moved(location)``, location is applied after shape's own
+    location, so ``place(s, Location(v) * Location((0, 0, 0), (0, 0, 90)))``
+    is at the same place as ``s.rotate(Axis.Z, 90).translate(v)``; unlike
+    moved(), neither shape nor its children are copied.
+
+    Args:
+        shape: build123d Shape, optionally a Compound with children.
+        location: build123d Location, or anything Location() accepts,
+            e.g. an (x, y, z) tuple.
+        label (str): the instance's label (default: shape's label).
+        color: the instance's color (default: shape's color).
+
+    Returns:
+        Shape: a Part for Part subclasses (Box, Cylinder, ...), a Sketch
+        for Sketch subclasses (Text, ...), else an object of shape's class.
+    """
+    if not isinstance(location, Location):
+        location = Location(location)
+    instance = reference(shape)
+    instance.wrapped = downcast(instance.wrapped.Moved(location.wrapped))
+    if label is not None:
+        instance.label = label
+    if color is not None:
+        instance.color = color
+    return instance
+
+
+def leaves(shape) -> List[Any]:
+    """Return the leaves of a shape tree, in tree order."""
+    children = list(getattr(shape, "children", ()) or ())
+    if not children:
+        return [shape]
+    return [leaf for child in children for leaf in leaves(child)]
+
+
+def geometry_groups(shape) -> List[List[Any]]:
+    """
+    Return the leaves of a shape tree grouped by shared geometry.
+
+    Returns:
+        list: a list of leaves per distinct geometry, in order of first
+        appearance; a group of more than one leaf is a set of instances.
+    """
+    memo = GeometryMemo()
+    groups: List[List[Any]] = []
+    for leaf in leaves(shape):
+        group = memo.get(leaf.wrapped, lambda proto: [])
+        if not group:
+            groups.append(group)
+        group.append(leaf)
+    return groups
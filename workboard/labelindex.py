@@ -0,0 +1,147 @@
+"""
+labelindex.py
+
+Find parts of an assembly by label without walking the tree per lookup.
+
+``label_index(asm)`` builds (once) an index of every descendant of a
+Compound by its label and by its label prefix (the part letter before
+". ", e.g. "A" for "A. Leg (L)"), with the part's path of child indices
+from the root. The index is cached on the assembly and rebuilt when it's
+stale: build123d gives a compound a new ``wrapped`` whenever its children
+change, so the index checks that every compound it indexed still has the
+``wrapped`` it had then. Renaming a part (setting ``.label``) isn't
+detected; call ``label_index(asm, refresh=True)`` after that.
+
+``iter_tree()`` walks a tree depth-first without recursion, so deep trees
+don't hit the recursion limit.
+
+Usage::
+
+    index = label_index(asm)
+    leg_a = index.by_prefix("A")        # the "A. Leg (L)" part
+    index.path("A. Leg (L)")            # (0, 0)
+    index.labels()                      # every label, in tree order
+    for path, part in iter_tree(asm):
+        ...
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+Path = Tuple[int, ...]
+
+# separates a part's letter from the rest of its label: "A. Leg (L)"
+PREFIX_SEPARATOR = ". "
+
+
+def _children(shape) -> List[Any]:
+    return list(getattr(shape, "children", ()) or ())
+
+
+def iter_tree(shape, include_root: bool = False) -> Iterator[Tuple[Path, Any]]:
+    """
+    Yield (path, node) for the descendants of shape, depth-first in tree order.
+
+    Args:
+        shape: a build123d shape, usually a Compound with children.
+        include_root (bool): also yield ((), shape) first.
+
+    Returns:
+        Iterator: path is the tuple of child indices from shape to node.
+    """
+    if include_root:
+        yield (), shape
+    stack = [((i,), child) for i, child in reversed(list(enumerate(_children(shape))))]
+    while stack:
+        path, node = stack.pop()
+        yield path, node
+        stack.extend(
+            ((*path, i), child)
+            for i, child in reversed(list(enumerate(_children(node))))
+        )
+
+
+def label_prefix(label: str) -> Optional[str]:
+    """Return the part letter of a label ("A" for "A. Leg (L)"), or None."""
+    prefix, separator, _ = label.partition(PREFIX_SEPARATOR)
+    return prefix if separator else None
+
+
+class LabelIndex:
+    """
+    An index of a shape tree's descendants by label and label prefix.
+
+    Args:
+        root: the assembly (a Compound with children).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._entries: List[Tuple[str, Path, Any]] = []
+        self._by_label: Dict[str, List[Tuple[Path, Any]]] = {}
+        self._by_prefix: Dict[str, List[Tuple[Path, Any]]] = {}
+        # (compound, its wrapped when indexed), for is_stale()
+        self._compounds: List[Tuple[Any, Any]] = [(root, root.wrapped)]
+        for path, node in iter_tree(root):
+            if _children(node):
+                self._compounds.append((node, node.wrapped))
+            label = getattr(node, "label", None)
+            if not label:
+                continue
+            self._entries.append((label, path, node))
+            self._by_label.setdefault(label, []).append((path, node))
+            prefix = label_prefix(label)
+            if prefix is not None:
+                self._by_prefix.setdefault(prefix, []).append((path, node))
+
+    def is_stale(self) -> bool:
+        """Return True if the children of an indexed compound changed since indexing."""
+        return any(node.wrapped is not wrapped for node, wrapped in self._compounds)
+
+    def get(self, label: str, default: Any = None) -> Any:
+        """Return the first part labeled label, or default."""
+        matches = self._by_label.get(label)
+        return matches[0][1] if matches else default
+
+    def by_prefix(self, prefix: str, default: Any = None) -> Any:
+        """Return the first part whose label starts with prefix + ". ", or default."""
+        matches = self._by_prefix.get(prefix)
+        return matches[0][1] if matches else default
+
+    def all(self, label: str) -> List[Any]:
+        """Return every part labeled label, in tree order."""
+        return [node for _, node in self._by_label.get(label, ())]
+
+    def all_by_prefix(self, prefix: str) -> List[Any]:
+        """Return every part whose label starts with prefix + ". ", in tree order."""
+        return [node for _, node in self._by_prefix.get(prefix, ())]
+
+    def path(self, label: str) -> Optional[Path]:
+        """Return the path (child indices from the root) of the first part labeled label."""
+        matches = self._by_label.get(label)
+        return matches[0][0] if matches else None
+
+    def labels(self) -> List[str]:
+        """Return every label in tree order (duplicates included)."""
+        return [label for label, _, _ in self._entries]
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._by_label
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def label_index(shape, refresh: bool = False) -> LabelIndex:
+    """
+    Return shape's LabelIndex, building it if it's missing or stale.
+
+    Args:
+        shape: the assembly (a Compound with children).
+        refresh (bool): rebuild the index even if it isn't stale (e.g.
+            after relabeling parts).
+    """
+    index = getattr(shape, "_label_index", None)
+    if refresh or index is None or index.root is not shape or index.is_stale():
+        index = LabelIndex(shape)
+        shape._label_index = index
+    return index
@@ -1,108 +1,229 @@
+"""
+linspace_rational.py
 
-import numpy as np
-import sympy as sy
+Evenly spaced samples over an interval, computed exactly.
 
-import pytest
-import unittest
-Test = unittest.TestCase()
+Works like numpy.linspace, but every sample is computed as an integer
+numerator over one common denominator (so samples are exact, and
+``stop`` is exactly the last sample), and only then converted to the
+requested output:
 
+- ``dtype=None`` (or ``sympy.Rational``): a list of sympy.Rational; for
+  array-valued start/stop, an object ndarray of them.
+- ``Fraction``: the same with ``fractions.Fraction``, which is much faster
+  to build and doesn't import sympy.
+- a NumPy float dtype: an ndarray of the correctly rounded samples.
+- a NumPy integer dtype: an ndarray of the samples rounded towards -inf
+  (like numpy.linspace since NumPy 2.0).
 
-def linspace_rational(start, stop, num: int = 50, endpoint: bool = True, retstep=False, dtype=None, axis=0):
-    """
-    Return num evenly spaced samples, calculated as sympy.Rational, over the interval [start, stop]
-    Works like numpy.linspace but returns a list of sympy.Rational.
-    """
+``iter_linspace_rational()`` yields Fractions lazily, for scalar start/stop.
+
+Numerators are computed with NumPy int64 arithmetic while they fit, else
+with Python ints. NumPy is imported on first use of an array output, and
+sympy on first use of a sympy.Rational output.
+
+Usage::
+
+    linspace_rational(0, 1, 4)                          # [0, 1/3, 2/3, 1] (sympy.Rational)
+    linspace_rational(0, 1, 4, dtype=Fraction)          # [Fraction(0, 1), Fraction(1, 3), ...]
+    linspace_rational(0, "1/3", 10**6, dtype=float)     # ndarray of float64
+    linspace_rational([0, 0], [1, 10], 5, axis=1)      # shape (2, 5)
+    for x in iter_linspace_rational(0, 1, 10**9): ...
+"""
+
+import math
+from fractions import Fraction
+from typing import Any, Iterator, Optional, Tuple
+
+# numerators and denominators below this are computed (and divided) with NumPy
+FAST_LIMIT = 2**53
+
+
+def _div(num: int, endpoint: bool) -> int:
     if num < 1:
         raise ValueError("num must be >= 1")
-    start = sy.Rational(start)
-    stop = sy.Rational(stop)
-    if num == 1:
-        points = [start]
-        step = None
-    if num == 2 and endpoint:
-        points = [start, stop]
-        step = None
+    return num - 1 if endpoint else num
+
+
+def _scalar_grid(
+    start, stop, num: int, endpoint: bool
+) -> Tuple[int, int, int, Optional[Fraction]]:
+    """Return (numerator of start, numerator of step, common denominator, step)."""
+    start, stop = Fraction(start), Fraction(stop)
+    div = _div(num, endpoint)
+    if div == 0:
+        return start.numerator, 0, start.denominator, None
+    step = (stop - start) / div
+    denominator = math.lcm(start.denominator, step.denominator)
+    return (
+        start.numerator * (denominator // start.denominator),
+        step.numerator * (denominator // step.denominator),
+        denominator,
+        step,
+    )
+
+
+def iter_linspace_rational(
+    start, stop, num: int = 50, endpoint: bool = True
+) -> Iterator[Fraction]:
+    """
+    Yield num evenly spaced Fractions over [start, stop] (or [start, stop)).
+
+    Args:
+        start, stop: scalars that Fraction() accepts (int, float, str
+            like "1/3", Fraction, Decimal, ...).
+        num (int): number of samples (>= 1).
+        endpoint (bool): include stop as the last sample.
+    """
+    first, step, denominator, _ = _scalar_grid(start, stop, num, endpoint)
+    for i in range(num):
+        yield Fraction(first + i * step, denominator)
+
+
+def _array_grid(start, stop, num: int, endpoint: bool):
+    """Return (numerators with the sample axis first, common denominator, step)."""
+    import numpy as np
+
+    to_fraction = np.vectorize(Fraction, otypes=[object])
+    start, stop = np.broadcast_arrays(
+        to_fraction(np.asarray(start, dtype=object)),
+        to_fraction(np.asarray(stop, dtype=object)),
+    )
+    shape = start.shape
+    start, stop = start.ravel(), stop.ravel()
+    div = _div(num, endpoint)
+    step = (stop - start) / div if div else None
+    fractions = [*start, *(step if step is not None else ())]
+    denominator = math.lcm(*(f.denominator for f in fractions))
+    to_numerator = np.vectorize(
+        lambda f: f.numerator * (denominator // f.denominator), otypes=[object]
+    )
+    first = to_numerator(start)
+    delta = to_numerator(step) if step is not None else np.zeros_like(first)
+    bound = max((abs(n) for n in (*first, *(first + div * delta))), default=0)
+    if max(bound, denominator) < FAST_LIMIT:
+        first, delta, index_dtype = (
+            first.astype(np.int64),
+            delta.astype(np.int64),
+            np.int64,
+        )
     else:
-        if endpoint:
-            div = (num - 1)
-            step = (stop - start) / div  # type: ignore
-            points = [*(start + (step * i) for i in range(div)), stop]  # type: ignore
-        else:
-            div = num
-            step = (stop - start) / div  # type: ignore
-            points = [start + (step * i) for i in range(num)]  # type: ignore
+        index_dtype = object
+    numerators = first + np.arange(num, dtype=index_dtype)[:, np.newaxis] * delta
+    return (
+        numerators.reshape((num, *shape)),
+        denominator,
+        None if step is None else step.reshape(shape),
+    )
+
+
+def _is_sympy_rational(dtype) -> bool:
+    return (
+        getattr(dtype, "__module__", "").startswith("sympy")
+        and getattr(dtype, "__name__", "") == "Rational"
+    )
+
+
+def linspace_rational(
+    start,
+    stop,
+    num: int = 50,
+    endpoint: bool = True,
+    retstep: bool = False,
+    dtype=None,
+    axis: int = 0,
+) -> Any:
+    """
+    Return num evenly spaced samples over the interval [start, stop], computed exactly.
+
+    Args:
+        start, stop: scalars or array-likes (broadcast together, like
+            numpy.linspace) of values that Fraction() accepts.
+        num (int): number of samples (>= 1).
+        endpoint (bool): include stop as the last sample.
+        retstep (bool): also return the step (None when num == 1 and
+            endpoint is True).
+        dtype: None or sympy.Rational, Fraction (both exact), or a NumPy
+            float or integer dtype (see the module docstring).
+        axis (int): axis of the result that the samples are along, for
+            array-valued start/stop.
+
+    Returns:
+        list or ndarray: the samples; with retstep, (samples, step). The
+        step is of the exact type (object ndarray) for exact output, else
+        a float (float ndarray).
 
-    if dtype is not None and dtype is not sy.Rational:
-        # Only support float and int dtypes, like np.linspace
+    Raises:
+        ValueError: if num < 1 or dtype isn't supported.
+    """
+    if dtype is None:
+        import sympy
+
+        dtype = sympy.Rational
+    sympy_rational = _is_sympy_rational(dtype)
+    exact = sympy_rational or dtype is Fraction
+    scalar = all(
+        getattr(v, "ndim", 0) == 0 and not isinstance(v, (list, tuple))
+        for v in (start, stop)
+    )
+
+    if exact and scalar:
+        points: Any = list(iter_linspace_rational(start, stop, num, endpoint))
+        step = _scalar_grid(start, stop, num, endpoint)[3]
+        if sympy_rational:
+            points = [dtype(p.numerator, p.denominator) for p in points]
+            step = None if step is None else dtype(step.numerator, step.denominator)
+        return (points, step) if retstep else points
+
+    import numpy as np
+
+    numerators, denominator, step = _array_grid(start, stop, num, endpoint)
+    if exact:
+        points = np.vectorize(lambda n: dtype(n, denominator), otypes=[object])(
+            numerators
+        )
+        if step is not None and sympy_rational:
+            step = np.vectorize(
+                lambda f: dtype(f.numerator, f.denominator), otypes=[object]
+            )(step)
+    else:
         try:
-            dtype_type = np.dtype(dtype).type
-        except Exception:
-            raise ValueError(f"Unsupported dtype: {dtype}")
-        if dtype_type is int:
-            points = [int(p) for p in points]
-        elif dtype_type is float:
-            points = [float(p) for p in points]
+            np_dtype = np.dtype(dtype)
+        except TypeError:
+            raise ValueError(f"Unsupported dtype: {dtype}") from None
+        if np_dtype.kind == "f":
+            if numerators.dtype == object:
+                points = np.array([n / denominator for n in numerators.flat]).reshape(
+                    numerators.shape
+                )
+            else:
+                points = numerators / denominator
+        elif np_dtype.kind in "iu":
+            points = numerators // denominator
         else:
             raise ValueError(f"Only int and float dtypes are supported, got {dtype}")
-
-    if retstep:
-        return points, step
-    return points
-
-
-
-test_cases = [
-
-    [
-        [1, 2],
-        (1, 2, 2),
-        None
-    ],
-
-    [
-        [1, 2, 3],
-        (1, 3, 3),
-        None
-    ],
-    [
-        [1, 2],
-        (1, 3, 2),
-        dict(endpoint=False),
-    ],
-    [
-        [0, 1, 2, 3],
-        (0, 3, 4),
-        None
-    ],
-    [
-        [0, 1, 2],
-        (0, 3, 3),
-        dict(endpoint=False),
-    ],
-    [
-        [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5],
-        (0, 5, 11),
-        None
-    ],
-]
-@pytest.mark.parametrize('output_expected, args, kwargs', test_cases)
-def test_linspace_rational(output_expected, args, kwargs):
-    kwargs = kwargs if kwargs else {}
-    output_nplinspa = np.linspace(*args, **kwargs)
-    output_thisfunc = linspace_rational(*args, **kwargs)
-
-    #Test.assertEqual(output_expected, output_nplinspa)
-    np.testing.assert_allclose(output_expected, output_nplinspa)
-    
-    np.testing.assert_allclose(output_expected, [float(n) for n in output_thisfunc])  # type: ignore
-    #Test.assertEqual(output_expected, output_thisfunc)
-    #assert output_expected == output_thisfunc
-
-    # assert expected == np_output
-    # assert expected == this_output
+        points = points.astype(np_dtype)
+        if step is not None:
+            step = step.astype(float)
+            step = float(step) if step.ndim == 0 else step
+    if numerators.ndim > 1:
+        points = np.moveaxis(points, 0, axis)
+    if exact and step is not None and step.ndim == 0:
+        step = step.item()
+    return (points, step) if retstep else points
 
 
 if __name__ == "__main__":
     import sys
+
     import pytest
-    sys.exit(pytest.main(['-v', '-l', __file__]))
+
+    sys.exit(
+        pytest.main(
+            [
+                "-v",
+                "-l",
+                __file__.replace("linspace_rational.py", "test_linspace_rational.py"),
+            ]
+        )
+    )
@@ -0,0 +1,119 @@
+"""
+placement.py
+
+Compose rigid transforms as 4x4 matrices and move shapes once.
+
+Every ``Shape.translate()``/``rotate()`` in build123d deep-copies the shape
+(and its children) before moving it, so ``obj.translate(-p).rotate(axis,
+angle).translate(p)`` copies it three times. A ``Placement`` composes the
+same steps as NumPy matrices and applies the result as a single Location
+with ``instancing.place()``, which copies no geometry.
+
+Usage::
+
+    placement = Placement().rotate(Axis.Y, 90).translate((0, 0, 100))
+    leg = placement.apply(leg)                          # == leg.rotate(Axis.Y, 90).translate((0, 0, 100))
+    legs = Placement().rotate(Axis.X, 42, about=p).apply_all(legs)
+
+Steps are applied in the order they're chained, like build123d's methods.
+"""
+
+import math
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+from build123d import Axis, Location
+
+from workboard.instancing import place
+from workboard.shapeio import matrix_to_location
+
+
+def translation_matrix(vector: Sequence[float]) -> np.ndarray:
+    """Return the 4x4 matrix translating by vector."""
+    matrix = np.eye(4)
+    matrix[:3, 3] = [float(v) for v in vector]
+    return matrix
+
+
+def rotation_matrix(direction: Sequence[float], angle: float) -> np.ndarray:
+    """Return the 4x4 matrix rotating by angle degrees about direction through the origin."""
+    axis = np.array([float(v) for v in direction])
+    axis /= np.linalg.norm(axis)
+    x, y, z = axis
+    theta = math.radians(angle)
+    c, s = math.cos(theta), math.sin(theta)
+    cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    matrix = np.eye(4)
+    matrix[:3, :3] = c * np.eye(3) + s * cross + (1 - c) * np.outer(axis, axis)
+    return matrix
+
+
+def _point(point) -> np.ndarray:
+    return np.array(
+        (
+            [float(point.X), float(point.Y), float(point.Z)]
+            if hasattr(point, "X")
+            else point
+        ),
+        dtype=float,
+    )
+
+
+class Placement:
+    """
+    A rigid transform built by chaining translations and rotations.
+
+    Args:
+        matrix: optional 4x4 matrix to start from (default: the identity).
+    """
+
+    def __init__(self, matrix: Optional[Any] = None):
+        self.matrix = np.eye(4) if matrix is None else np.array(matrix, dtype=float)
+
+    def then(self, matrix: np.ndarray) -> "Placement":
+        """Return this placement followed by a 4x4 matrix (or Placement)."""
+        matrix = matrix.matrix if isinstance(matrix, Placement) else matrix
+        return Placement(matrix @ self.matrix)
+
+    def translate(self, vector) -> "Placement":
+        """Return this placement followed by a translation (a Vector or (x, y, z))."""
+        return self.then(translation_matrix(_point(vector)))
+
+    def rotate(self, axis: Axis, angle: float, about=None) -> "Placement":
+        """
+        Return this placement followed by a rotation.
+
+        Args:
+            axis (Axis): rotation axis; like Shape.rotate(), the rotation is
+                about the axis line through axis.position.
+            angle (float): angle in degrees.
+            about: optional point (a Vector or (x, y, z)) that the axis is
+                moved to, as in ``translate(-about).rotate(axis,
+                angle).translate(about)``.
+        """
+        origin = _point(axis.position)
+        if about is not None:
+            origin = origin + _point(about)
+        rotation = rotation_matrix(tuple(axis.direction), angle)
+        return self.then(
+            translation_matrix(origin) @ rotation @ translation_matrix(-origin)
+        )
+
+    def location(self) -> Location:
+        return matrix_to_location(self.matrix)
+
+    def apply(self, shape, label: Optional[str] = None):
+        """Return shape moved by this placement, sharing its geometry (see instancing.place())."""
+        return place(shape, self.location(), label=label)
+
+    def apply_all(self, shapes: Iterable[Any]) -> List[Any]:
+        """Return every shape moved by this placement; the Location is built once."""
+        location = self.location()
+        return [place(shape, location) for shape in shapes]
+
+    def __matmul__(self, other: "Placement") -> "Placement":
+        """``a @ b`` applies b first, then a (like matrix products)."""
+        return Placement(self.matrix @ other.matrix)
+
+    def __repr__(self) -> str:
+        return f"Placement({self.matrix.round(6).tolist()!r})"
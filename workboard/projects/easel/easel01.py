@@ -8,6 +8,9 @@ Easel Model (easel01.py)
   Upper canvas holder (H).
 - All pieces have a 1/4" (6.35mm) roundover on their non-joined edges.
 - Dimensions in inches, converted to mm (1 inch = 25.4 mm).
+- Part labels (props["label_mode"]) are "solid" text shapes in a "Labels"
+  compound, "annotation"s in Easel.annotations (strings at anchor points
+  for a viewer, see workboard/annotations.py), or "none".
 
 ## TODO
 - leg A, B & crossbar gaps
@@ -23,29 +26,39 @@ import math
 import os
 from math import sqrt, acos, degrees
 from typing import Any, Dict, Optional
-from build123d import Box, Compound, Axis, fillet, Text, Vector
+from build123d import Box, Compound, Axis, Vector
+
+from workboard import quality, timing
+from workboard.annotations import Annotation
+from workboard.bbox import bounding_box
+from workboard.labelindex import iter_tree
+from workboard.placement import Placement
+from workboard.textshapes import text_shape
 
 INCH = 25.4
 ROUNDER_RADIUS = 6.35  # 1/4 inch in mm
+LABEL_MODES = ("solid", "annotation", "none")
+LABEL_SIZE = 40  # mm
 
 
 class Transforms:
     @staticmethod
     def rotate_about_center(obj, axis, angle):
         """Rotate a build123d object about its bounding box center."""
-        center = obj.bounding_box().center()
-        return obj.translate(-center).rotate(axis, angle).translate(center)
+        center = bounding_box(obj).center()
+        return Placement().rotate(axis, angle, about=center).apply(obj)
 
     @staticmethod
     def rotate_about_point(obj, axis, angle, point):
-        return obj.translate(-point).rotate(axis, angle).translate(point)
+        """Rotate a build123d object about an axis moved to point (one move, no copies)."""
+        return Placement().rotate(axis, angle, about=point).apply(obj)
 
     @staticmethod
     def midpoint_at_floor(obj1, obj2):
         """Return the midpoint (X, Y, Z=0) between the bottom faces of two objects."""
         # Get the bounding box centers of both objects
-        c1 = obj1.bounding_box().center()
-        c2 = obj2.bounding_box().center()
+        c1 = bounding_box(obj1).center()
+        c2 = bounding_box(obj2).center()
         # Project to Z=0 (floor)
         p1 = type(c1)(c1.X, c1.Y, 0)
         p2 = type(c2)(c2.X, c2.Y, 0)
@@ -76,15 +89,14 @@ class Walks:
     @staticmethod
     def walk_compound(compound):
         """
-        Recursively yield all children of a Compound (including nested Compounds).
+        Yield all children of a Compound (including nested Compounds), depth-first.
         Usage:
             for part in Walks.walk_compound(compound):
                 ...
+        (To look parts up by label, use workboard.labelindex.label_index().)
         """
-        for child in getattr(compound, 'children', []):
+        for _, child in iter_tree(compound):
             yield child
-            if hasattr(child, 'children'):
-                yield from Walks.walk_compound(child)
 
 
 
@@ -92,6 +104,11 @@ class Easel:
     def __init__(self, props: Optional[Dict[str, Any]] = None):
         defaults = self.defaultProps()
         self.props = {**defaults, **(props or {})}
+        if self.props["label_mode"] not in LABEL_MODES:
+            raise ValueError(
+                f"label_mode must be one of {LABEL_MODES}, not {self.props['label_mode']!r}"
+            )
+        self.annotations: list[Annotation] = []
 
     @staticmethod
     def defaultProps():
@@ -123,16 +140,20 @@ class Easel:
             "board1_width": 28*INCH,    # just outside legs (TODO gap)
             # TODO: "board1_length":  then set canvas_holder_y_yoffset from that
             "board1_margin": 0,
+            # "solid", "annotation" or "none"
+            "label_mode": "solid",
         }
 
     def rounded_box(self, length, width, height, roundover=ROUNDER_RADIUS, label=None):
         box = Box(length, width, height)
         if roundover > 0:
-            box = fillet(box.edges(), roundover)
+            with timing.span("fillet", label=label):
+                box = quality.fillet(box.edges(), roundover)
         if label is not None:
             box.label = label
         return box
 
+    @timing.timed("Easel.render")
     def render(self, labelOffset=50) -> Compound:
         p = self.props
         splay_angle = math.degrees(math.atan(p["floor_width"] / (2 * p["leg_b_len"])))
@@ -141,28 +162,39 @@ class Easel:
         leg_a = self.rounded_box(
             p["leg_a_len"], p["leg_width"], p["leg_thickness"], label="A. Leg (L)"
         )
-        leg_a = leg_a.rotate(Axis.Y, 90 - splay_angle)
-        leg_a = leg_a.translate((p["floor_width"] / 2, 0, p["leg_a_len"] / 2))
+        leg_a = (
+            Placement()
+            .rotate(Axis.Y, 90 - splay_angle)
+            .translate((p["floor_width"] / 2, 0, p["leg_a_len"] / 2))
+            .apply(leg_a)
+        )
 
         # B. Leg (R)
         leg_b = self.rounded_box(
             p["leg_b_len"], p["leg_width"], p["leg_thickness"], label="B. Leg (R)"
         )
-        leg_b = leg_b.rotate(Axis.Y, 90 + splay_angle)
-        leg_b = leg_b.translate(
-            (-p["floor_width"] / 2, 0, p["leg_b_len"] / 2)
-        )  # Place foot at Z=0
+        leg_b = (
+            Placement()
+            .rotate(Axis.Y, 90 + splay_angle)
+            # Place foot at Z=0
+            .translate((-p["floor_width"] / 2, 0, p["leg_b_len"] / 2))
+            .apply(leg_b)
+        )
 
         # C. Leg (rear)
         leg_c = self.rounded_box(
             p["leg_c_len"], p["leg_width"], p["leg_thickness"], label="C. Leg (Rear)"
         )
-        leg_c = leg_c.rotate(Axis.Y, 90)
-        leg_c = leg_c.translate((0, -p["floor_width"] / 2, p["leg_c_len"] / 2))
+        leg_c = (
+            Placement()
+            .rotate(Axis.Y, 90)
+            .translate((0, -p["floor_width"] / 2, p["leg_c_len"] / 2))
+            .apply(leg_c)
+        )
 
         # D. Lower Crossbar (spans between A and B)
         crossbar_width_d = (
-            abs(leg_a.bounding_box().center().X - leg_b.bounding_box().center().X)
+            abs(bounding_box(leg_a).center().X - bounding_box(leg_b).center().X)
             + p["leg_width"]
             + 1e-2
         )
@@ -172,7 +204,9 @@ class Easel:
             p["crossbar_height"],
             label="D. Lower Crossbar",
         )
-        crossbar_d = crossbar_d.translate((0, 0, p["crossbar_d_height"]))
+        crossbar_d = (
+            Placement().translate((0, 0, p["crossbar_d_height"])).apply(crossbar_d)
+        )
 
         # E. Upper Crossbar (spans between A and B)
         crossbar_width_e = 13 * INCH
@@ -182,7 +216,9 @@ class Easel:
             p["crossbar_height"],
             label="E. Upper Crossbar",
         )
-        crossbar_e = crossbar_e.translate((0, 0, p["crossbar_e_height"]))
+        crossbar_e = (
+            Placement().translate((0, 0, p["crossbar_e_height"])).apply(crossbar_e)
+        )
 
         # F. Center post (joins D and E; G and H clamp around)
         g_z = p["leg_b_len"] + 10 * INCH  # Z of top rail G
@@ -190,8 +226,12 @@ class Easel:
         centerpost_f = self.rounded_box(
             centerpost_f_len, p["centerpost_f_width"], p["centerpost_f_thickness"], label="F. Center post"
         )
-        centerpost_f = centerpost_f.rotate(Axis.Y, 90)
-        centerpost_f = centerpost_f.translate((0, 0, p["crossbar_d_height"] + centerpost_f_len / 2))
+        centerpost_f = (
+            Placement()
+            .rotate(Axis.Y, 90)
+            .translate((0, 0, p["crossbar_d_height"] + centerpost_f_len / 2))
+            .apply(centerpost_f)
+        )
 
         # centerpost_f = centerpost_f.translate(
         #     (p["floor_width"] / 2, 0, p["leg_a_len"] / 2)
@@ -204,8 +244,17 @@ class Easel:
             p["canvas_holder_g_height"],
             label="G. Lower canvas holder",
         )
-        canvas_holder_g = canvas_holder_g.translate(
-            (0, p["leg_width"], p["crossbar_d_height"] + p["canvas_holder_g_yoffset"]))
+        canvas_holder_g = (
+            Placement()
+            .translate(
+                (
+                    0,
+                    p["leg_width"],
+                    p["crossbar_d_height"] + p["canvas_holder_g_yoffset"],
+                )
+            )
+            .apply(canvas_holder_g)
+        )
 
         # H. Upper canvas holder (adjustable, attaches to F)
         canvas_holder_h = self.rounded_box(
@@ -214,8 +263,11 @@ class Easel:
             p["canvas_holder_h_height"],
             label="H. Upper canvas holder (1)",
         )
-        canvas_holder_h = canvas_holder_h.translate(
-            (0, p["leg_width"], g_z-p["canvas_holder_h_yoffset"]))
+        canvas_holder_h = (
+            Placement()
+            .translate((0, p["leg_width"], g_z - p["canvas_holder_h_yoffset"]))
+            .apply(canvas_holder_h)
+        )
 
 
         canvas_holder_i = self.rounded_box(
@@ -224,9 +276,12 @@ class Easel:
             p["canvas_holder_h_height"],
             label="H. Upper canvas holder (front)",
         )
-        canvas_holder_i = canvas_holder_i.rotate(Axis.X, 90)
-        canvas_holder_i = canvas_holder_i.translate(
-            (0, -p["leg_thickness"], g_z-p["canvas_holder_h_yoffset"]))
+        canvas_holder_i = (
+            Placement()
+            .rotate(Axis.X, 90)
+            .translate((0, -p["leg_thickness"], g_z-p["canvas_holder_h_yoffset"]))
+            .apply(canvas_holder_i)
+        )
         canvas_holder_i.label = "I. Upper Canvas Holder (rear)"
 
 
@@ -247,37 +302,57 @@ class Easel:
         ]
 
         parts_backboards = [
-            self.board_part_between(
-                    canvas_holder_g, canvas_holder_h
-                ).rotate(Axis.Z, 90)
-                .translate((0, p['canvas_holder_g_thickness']/3, 0))
+            Placement()
+            .rotate(Axis.Z, 90)
+            .translate((0, p['canvas_holder_g_thickness']/3, 0))
+            .apply(self.board_part_between(canvas_holder_g, canvas_holder_h))
         ]
         parts = [*parts_front, *parts_back, *parts_backboards]
 
         labels = []
+        self.annotations = []
+        label_mode = p["label_mode"]
         AMOUNT_IN_FRONT_OR_TODO_BEHIND = 42
         for part in parts:
             label = getattr(part, "label", None)
             if label is None:
                 print(f"INFO: {part!r} {part} has no label")
-            if label:
-                center = part.bounding_box().center()
+            if label and label_mode != "none":
+                with timing.span("bounding_box", label=label):
+                    center = bounding_box(part).center()
                 # Ray from origin through center
                 ray = center.normalized()
                 offset = ray * labelOffset
                 label_pos = center + offset
+                position = (
+                    label_pos.X,
+                    label_pos.Y + AMOUNT_IN_FRONT_OR_TODO_BEHIND,
+                    label_pos.Z,
+                )
+                if label_mode == "annotation":
+                    self.annotations.append(
+                        Annotation(
+                            label,
+                            position,
+                            tuple(center),
+                            size=LABEL_SIZE,
+                            target=label,
+                        )
+                    )
+                    continue
                 # Place text label at label_pos, facing +Z
-                text_obj = Text(label, 40)  # Only set size, not font
+                with timing.span("text", label=label):
+                    text_obj = text_shape(label, LABEL_SIZE)  # Only set size, not font
                 #text_obj.label = f'label:{label.split(None,1)[0].removesuffix(".")}'
                 text_obj.label = f'label:{label}'
-                text_obj = text_obj.rotate(Axis.X, 90).rotate(Axis.Z, 180)
-                text_obj = text_obj.translate((label_pos.X, label_pos.Y+AMOUNT_IN_FRONT_OR_TODO_BEHIND, label_pos.Z))
+                text_obj = (
+                    Placement()
+                    .rotate(Axis.X, 90)
+                    .rotate(Axis.Z, 180)
+                    .translate(position)
+                    .apply(text_obj)
+                )
                 labels.append(text_obj)
-        
-        labels_folder = Compound(
-            label="Labels",
-            children=labels,
-        )
         _asm_front = Compound(
             label="Easel Front",
             children=parts_front
@@ -291,14 +366,14 @@ class Easel:
         asm_front = Transforms.rotate_about_point(_asm_front, Axis.X, 42, _leg_floor_midpoint)
         asm_back = Transforms.rotate_about_center(_asm_back, Axis.Y, -34)
         
-        asm = Compound(
-            label="Easel",
-            children=[
-                asm_front,
-                asm_back,
-                Compound(label="Board1", children=parts_backboards),
-                labels_folder],
-        )
+        children = [
+            asm_front,
+            asm_back,
+            Compound(label="Board1", children=parts_backboards),
+        ]
+        if labels:
+            children.append(Compound(label="Labels", children=labels))
+        asm = Compound(label="Easel", children=children)
         return asm
 
     def board_part_between(self, g_part, h_part, label='Board1'):
@@ -306,8 +381,9 @@ class Easel:
         p = self.props
         
         # Get the centers of G and H
-        g_center = g_part.bounding_box().center()
-        h_center = h_part.bounding_box().center()
+        with timing.span("bounding_box", label=label):
+            g_center = bounding_box(g_part).center()
+            h_center = bounding_box(h_part).center()
         
         # Canvas thickness, width, and margin from props
         thickness = p.get("board1_thickness", 0.25*INCH)
@@ -329,6 +405,7 @@ class Easel:
         
         # Create the canvas box centered at origin, then move to mid and align
         box1 = Box(length, width, thickness)
+        placement = Placement()
         # Align canvas along the vector from G to H
         v = Vector(dx, dy, dz)
         v_norm = v.normalized()
@@ -340,12 +417,11 @@ class Easel:
             if rot_axis.length > 1e-6:
                 # Convert rot_axis to Axis for build123d
                 axis = Axis((0, 0, 0), (rot_axis.X, rot_axis.Y, rot_axis.Z))
-                box1 = box1.rotate(axis, rot_angle)
+                placement = placement.rotate(axis, rot_angle)
         # Move to midpoint
-        #box1 = box1.translate((mid.X, mid.Y, mid.Z))
-        box1 = box1.translate((1*INCH, 0, mid.Z))
-        box1.label = label
-        return box1
+        #placement = placement.translate((mid.X, mid.Y, mid.Z))
+        placement = placement.translate((1*INCH, 0, mid.Z))
+        return placement.apply(box1, label=label)
 
 
 def running_in_vscode():
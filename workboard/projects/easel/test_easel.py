@@ -5,20 +5,13 @@ import math
 import pytest
 from build123d import Compound  #, Axis
 from workboard.projects.easel.easel01 import Easel, INCH, Walks
+from workboard.bbox import bounding_box
+from workboard.labelindex import label_index
 
 # --- build123d test helpers ---
 def _get_child_by_label(compound, label):
-    # Recursively search for a child whose label starts with the given label + '. '
-    for child in getattr(compound, 'children', []):
-        child_label = getattr(child, 'label', None)
-        if child_label is not None and child_label.startswith(label + ". "):
-            return child
-        # If the child is a Compound, search recursively
-        if hasattr(child, 'children'):
-            found = _get_child_by_label(child, label)
-            if found is not None:
-                return found
-    return None
+    # The first descendant whose label starts with the given label + '. '
+    return label_index(compound).by_prefix(label)
 
 def get_child_by_label(compound, label):
     obj = _get_child_by_label(compound, label)
@@ -26,22 +19,14 @@ def get_child_by_label(compound, label):
     return obj
 
 
-def collect_labels(compound, labels=None):
-    if labels is None:
-        labels = []
-    for child in getattr(compound, 'children', []):
-        label = getattr(child, 'label', None)
-        if label is not None:
-            labels.append(label)
-        if hasattr(child, 'children'):
-            collect_labels(child, labels)
-    return labels
+def collect_labels(compound):
+    return label_index(compound).labels()
 
 
 # --- build123d spatial test helpers ---
 def assert_centers_close(obj1, obj2, axes="XYZ", tol=1e-2):
-    c1 = obj1.bounding_box().center()
-    c2 = obj2.bounding_box().center()
+    c1 = bounding_box(obj1).center()
+    c2 = bounding_box(obj2).center()
     if "X" in axes:
         assert abs(c1.X - c2.X) < tol, f"X centers not close: {c1.X} vs {c2.X}"
     if "Y" in axes:
@@ -50,7 +35,7 @@ def assert_centers_close(obj1, obj2, axes="XYZ", tol=1e-2):
         assert abs(c1.Z - c2.Z) < tol, f"Z centers not close: {c1.Z} vs {c2.Z}"
 
 def assert_bbox_contains(obj, point, axes="XYZ"):
-    bbox = obj.bounding_box()
+    bbox = bounding_box(obj)
     if "X" in axes:
         assert bbox.min.X <= point.X <= bbox.max.X, f"X {point.X} not in [{bbox.min.X}, {bbox.max.X}]"
     if "Y" in axes:
@@ -59,8 +44,8 @@ def assert_bbox_contains(obj, point, axes="XYZ"):
         assert bbox.min.Z <= point.Z <= bbox.max.Z, f"Z {point.Z} not in [{bbox.min.Z}, {bbox.max.Z}]"
 
 def assert_bbox_overlap(obj1, obj2, axes="XYZ"):
-    b1 = obj1.bounding_box()
-    b2 = obj2.bounding_box()
+    b1 = bounding_box(obj1)
+    b2 = bounding_box(obj2)
     if "X" in axes:
         assert b1.max.X >= b2.min.X and b2.max.X >= b1.min.X, f"No X overlap: {b1} vs {b2}"
     if "Y" in axes:
@@ -72,8 +57,8 @@ def assert_bbox_top_covers_center(obj, target_obj, axes="Z"):
     """
     Assert that the top (max along axes) of obj's bounding box is at or above the center of target_obj along the given axes.
     """
-    bbox = obj.bounding_box()
-    target_center = target_obj.bounding_box().center()
+    bbox = bounding_box(obj)
+    target_center = bounding_box(target_obj).center()
     if "X" in axes:
         assert bbox.max.X >= target_center.X, f"Top X {bbox.max.X} does not cover center X {target_center.X}"
     if "Y" in axes:
@@ -123,9 +108,9 @@ def test_legs_a_b_lean_toward_c():
     assert_bbox_top_covers_center(leg_a, leg_c, axes="Z")
     assert_bbox_top_covers_center(leg_b, leg_c, axes="Z")
     # X: A left, B right, C centered
-    assert leg_a.bounding_box().center().X < 0
-    assert leg_b.bounding_box().center().X > 0
-    assert abs(leg_c.bounding_box().center().X) < 1e-3
+    assert bounding_box(leg_a).center().X < 0
+    assert bounding_box(leg_b).center().X > 0
+    assert abs(bounding_box(leg_c).center().X) < 1e-3
     # Y: all in same Y plane (within tol)
     assert_centers_close(leg_a, leg_c, axes="Y")
     assert_centers_close(leg_b, leg_c, axes="Y")
@@ -141,8 +126,8 @@ def test_crossbars_meet_legs():
     assert_centers_close(crossbar_d, leg_a, axes="Z", tol=1*INCH)
     assert_centers_close(crossbar_e, leg_a, axes="Z", tol=1*INCH)
     # X: crossbar D spans A/B, E is centered
-    assert_bbox_contains(crossbar_d, leg_a.bounding_box().center(), axes="X")
-    assert_bbox_contains(crossbar_d, leg_b.bounding_box().center(), axes="X")
+    assert_bbox_contains(crossbar_d, bounding_box(leg_a).center(), axes="X")
+    assert_bbox_contains(crossbar_d, bounding_box(leg_b).center(), axes="X")
     # Y: all in same Y plane
     assert_centers_close(crossbar_d, leg_a, axes="Y")
     assert_centers_close(crossbar_e, leg_a, axes="Y")
@@ -153,7 +138,7 @@ def test_leg_f_joins_crossbars():
     leg_f = get_child_by_label(model, "F")
     crossbar_d = get_child_by_label(model, "D")
     # F starts at D in Z, is close in X/Y
-    assert_bbox_contains(leg_f, crossbar_d.bounding_box().center(), axes="Z")
+    assert_bbox_contains(leg_f, bounding_box(crossbar_d).center(), axes="Z")
     assert_centers_close(leg_f, crossbar_d, axes="X")
     assert_centers_close(leg_f, crossbar_d, axes="Y")
 
@@ -165,7 +150,7 @@ def test_leg_f_through_d_e_g():
     crossbar_e = get_child_by_label(model, "E")
     top_rail_g = get_child_by_label(model, "G")
     # F min Z at D, max Z at/above E and G
-    assert_bbox_contains(leg_f, crossbar_d.bounding_box().center(), axes="Z")
+    assert_bbox_contains(leg_f, bounding_box(crossbar_d).center(), axes="Z")
     assert_bbox_top_covers_center(leg_f, crossbar_e, axes="Z")
     assert_bbox_top_covers_center(leg_f, top_rail_g, axes="Z")
     # X/Y: F, D, E, G all aligned
@@ -180,7 +165,7 @@ def test_crossbar_e_is_16_in():
     easel = Easel()
     model = easel.render()
     crossbar_e = get_child_by_label(model, "E")
-    width = crossbar_e.bounding_box().max.X - crossbar_e.bounding_box().min.X
+    width = bounding_box(crossbar_e).max.X - bounding_box(crossbar_e).min.X
     assert width == pytest.approx(16 * INCH, abs=0.1)
 
 def test_legs_a_b_join_crossbars():
@@ -190,10 +175,10 @@ def test_legs_a_b_join_crossbars():
     leg_b = get_child_by_label(model, "B")
     crossbar_d = get_child_by_label(model, "D")
     # Only require that the X center of legs A and B is within the X span of crossbar D (not E)
-    min_x = crossbar_d.bounding_box().min.X
-    max_x = crossbar_d.bounding_box().max.X
-    a_x = leg_a.bounding_box().center().X
-    b_x = leg_b.bounding_box().center().X
+    min_x = bounding_box(crossbar_d).min.X
+    max_x = bounding_box(crossbar_d).max.X
+    a_x = bounding_box(leg_a).center().X
+    b_x = bounding_box(leg_b).center().X
     assert min_x < a_x < max_x
     assert min_x < b_x < max_x
 
@@ -204,14 +189,42 @@ def test_legs_a_b_join_crossbars_xyz():
     leg_b = get_child_by_label(model, "B")
     crossbar_d = get_child_by_label(model, "D")
     # X: leg centers within crossbar D's X span
-    assert_bbox_contains(crossbar_d, leg_a.bounding_box().center(), axes="X")
-    assert_bbox_contains(crossbar_d, leg_b.bounding_box().center(), axes="X")
+    assert_bbox_contains(crossbar_d, bounding_box(leg_a).center(), axes="X")
+    assert_bbox_contains(crossbar_d, bounding_box(leg_b).center(), axes="X")
     # Y: leg and crossbar Y centers should be close (same plane)
     assert_centers_close(leg_a, crossbar_d, axes="Y")
     assert_centers_close(leg_b, crossbar_d, axes="Y")
     # Z: crossbar D's Z center should be within leg A/B Z span
-    assert_bbox_contains(leg_a, crossbar_d.bounding_box().center(), axes="Z")
-    assert_bbox_contains(leg_b, crossbar_d.bounding_box().center(), axes="Z")
+    assert_bbox_contains(leg_a, bounding_box(crossbar_d).center(), axes="Z")
+    assert_bbox_contains(leg_b, bounding_box(crossbar_d).center(), axes="Z")
+
+def test_label_modes():
+    solid = Easel().render()
+    (solid_labels,) = [child for child in solid.children if child.label == "Labels"]
+    assert len(solid_labels.children) == 10
+
+    easel = Easel({"label_mode": "annotation"})
+    model = easel.render()
+    assert [child.label for child in model.children] == [
+        "Easel Front",
+        "Easel Back",
+        "Board1",
+    ]
+    assert [a.text for a in easel.annotations] == [
+        label.label.removeprefix("label:") for label in solid_labels.children
+    ]
+    # each annotation is where the solid label was drawn (up to the glyphs' extents)
+    for annotation, label in zip(easel.annotations, solid_labels.children):
+        center = bounding_box(label).center()
+        assert annotation.position[0] == pytest.approx(center.X, abs=10)
+        assert annotation.position[2] == pytest.approx(center.Z, abs=10)
+
+    easel = Easel({"label_mode": "none"})
+    assert len(easel.render().children) == 3
+    assert easel.annotations == []
+    with pytest.raises(ValueError):
+        Easel({"label_mode": "3d"})
+
 
 def test_part_labels_are_offset():
     easel = Easel()
@@ -234,8 +247,8 @@ def test_part_labels_are_offset():
                 part = candidate
                 break
         if part is not None:
-            part_center = part.bounding_box().center()
-            label_center = label.bounding_box().center()
+            part_center = bounding_box(part).center()
+            label_center = bounding_box(label).center()
             dist = (label_center - part_center).Length
             assert dist > 50, f"Label '{label_str}' is not offset from part center: dist={dist}"
 
@@ -259,9 +272,9 @@ def test_board1_centered_between_g_and_h():
     # Create Board1
     board1 = easel.board_part_between(g, h, label="Board1")
     # Get centers
-    g_center = g.bounding_box().center()
-    h_center = h.bounding_box().center()
-    board1_center = board1.bounding_box().center()
+    g_center = bounding_box(g).center()
+    h_center = bounding_box(h).center()
+    board1_center = bounding_box(board1).center()
     # Assert X center is between G and H (within tolerance)
     expected_x = (g_center.X + h_center.X) / 2
     assert math.isclose(board1_center.X, expected_x, abs_tol=1e-6), f"Board1 X center {board1_center.X} != expected {expected_x}"
@@ -0,0 +1,233 @@
+"""
+batch.py
+
+Batch mode: render many pizzapancoolingmat prop sets in one process.
+
+Each input line is a JSON object of per-group overrides, e.g.::
+
+    {"id": "wide", "pan": {"diameter": 350}, "riser": {"height": 12}}
+
+Overrides are merged onto the base props (a prop set from DEFAULTS plus any
+CLI overrides), validated with PanModel/RiserModel/LaptopModel and rendered
+with PizzaPanCoolingMatAssembly. One JSON result line is written per input
+line, as soon as it's rendered, so build123d is imported once for thousands
+of variants. Each line exports into its own subdirectory of the output
+directory, with its own export manifest (see workboard.exporting), so a
+line's export doesn't re-read and rewrite the entries of every line before
+it.
+
+Usage::
+
+    $ pizza-pan-cooling-mat --batch variants.jsonl --batch-output results.jsonl \\
+        --output-dir out/batch --format .step --format .stl
+    $ cat variants.jsonl | pizza-pan-cooling-mat --batch - > results.jsonl
+
+Result lines::
+
+    {"index": 0, "id": "wide", "status": "ok", "error": null,
+     "props": {"pan": {...}, "riser": {...}, "laptop": {...}},
+     "timings": {"validate_s": ..., "render_s": ..., "bbox_s": ..., "export_s": ...},
+     "bbox": [[xmin, ymin, zmin], [xmax, ymax, zmax]],
+     "files": {".step": "out/batch/pizzapancoolingmat_0000/pizzapancoolingmat_0000_assembly.step"}}
+
+status is "ok", "invalid" (malformed JSON or props that don't validate) or
+"error" (render or export failed).
+"""
+
+import copy
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence, TextIO
+
+from workboard import timing
+
+GROUPS = ("pan", "riser", "laptop")
+
+# keys of an input line that aren't prop groups
+META_KEYS = ("id",)
+
+
+class InvalidProps(ValueError):
+    """An input line that isn't a JSON object of known prop groups."""
+
+
+def parse_line(line: str) -> Dict[str, Any]:
+    """Parse an input line into a {group: overrides} object."""
+    try:
+        obj = json.loads(line)
+    except ValueError as exc:
+        raise InvalidProps(f"invalid JSON: {exc}") from None
+    if not isinstance(obj, dict):
+        raise InvalidProps(f"expected a JSON object, got {type(obj).__name__}")
+    unknown = set(obj) - set(GROUPS) - set(META_KEYS)
+    if unknown:
+        raise InvalidProps(f"unknown prop groups: {sorted(unknown)}")
+    for group in GROUPS:
+        if not isinstance(obj.get(group, {}), dict):
+            raise InvalidProps(f"{group!r} must be an object")
+    return obj
+
+
+def merge_props(
+    base: Dict[str, Dict[str, Any]], overrides: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """Return base with each group's overrides applied (base isn't modified)."""
+    props = copy.deepcopy(base)
+    for group in GROUPS:
+        props.setdefault(group, {}).update(overrides.get(group, {}))
+    return props
+
+
+def validate_props(props: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Validate props with the pydantic models.
+
+    Raises:
+        InvalidProps: if a group has a prop the model doesn't define.
+        pydantic.ValidationError: if a group is missing a required prop
+            or a prop has an invalid value.
+    """
+    from workboard.projects.pizzapancoolingmat.schemas import (
+        LaptopModel,
+        PanModel,
+        RiserModel,
+    )
+
+    models = {"pan": PanModel, "riser": RiserModel, "laptop": LaptopModel}
+    validated = {}
+    for group, model in models.items():
+        unknown = set(props.get(group, {})) - set(model.model_fields)
+        if unknown:
+            raise InvalidProps(f"unknown {group} props: {sorted(unknown)}")
+        validated[group] = model(**props.get(group, {})).model_dump()
+    return validated
+
+
+def render_line(
+    index: int,
+    line: str,
+    base: Dict[str, Dict[str, Any]],
+    cls=None,
+    output_dir: Optional[str] = None,
+    formats: Sequence[str] = (".step",),
+    profile: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Validate, render (and optionally export) the prop set of one input line.
+
+    Args:
+        index (int): the line's index in the input (blank lines excluded).
+        line (str): a JSON object of {group: overrides}.
+        base: props that the overrides are merged onto.
+        cls: the assembly class (default: PizzaPanCoolingMatAssembly).
+        output_dir (str): if set, export the assembly to the line's
+            subdirectory of it, ``f"pizzapancoolingmat_{index:04d}"``.
+        formats: export formats (see workboard.exporting.FORMATS).
+        profile (str): tessellation profile of the mesh formats (see
+            workboard.tessellation.PROFILES).
+
+    Returns:
+        dict: a JSON-serializable result row (see the module docstring).
+    """
+    result: Dict[str, Any] = {
+        "index": index,
+        "id": None,
+        "status": "ok",
+        "error": None,
+        "props": None,
+        "timings": {
+            "validate_s": None,
+            "render_s": None,
+            "bbox_s": None,
+            "export_s": None,
+        },
+        "bbox": None,
+        "files": {},
+    }
+    timings = result["timings"]
+    try:
+        start = time.perf_counter()
+        overrides = parse_line(line)
+        result["id"] = overrides.get("id")
+        props = validate_props(merge_props(base, overrides))
+        timings["validate_s"] = time.perf_counter() - start
+        result["props"] = props
+    except Exception as exc:  # InvalidProps or pydantic.ValidationError
+        result["status"] = "invalid"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return result
+
+    try:
+        if cls is None:
+            from workboard.projects.pizzapancoolingmat.pizzapancoolingmat import (
+                PizzaPanCoolingMatAssembly,
+            )
+
+            cls = PizzaPanCoolingMatAssembly
+        start = time.perf_counter()
+        asm = cls(props).render()
+        timings["render_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bbox = asm.bounding_box()
+        result["bbox"] = [list(bbox.min), list(bbox.max)]
+        timings["bbox_s"] = time.perf_counter() - start
+
+        if output_dir is not None:
+            from workboard.exporting import export_parts
+
+            start = time.perf_counter()
+            stem = f"pizzapancoolingmat_{index:04d}"
+            report = export_parts(
+                [("assembly", asm)],
+                filename_prefix=os.path.join(output_dir, stem, stem),
+                formats=formats,
+                max_workers=0,
+                profile=profile,
+            )
+            timings["export_s"] = time.perf_counter() - start
+            result["files"] = report.files["assembly"]
+    except Exception as exc:
+        result["status"] = "error"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def run_batch(
+    lines: Iterable[str],
+    out: TextIO,
+    base: Dict[str, Dict[str, Any]],
+    cls=None,
+    output_dir: Optional[str] = None,
+    formats: Sequence[str] = (".step",),
+    profile: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Render every input line, writing one JSON result line to out per input line.
+
+    Blank lines are skipped. Each result is flushed as soon as it's written.
+
+    Returns:
+        dict: {status: number of lines}, e.g. {"ok": 998, "invalid": 2, "error": 0}.
+    """
+    counts = {"ok": 0, "invalid": 0, "error": 0}
+    index = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        with timing.span("batch_line", index=index):
+            result = render_line(
+                index,
+                line,
+                base,
+                cls=cls,
+                output_dir=output_dir,
+                formats=formats,
+                profile=profile,
+            )
+        counts[result["status"]] += 1
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        index += 1
+    return counts
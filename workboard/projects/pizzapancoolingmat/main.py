@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 pizzapancoolingmat.main
+
+Help, --list-props and --list-props-schema are answered from the props
+schema snapshot (see propsschema.py); pydantic and build123d are only
+imported when props are validated and rendered.
 """
 import argparse
 import json
@@ -8,19 +12,16 @@ import os
 import pprint
 import sys
 
-try:
-    from pydantic_core import PydanticUndefined
-except ImportError:
-    try:
-        from pydantic._internal._core import PydanticUndefined # type: ignore
-    except ImportError:
-        PydanticUndefined = None  # fallback, should not happen
+from workboard.projects.pizzapancoolingmat.propsschema import load_snapshot
+
+SNAPSHOT = load_snapshot()
+DEFAULTS = SNAPSHOT["defaults"]
 
-from workboard.projects.pizzapancoolingmat.pizzapancoolingmat import PizzaPanCoolingMatAssembly
-from workboard.projects.pizzapancoolingmat.schemas import DEFAULTS, PanModel, RiserModel, LaptopModel
+# how a required field's default is printed (like pydantic's PydanticUndefined)
+UNDEFINED = "PydanticUndefined"
 
 
-def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly):
+def run_with_args(args: list[str] | None = None, cls=None):
     parser = argparse.ArgumentParser(
         description="""
         Render PizzaPanCoolingMatAssembly.
@@ -29,6 +30,7 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
           %(prog)s --list-props
           %(prog)s --list-props-schema
           %(prog)s --props default0 --pan-diameter 350 --show
+          %(prog)s --batch variants.jsonl --batch-output results.jsonl --output-dir out
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -54,17 +56,44 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
         help='Show the rendered assembly in the OCP CAD Viewer (VS Code only).'
     )
 
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help="Render each JSON line of {pan, riser, laptop} overrides in PATH ('-': stdin) "
+        "and write one JSON result line per input line, then exit.",
+    )
+    parser.add_argument(
+        '--batch-output',
+        metavar='PATH',
+        default='-',
+        help="Where --batch writes its JSON result lines (default: '-', stdout)."
+    )
+    parser.add_argument(
+        '--output-dir',
+        help='With --batch, export each rendered assembly to this directory.'
+    )
+    parser.add_argument(
+        "--format",
+        action="append",
+        help="With --output-dir, an export format, e.g. .step or .stl; repeatable (default: .step).",
+    )
+    parser.add_argument(
+        "--profile",
+        help="With --output-dir, the tessellation profile of mesh formats: preview, print or archival "
+        "(default: print).",
+    )
+
     # Always add all possible prop CLI arguments for all models, using model defaults
-    MODEL_MAP = {"pan": PanModel, "riser": RiserModel, "laptop": LaptopModel}
+    MODEL_MAP = SNAPSHOT["groups"]
     for group, model in MODEL_MAP.items():
-        for key, field in model.model_fields.items():
+        for key, field in model["fields"].items():
             arg_name = f'--{group}-{key.replace("_", "-")}'
-            desc = field.description or ""
-            unit = field.json_schema_extra.get("unit") if field.json_schema_extra else None
+            desc = field["description"] or ""
+            unit = field["unit"]
             unit_str = f" ; unit: {unit} ;" if unit else ""
-            default = field.default
+            default = UNDEFINED if field["required"] else field["default"]
             kwargs = {}
-            if default is not PydanticUndefined:
+            if not field["required"]:
                 kwargs["default"] = default
                 kwargs["type"] = type(default)
             else:
@@ -81,8 +110,11 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
         print("\n=== PROPS SCHEMA ===")
         for group, model in MODEL_MAP.items():
             print(f"[{group}]")
-            for key, field in model.model_fields.items():
-                print(f"  {key} ({field.annotation.__name__}): {field.description} (default: {field.default})")
+            for key, field in model["fields"].items():
+                default = UNDEFINED if field["required"] else field["default"]
+                print(
+                    f"  {key} ({field['annotation']}): {field['description']} (default: {default})"
+                )
             print()
         print("=== RAW PROPS ===")
         pprint.pprint(DEFAULTS)
@@ -92,7 +124,7 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
         print("\n=== PROPS JSON SCHEMA ===")
         for group, model in MODEL_MAP.items():
             print(f"[{group}] JSON Schema:")
-            print(json.dumps(model.model_json_schema(), indent=2))
+            print(json.dumps(model["json_schema"], indent=2))
             print()
         exit(0)
 
@@ -103,15 +135,16 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
         print(f"[ERROR] Prop set '{props_set}' not found in PROPS", file=sys.stderr)
         sys.exit(1)
 
-    print(f"\n=== PROPS FOR SET '{props_set}' ===")
-    pprint.pprint(props)
+    if not parsed.batch:
+        print(f"\n=== PROPS FOR SET '{props_set}' ===")
+        pprint.pprint(props)
 
     # Build props dicts for each group, ensuring all required fields are present
     props_dict = {}
     for group, model in MODEL_MAP.items():
         group_dict = {}
         group_props = props.get(group, {})
-        for key in model.model_fields:
+        for key in model["fields"]:
             arg_name = f'{group}_{key}'
             cli_value = getattr(parsed, arg_name, None)
             if cli_value is not None:
@@ -121,7 +154,16 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
             # else: leave missing, so Pydantic will raise if required
         props_dict[group] = group_dict
 
+    if parsed.batch:
+        sys.exit(run_batch_with_args(parsed, props_dict, cls))
+
     # Validate props_dict using Pydantic models
+    from workboard.projects.pizzapancoolingmat.schemas import (
+        LaptopModel,
+        PanModel,
+        RiserModel,
+    )
+
     try:
         props_dict["pan"] = PanModel(**props_dict["pan"]).model_dump()
         props_dict["riser"] = RiserModel(**props_dict["riser"]).model_dump()
@@ -132,6 +174,12 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
         traceback.print_exc()
         sys.exit(1)
 
+    if cls is None:
+        from workboard.projects.pizzapancoolingmat.pizzapancoolingmat import (
+            PizzaPanCoolingMatAssembly,
+        )
+
+        cls = PizzaPanCoolingMatAssembly
     assembly = cls(props_dict)
     asm = assembly.render()
     if parsed.show:
@@ -140,6 +188,33 @@ def run_with_args(args: list[str] | None = None, cls=PizzaPanCoolingMatAssembly)
     return asm
 
 
+def run_batch_with_args(parsed: argparse.Namespace, base: dict, cls=None) -> int:
+    """Run --batch; return the exit status (1 if any line failed)."""
+    from workboard.projects.pizzapancoolingmat.batch import run_batch
+
+    infile = sys.stdin if parsed.batch == "-" else open(parsed.batch)
+    outfile = (
+        sys.stdout if parsed.batch_output == "-" else open(parsed.batch_output, "w")
+    )
+    try:
+        counts = run_batch(
+            infile,
+            outfile,
+            base,
+            cls=cls,
+            output_dir=parsed.output_dir,
+            formats=parsed.format or (".step",),
+            profile=parsed.profile,
+        )
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    print(f"[batch] {counts}", file=sys.stderr)
+    return 1 if counts["invalid"] or counts["error"] else 0
+
+
 def running_in_vscode() -> bool:
     return "VSCODE_IPC_HOOK_CLI" in os.environ
 
@@ -17,9 +17,12 @@ TODO:
 import os
 from typing import Any, Dict
 
-from build123d import Axis, Part, Cylinder, Box, Location
+from build123d import Part, Cylinder, Box, Location
 from build123d.topology import Compound  #, Edge, Face, ShapeList, Solid, Sketch
 
+from workboard import timing
+from workboard.bbox import bounding_box
+from workboard.instancing import place
 from workboard.projects.pizzapancoolingmat.schemas import DEFAULTS
 
 
@@ -37,6 +40,7 @@ class PizzaPanComponent:
     def defaultProps():
         return DEFAULTS["default0"]["pan"]
 
+    @timing.timed("PizzaPanComponent.render")
     def render(self) -> Compound:
         """
         Render the pizza pan geometry.
@@ -50,12 +54,14 @@ class PizzaPanComponent:
         disk = Cylinder(diameter / 2, thickness)
         # Rim (optional)
         rim = Cylinder(diameter / 2, rim_height)
-        rim = rim - Cylinder((diameter / 2) - 10, rim_height)
-        rim = rim.translate((0, 0, thickness-1))
-        pan = disk + rim
+        with timing.span("boolean", part="pan"):
+            rim = rim - Cylinder((diameter / 2) - 10, rim_height)
+            rim = rim.translate((0, 0, thickness-1))
+            pan = disk + rim
         # Ensure the bottom of the pan is at Z=0 (disk and rim both start at Z=0)
         # If the bounding box min.Z is not 0, translate pan down
-        min_z = pan.bounding_box().min.Z
+        with timing.span("bounding_box", part="pan"):
+            min_z = bounding_box(pan).min.Z
         if abs(min_z) > 1e-6:
             pan = pan.translate((0, 0, -min_z))
         return pan
@@ -75,6 +81,7 @@ class MagneticLaptopRiserSquareComponent:
     def defaultProps():
         return DEFAULTS["default0"]["riser"]
 
+    @timing.timed("MagneticLaptopRiserSquareComponent.render")
     def render(self) -> Part:
         """
         Render the riser geometry.
@@ -102,6 +109,7 @@ class LaptopComponent:
     def defaultProps():
         return DEFAULTS["default0"]["laptop"]
 
+    @timing.timed("LaptopComponent.render")
     def render(self) -> Part:
         """
         Render the laptop geometry.
@@ -132,6 +140,7 @@ class PizzaPanCoolingMatAssembly:
     def defaultProps():
         return DEFAULTS["default0"]
 
+    @timing.timed("PizzaPanCoolingMatAssembly.render")
     def render(self) -> Compound:
         """
         Render the full cooling mat assembly.
@@ -147,16 +156,13 @@ class PizzaPanCoolingMatAssembly:
 
         # The top of the riser is at riser_z_offset + riser_height
         # The bottom of pan2 should be at the top of the risers
-        # Render a riser to get its bounding box
+        # Each component is rendered once and placed as instances sharing its geometry
         magnet_geom = MagneticLaptopRiserSquareComponent(props["riser"]).render()
-        
+        rotate_z90 = Location((0, 0, 0), (0, 0, 90))
+
         # Render a pan to get its bounding box
         pan_geom = PizzaPanComponent(props["pan"]).render()
-        pan1 = pan_geom
-        pan1.label = "Pan 1"
-
-
-        magnet_geom = MagneticLaptopRiserSquareComponent(props["riser"]).render()
+        pan1 = place(pan_geom, Location(), label="Pan 1")
 
         risers = []
         risers1_z = pan_thickness + GAP_TOLERANCE  # Distance from base to bottom of riser (could be a prop)
@@ -165,18 +171,19 @@ class PizzaPanCoolingMatAssembly:
         for i in range(2):
             x = (-100)
             y = (-80 if i % 2 == 0 else 80)
-            riser = magnet_geom.rotate(Axis.Z, 90)
-            riser = riser.translate((x, y, risers1_z))
-            riser.label = "Magnet (Layer 1)"
+            riser = place(
+                magnet_geom,
+                Location((x, y, risers1_z)) * rotate_z90,
+                label="Magnet (Layer 1)",
+            )
             risers.append(riser)
 
-        risers1_top_z = risers[0].bounding_box().max.Z
+        risers1_top_z = bounding_box(risers[0]).max.Z
 
         pan2_z = risers1_top_z + GAP_TOLERANCE
-        pan2 = pan_geom.translate((0, 0, pan2_z))
-        pan2.label = "Pan 2"
+        pan2 = place(pan_geom, Location((0, 0, pan2_z)), label="Pan 2")
         
-        pan2_top_z = pan2.bounding_box().max.Z
+        pan2_top_z = bounding_box(pan2).max.Z
         
         #RANDOM_NUMBER = 10
         RANDOM_NUMBER = riser_height / 2 - pan_thickness / 2
@@ -185,40 +192,47 @@ class PizzaPanCoolingMatAssembly:
         for i in [2,3]:
             x = (-100)
             y = (-80 if i % 2 == 0 else 80)
-            riser = magnet_geom.rotate(Axis.Z, 90)
-            riser = riser.translate((x, y, risers2_z))
-            riser.label = "Magnet (Layer 2)"
+            riser = place(
+                magnet_geom,
+                Location((x, y, risers2_z)) * rotate_z90,
+                label="Magnet (Layer 2)",
+            )
             risers.append(riser)
 
-        risers2_top_z = risers[2].bounding_box().max.Z
+        risers2_top_z = bounding_box(risers[2]).max.Z
 
         stopper_magnets = [] 
 
         x = 132
         y = 0
         magnet1_z = pan2_top_z + RANDOM_NUMBER
-        magnet1 = magnet_geom.rotate(Axis.Z, 90)
-        magnet1 = magnet1.translate((x, y, magnet1_z))
-        magnet1.label = "Stopper magnet 1"
+        magnet1 = place(
+            magnet_geom,
+            Location((x, y, magnet1_z)) * rotate_z90,
+            label="Stopper magnet 1",
+        )
         stopper_magnets.append(magnet1)
 
         x = 148
 
-        x = magnet1.bounding_box().max.X + (props["riser"]["height"] / 2)
+        x = bounding_box(magnet1).max.X + (props["riser"]["height"] / 2)
 
         y = 0
         magnet2_z = pan2_top_z + (props["riser"]["width"]/ 2) - pan_thickness/2
-        magnet2 = magnet_geom.rotate(Axis.Z, 90).rotate(Axis.Y, 90)
-        magnet2 = magnet2.translate((x, y, magnet2_z))
-        magnet2.label = "Stopper magnet 2"
+        rotate_y90 = Location((0, 0, 0), (0, 90, 0))
+        magnet2 = place(
+            magnet_geom,
+            Location((x, y, magnet2_z)) * rotate_y90 * rotate_z90,
+            label="Stopper magnet 2",
+        )
         stopper_magnets.append(magnet2)
 
         # Place laptop so its bottom is at the top of pan2
         laptop_geom = LaptopComponent(props["laptop"]).render()
         laptop_z = risers2_top_z + laptop_thickness / 2
-        laptop = laptop_geom.translate((0, 0, laptop_z))
-        laptop = laptop.rotate(Axis.Z, 90)
-        laptop.label = "Laptop"
+        laptop = place(
+            laptop_geom, rotate_z90 * Location((0, 0, laptop_z)), label="Laptop"
+        )
 
         parts = []
         parts.append(pan1) #, name="pan1")
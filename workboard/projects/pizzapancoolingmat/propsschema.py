@@ -0,0 +1,109 @@
+"""
+propsschema.py
+
+A JSON snapshot of the props schemas and DEFAULTS in schemas.py, so the
+CLI can print help, --list-props and --list-props-schema without importing
+pydantic (or build123d).
+
+The snapshot (props_schema.json) records the sha256 of schemas.py. When
+schemas.py changes, load_snapshot() falls back to building the snapshot
+from the pydantic models in memory; it never writes the file (test_startup
+fails until the snapshot is regenerated)::
+
+    $ python -m workboard.projects.pizzapancoolingmat.propsschema
+    $ make props-schema
+
+Usage::
+
+    snapshot = load_snapshot()
+    snapshot["groups"]["pan"]["fields"]["diameter"]
+    # {"annotation": "float", "description": "...", "required": True, "unit": "mm", ...}
+    snapshot["defaults"]["default0"]
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "props_schema.json")
+SCHEMAS_PATH = os.path.join(os.path.dirname(__file__), "schemas.py")
+
+# {group: model class name in schemas.py}
+MODEL_NAMES = {"pan": "PanModel", "riser": "RiserModel", "laptop": "LaptopModel"}
+
+
+def schemas_sha256() -> str:
+    with open(SCHEMAS_PATH, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_snapshot() -> Dict[str, Any]:
+    """Build the snapshot from the pydantic models in schemas.py."""
+    from pydantic_core import PydanticUndefined
+
+    from workboard.projects.pizzapancoolingmat import schemas
+
+    groups = {}
+    for group, model_name in MODEL_NAMES.items():
+        model = getattr(schemas, model_name)
+        fields = {}
+        for key, field in model.model_fields.items():
+            required = field.default is PydanticUndefined
+            extra = (
+                field.json_schema_extra
+                if isinstance(field.json_schema_extra, dict)
+                else {}
+            )
+            fields[key] = {
+                "annotation": field.annotation.__name__,
+                "description": field.description,
+                "required": required,
+                "default": None if required else field.default,
+                "unit": extra.get("unit"),
+            }
+        groups[group] = {
+            "model": model_name,
+            "fields": fields,
+            "json_schema": model.model_json_schema(),
+        }
+    return {
+        "schemas_sha256": schemas_sha256(),
+        "groups": groups,
+        "defaults": schemas.DEFAULTS,
+    }
+
+
+def write_snapshot(snapshot: Dict[str, Any], path: str = SNAPSHOT_PATH) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f, indent=1)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    """Return the snapshot file if it's current with schemas.py, else None."""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("schemas_sha256") != schemas_sha256():
+        return None
+    return snapshot
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Dict[str, Any]:
+    """
+    Return the snapshot; if it's missing or stale, build it from schemas.py.
+
+    The fallback imports pydantic and doesn't write the snapshot file.
+    """
+    snapshot = read_snapshot(path)
+    return snapshot if snapshot is not None else build_snapshot()
+
+
+if __name__ == "__main__":
+    write_snapshot(build_snapshot())
+    print(SNAPSHOT_PATH)
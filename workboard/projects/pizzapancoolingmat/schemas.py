@@ -102,4 +102,5 @@ def debug_print_defaults():
     pprint.pprint(DEFAULTS)
 
 
-debug_print_defaults()
+if __name__ == "__main__":
+    debug_print_defaults()
@@ -0,0 +1,129 @@
+"""
+test_batch.py
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+from workboard.exporting import MANIFEST_FILENAME, read_manifest
+
+from .batch import merge_props, run_batch
+from .schemas import DEFAULTS
+
+BASE = DEFAULTS["default0"]
+
+LINES = [
+    '{"id": "wide", "pan": {"diameter": 350}, "riser": {"height": 12}}\n',
+    "\n",
+    '{"riser": {"height": "tall"}}\n',
+    '{"pan": {"diam": 300}}\n',
+    '{"fan": {}}\n',
+    "not json\n",
+    '{"laptop": {"length": 400}}\n',
+]
+
+
+def run(lines, **kwargs):
+    out = io.StringIO()
+    counts = run_batch(lines, out, BASE, **kwargs)
+    return counts, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_merge_props_does_not_modify_base():
+    props = merge_props(BASE, {"pan": {"diameter": 1}})
+    assert props["pan"]["diameter"] == 1
+    assert props["pan"]["thickness"] == BASE["pan"]["thickness"]
+    assert BASE["pan"]["diameter"] == 330
+
+
+def test_run_batch_one_result_per_line():
+    counts, results = run(LINES)
+    assert counts == {"ok": 2, "invalid": 4, "error": 0}
+    assert [r["index"] for r in results] == list(range(6))
+    assert [r["status"] for r in results] == [
+        "ok",
+        "invalid",
+        "invalid",
+        "invalid",
+        "invalid",
+        "ok",
+    ]
+
+    wide = results[0]
+    assert wide["id"] == "wide"
+    assert wide["error"] is None
+    assert wide["props"]["pan"]["diameter"] == 350
+    assert wide["props"]["riser"]["height"] == 12
+    assert wide["props"]["laptop"] == BASE["laptop"]
+    (xmin, _, zmin), (xmax, _, _) = wide["bbox"]
+    assert xmax - xmin >= 350
+    assert zmin == 0
+    assert wide["timings"]["render_s"] > 0
+    assert wide["timings"]["export_s"] is None
+    assert wide["files"] == {}
+
+    assert "RiserModel" in results[1]["error"]
+    assert "diam" in results[2]["error"]
+    assert "fan" in results[3]["error"]
+    assert "invalid JSON" in results[4]["error"]
+    assert results[5]["props"]["laptop"]["length"] == 400
+
+
+def test_run_batch_render_error():
+    class Broken:
+        def __init__(self, props):
+            pass
+
+        def render(self):
+            raise RuntimeError("boom")
+
+    counts, results = run(['{"pan": {}}\n'], cls=Broken)
+    assert counts == {"ok": 0, "invalid": 0, "error": 1}
+    assert results[0]["error"] == "RuntimeError: boom"
+
+
+def test_run_batch_export(tmp_path):
+    counts, results = run(
+        LINES[:1], output_dir=str(tmp_path), formats=(".step", ".stl")
+    )
+    assert counts["ok"] == 1
+    files = results[0]["files"]
+    assert sorted(files) == [".step", ".stl"]
+    for ext, path in files.items():
+        assert path == str(
+            tmp_path
+            / "pizzapancoolingmat_0000"
+            / f"pizzapancoolingmat_0000_assembly{ext}"
+        )
+        assert os.path.getsize(path) > 0
+    # each line has its own manifest
+    assert sorted(read_manifest(str(tmp_path / "pizzapancoolingmat_0000"))) == [
+        "pizzapancoolingmat_0000_assembly.step",
+        "pizzapancoolingmat_0000_assembly.stl",
+    ]
+    assert not os.path.exists(tmp_path / MANIFEST_FILENAME)
+
+
+def test_cli_batch_stdin():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "workboard.projects.pizzapancoolingmat.main",
+            "--batch",
+            "-",
+            "--pan-thickness",
+            "4",
+        ],
+        input="".join(LINES[:2] + LINES[-1:]),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    results = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r["status"] for r in results] == ["ok", "ok"]
+    # CLI overrides are part of the base props
+    assert all(r["props"]["pan"]["thickness"] == 4 for r in results)
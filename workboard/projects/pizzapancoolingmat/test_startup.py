@@ -0,0 +1,60 @@
+"""
+test_startup.py
+
+main.py answers --help, --list-props and --list-props-schema from the
+props schema snapshot, without importing pydantic or the CAD kernel.
+
+How long that takes is measured by the startup:pizzapancoolingmat cases
+of the benchmark suite (``make bench``), not asserted here.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from .propsschema import SNAPSHOT_PATH, build_snapshot, load_snapshot, read_snapshot
+
+STARTUP_SCRIPT = """
+import contextlib, io, json, sys
+from workboard.projects.pizzapancoolingmat import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main.run_with_args([{arg!r}])
+    except SystemExit:
+        pass
+heavy = sorted(m for m in ("build123d", "OCP", "pydantic", "pydantic_core") if m in sys.modules)
+print(json.dumps({{"heavy": heavy}}))
+"""
+
+
+@pytest.mark.parametrize("arg", ["--help", "--list-props", "--list-props-schema"])
+def test_startup_is_lazy(arg):
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(arg=arg)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    assert result["heavy"] == []
+
+
+def test_snapshot_is_current():
+    """If this fails, regenerate the snapshot: make props-schema"""
+    with open(SNAPSHOT_PATH) as f:
+        committed = json.load(f)
+    assert read_snapshot() == committed
+    assert committed == build_snapshot()
+    assert load_snapshot() == committed
+
+
+def test_stale_snapshot_is_not_rewritten(tmp_path):
+    path = tmp_path / "props_schema.json"
+    assert load_snapshot(str(path)) == build_snapshot()
+    assert not path.exists()
+    path.write_text(json.dumps({"schemas_sha256": "stale"}))
+    assert read_snapshot(str(path)) is None
+    assert load_snapshot(str(path)) == build_snapshot()
+    assert json.loads(path.read_text()) == {"schemas_sha256": "stale"}
@@ -2,8 +2,13 @@
 import os
 import pprint
 
+import numpy as np
 from build123d import Cylinder, Sphere, Box, Align, scale, Axis, extrude, Circle
 
+from workboard import quality, timing
+from workboard.booleans import clip_all, cut_all
+from workboard.placement import Placement
+
 
 """
 ## Names
@@ -30,6 +35,29 @@ class MushroomModes:
     cylinder_diamond = {"name": "cylinder_diamond", "params": {}}
 
 
+def hole_centers(radius: float, spacing: float, hole_radius: float) -> np.ndarray:
+    """
+    Return the (x, y) centers of a square grid of holes that fit in a circle.
+
+    Args:
+        radius (float): radius of the circle (the cap).
+        spacing (float): grid spacing; the grid has a hole at the center.
+        hole_radius (float): holes must lie entirely within the circle.
+
+    Returns:
+        np.ndarray: an (n, 2) array, ordered by x then y.
+    """
+    limit = radius - hole_radius
+    if limit < 0:
+        return np.empty((0, 2))
+    k = int(limit // spacing)
+    steps = np.arange(-k, k + 1) * spacing
+    x, y = np.meshgrid(steps, steps, indexing="ij")
+    inside = x**2 + y**2 <= limit**2
+    return np.column_stack((x[inside], y[inside]))
+
+
+@timing.timed("mushroom")
 def mushroom(
     stem_height:float=76.2,  # 3 inches in mm
     stem_diameter:float=40,  # 40 mm, parametric for umbrella stand inner diameter
@@ -48,7 +76,8 @@ def mushroom(
     #mode=MushroomModes.cylinder_holes,
     #cap_radius=40,     # parametric
     #cap_height=None,   # parametric,
-    #TODO
+    hole_radius:float=3,
+    hole_spacing:float=15,
 
     mode=MushroomModes.cylinder_diamond,
     #cap_radius=40,     # parametric
@@ -60,10 +89,12 @@ def mushroom(
     # Create the stem (cylinder)
     #stem = Cylinder(stem_diameter / 2, stem_height)
     stem = extrude(Circle(stem_diameter/2), stem_height)
-    stem = stem.chamfer(
-        edge_list=stem.faces()[1].edges(),
-        length=stem_chamfer_length,
-        length2=0)
+    if not quality.is_draft():
+        with timing.span("chamfer", part="stem"):
+            stem = stem.chamfer(
+                edge_list=stem.faces()[1].edges(),
+                length=stem_chamfer_length,
+                length2=0)
 
 
     # Create the cap or table    
@@ -98,28 +129,18 @@ def mushroom(
         # Start with a cylinder of radius=cap_radius
         cap = Cylinder(radius=cap_radius, height=cap_height)
 
-        # Add a grid of circular holes through the cap
-        # Parameters for holes
-        hole_radius = 3  # mm
-        hole_spacing = 15  # mm
-        num_x = int((2 * cap_radius) // hole_spacing)
-        num_y = int((2 * cap_radius) // hole_spacing)
-
-
-        holes = []
-        for i in range(-num_x // 2, num_x // 2 + 1):
-            for j in range(-num_y // 2, num_y // 2 + 1):
-                x = i * hole_spacing
-                y = j * hole_spacing
-                # Only add holes within the cap's circular area
-                if x**2 + y**2 <= (cap_radius - hole_radius)**2:
-                    hole = Cylinder(radius=hole_radius, height=cap_height*2.2)
-                    hole = hole.translate((x, y, cap_height / 2))
-                    holes.append(hole)
+        # Add a grid of circular holes through the cap,
+        # only within the cap's circular area
+        centers = hole_centers(cap_radius, hole_spacing, hole_radius)
+        hole = Cylinder(radius=hole_radius, height=cap_height*2.2)
+        holes = [
+            Placement().translate((x, y, cap_height / 2)).apply(hole)
+            for x, y in centers
+        ]
 
         # Subtract holes from cap
-        for hole in holes:
-            cap = cap - hole
+        with timing.span("boolean", part="holes", count=len(holes)):
+            cap = cut_all(cap, holes)
 
     elif mode == MushroomModes.cylinder_diamond:
         # Create the cap as a cylinder
@@ -140,31 +161,36 @@ def mushroom(
         band = band.translate((0, 0, cap_height - band_thickness / 2))
 
         # Lattice grid (diamond pattern)
-        lattice = None
         z = cap_height - band_thickness
         axis = Axis.Z
-        for angle in [(20), (-20)]:
-            for x in range(-int(cap_radius), int(cap_radius) + 1, lattice_spacing):
-                rod = Box(
-                    lattice_thickness,
-                    2 * cap_radius + 2,
-                    band_thickness,
-                    align=(Align.CENTER, Align.CENTER, Align.MIN))
-                rod = rod.translate((x, 0, z))
-                rod = rod.rotate(axis, angle)
-                #rod = rod.translate((0, 0, z + zoffset))
-                rod = rod & Cylinder(radius=cap_radius - lattice_thickness / 2, height=cap_height)
-                lattice = rod if lattice is None else lattice + rod
+        rod = Box(
+            lattice_thickness,
+            2 * cap_radius + 2,
+            band_thickness,
+            align=(Align.CENTER, Align.CENTER, Align.MIN))
+        rods = [
+            Placement().translate((x, 0, z)).rotate(axis, angle).apply(rod)
+            for angle in [(20), (-20)]
+            for x in range(-int(cap_radius), int(cap_radius) + 1, lattice_spacing)
+        ]
+        with timing.span("boolean", part="lattice", count=len(rods)):
+            # fuse the rods, then clip them all to the cap at once
+            lattice = clip_all(
+                rods,
+                Cylinder(radius=cap_radius - lattice_thickness / 2, height=cap_height),
+            )
 
         # Combine band and lattice
-        cap = band + lattice
+        with timing.span("boolean", part="cap"):
+            cap = band + lattice
 
     else:
         raise ValueError(f"Unknown mode. mode={mode!r}")
     # Move cap to sit on top of stem
     cap = cap.translate((0, 0, stem_height))
     # Combine stem and cap
-    mushroom = stem + cap
+    with timing.span("boolean", part="mushroom"):
+        mushroom = stem + cap
     return mushroom
 
 
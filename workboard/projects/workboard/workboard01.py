@@ -22,8 +22,10 @@ A simple laptop stand model with inset circles for detachable magnetic risers.
 """
 # SPDX-License-Identifier:
 
+import logging
 import os
 import pprint
+from concurrent.futures import ProcessPoolExecutor
 
 # Import necessary modules from build123d
 from build123d import (
@@ -40,15 +42,18 @@ from build123d import (
     Rectangle,
     Vector,
     chamfer,
-    export_gltf,
-    export_step,
-    export_stl,
-    fillet,
 )
 from build123d.build_part import BuildPart
 from build123d.build_sketch import BuildSketch
 from build123d.geometry import Color, Vector
 
+from workboard import quality, timing
+from workboard.exporting import export_parts
+from workboard.rendercache import cached_render
+from workboard.subparts import MEMO_ATTR, relink, subpart
+
+log = logging.getLogger(__name__)
+
 
 class Colors:
     Gray_a0 = Color(0.7, 0.7, 0.7, 0)
@@ -79,46 +84,40 @@ class Conf(types.SimpleNamespace):
 import unittest
 from dataclasses import dataclass, field
 from typing import Dict, Any
-from types import SimpleNamespace # Or your custom ArbitraryAttributes class
+
+from workboard.props import Props
 
 @dataclass
 class Component:
     id: int|str
     name: str
     props: Dict[str, Any] = field(default_factory=dict, init=True, repr=True, compare=True)
-    # ^ We use a private name and exclude from init, repr, compare because
-    # we'll handle it specially. init=True means it's passed in __init__,
-    # but we'll override it.
-
-    _props_proxy: SimpleNamespace = field(init=False, repr=False, compare=False)
+    # ^ props is stored once, as a change-tracking Props dict; arbitrary
+    # attributes (obj.planet = ...) are read from and written to it.
 
     def __post_init__(self):
-        # Create a SimpleNamespace to proxy arbitrary attributes
-        # We ensure props is a dict before passing it
+        # We ensure props is a dict before wrapping it
         if not isinstance(self.props, dict):
             raise TypeError("'props' must be a dictionary")
-        self._props_proxy = SimpleNamespace(**self.props)
+        if not isinstance(self.props, Props):
+            self.props = Props(self.props)
 
     def __getattr__(self, name: str) -> Any:
-        # First, try to get it from the structured dataclass fields
-        # This will be handled by dataclasses' default __getattr__ for declared fields
-        # If it falls through here, it's not a declared field.
+        # Only called when normal lookup (dataclass fields, methods) fails
+        if name == "props":  # not set yet, e.g. while unpickling
+            raise AttributeError(name)
         try:
-            # Try to get it from the dynamic attributes proxy
-            return getattr(self._props_proxy, name)
-        except AttributeError:
-            # If not found in dynamic attributes either, raise the standard AttributeError
-            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+            return self.props[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            ) from None
 
     def __setattr__(self, name: str, value: Any) -> None:
         # If it's a declared dataclass field, let dataclasses handle it normally
-        # This check is important to prevent infinite recursion and ensure dataclass fields work
         if name in self.__dataclass_fields__:
             super().__setattr__(name, value)
         else:
-            # Otherwise, set it on the dynamic attributes proxy
-            setattr(self._props_proxy, name, value)
-            # And update the underlying dictionary for serialization/persistence
             self.props[name] = value
 
     def __delattr__(self, name: str) -> None:
@@ -126,10 +125,21 @@ class Component:
             super().__delattr__(name)
         else:
             try:
-                delattr(self._props_proxy, name)
                 del self.props[name]
-            except AttributeError:
-                raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+            except KeyError:
+                raise AttributeError(
+                    f"'{self.__class__.__name__}' object has no attribute '{name}'"
+                ) from None
+
+    def __getstate__(self):
+        # memoized sub-parts (see workboard.subparts) aren't part of the state
+        state = dict(vars(self))
+        state.pop(MEMO_ATTR, None)
+        return state
+
+    def changed_props(self, names=None) -> frozenset:
+        """Return the props (of names, default all) changed since the last render."""
+        return self.props.changed(names)
 
 
 def test_thing() -> bool:
@@ -170,71 +180,120 @@ def test_thing() -> bool:
 
 class Workboard(Component):
 
-    def init(self):
+    def init(self, **overrides):
+        """
+        Set the default props.
+
+        Args:
+            **overrides: props to use instead of the defaults; props derived
+                from them (e.g. circle_positions from feet_height) follow.
+        """
         #obj = types.SimpleNamespace()
         #obj = Component(id=1, name="workboard01")
 
         # Define dimensions for the CAD model
-        self.laptop_length = 15.6  # inches
-        self.laptop_width = 10.0  # approximate width in inches
-        self.laptop_height = 0.8  # approximate height in inches
+        self.laptop_length = overrides.get("laptop_length", 15.6)  # inches
+        # approximate width and height in inches
+        self.laptop_width = overrides.get("laptop_width", 10.0)
+        self.laptop_height = overrides.get("laptop_height", 0.8)
 
         # Convert dimensions to millimeters (1 inch = 25.4 mm)
-        self.laptop_length_mm = self.laptop_length * 25.4
-        self.laptop_width_mm = self.laptop_width * 25.4
-        self.laptop_height_mm = self.laptop_height * 25.4
+        self.laptop_length_mm = overrides.get(
+            "laptop_length_mm", self.laptop_length * 25.4
+        )
+        self.laptop_width_mm = overrides.get(
+            "laptop_width_mm", self.laptop_width * 25.4
+        )
+        self.laptop_height_mm = overrides.get(
+            "laptop_height_mm", self.laptop_height * 25.4
+        )
 
         # Define the base dimensions for the stand
-        self.workboard_length = self.laptop_length_mm
-        self.workboard_width = self.laptop_width_mm
-        self.workboard_height = 25.4 * (5 / 8)  # height of the stand in mm
-        self.workboard_color = Colors.WoodColor3_a100
-        self.workboard_material = None
+        self.workboard_length = overrides.get("workboard_length", self.laptop_length_mm)
+        self.workboard_width = overrides.get("workboard_width", self.laptop_width_mm)
+        # height of the stand in mm
+        self.workboard_height = overrides.get("workboard_height", 25.4 * (5 / 8))
+        self.workboard_color = overrides.get("workboard_color", Colors.WoodColor3_a100)
+        self.workboard_material = overrides.get("workboard_material", None)
 
         # Define the inset circle dimensions
-        self.circle_diameter = 30  # diameter of the inset circle in mm
-        self.circle_depth = 20  # depth of the inset circle in mm
+        # diameter and depth of the inset circle in mm
+        self.circle_diameter = overrides.get("circle_diameter", 30)
+        self.circle_depth = overrides.get("circle_depth", 20)
 
-        self.workboard_magnetic_disc_diameter = self.circle_diameter - 2
-        self.workboard_magnetic_disc_height = 1.0
-        self.workboard_magnetic_disc_color = Colors.MagnetBlack_a80
-        self.workboard_magnetic_disc_material = None
+        self.workboard_magnetic_disc_diameter = overrides.get(
+            "workboard_magnetic_disc_diameter", self.circle_diameter - 2
+        )
+        self.workboard_magnetic_disc_height = overrides.get(
+            "workboard_magnetic_disc_height", 1.0
+        )
+        self.workboard_magnetic_disc_color = overrides.get(
+            "workboard_magnetic_disc_color", Colors.MagnetBlack_a80
+        )
+        self.workboard_magnetic_disc_material = overrides.get(
+            "workboard_magnetic_disc_material", None
+        )
 
-        self.feet_height = 20  # height of the feet in mm
-        self.feet_diameter = 25.4
-        self.feet_color = Colors.DarkGray_a100
-        self.feet_material = None
+        self.feet_height = overrides.get("feet_height", 20)  # height of the feet in mm
+        self.feet_diameter = overrides.get("feet_diameter", 25.4)
+        self.feet_color = overrides.get("feet_color", Colors.DarkGray_a100)
+        self.feet_material = overrides.get("feet_material", None)
 
-        self.feet_magnetic_disc_diameter = self.feet_diameter - 2  # TODO
+        # TODO
+        self.feet_magnetic_disc_diameter = overrides.get(
+            "feet_magnetic_disc_diameter", self.feet_diameter - 2
+        )
         # obj.feet_magnetic_disc_diameter =  ((obj.circle_diameter / 2) - 1),
-        self.feet_magnetic_disc_height = 1.0
-        self.feet_magnetic_disc_color = Colors.MagnetBlack_a80
-        self.feet_magnetic_disc_material = None
-
-        self.circle_positions = [
-            # (obj.workboard_length * 0.25, obj.workboard_width * 0.25),
-            # (obj.workboard_length * 0.75, obj.workboard_width * 0.25),
-            (
-                self.workboard_length * 0.25,
-                self.workboard_width * 0.65 - self.workboard_width,
-                self.feet_height / 2,  # 0  # -1 * circle_depth,
-            ),
-            (
-                self.workboard_length * -0.25,
-                self.workboard_width * 0.65 - self.workboard_width,
-                self.feet_height / 2,  # -1 * circle_depth,
-            ),
-        ]
-
-        self.show_feet_as = "attached"
-        # obj.show_feet_as = 'detached'
-
+        self.feet_magnetic_disc_height = overrides.get("feet_magnetic_disc_height", 1.0)
+        self.feet_magnetic_disc_color = overrides.get(
+            "feet_magnetic_disc_color", Colors.MagnetBlack_a80
+        )
+        self.feet_magnetic_disc_material = overrides.get(
+            "feet_magnetic_disc_material", None
+        )
 
-    def render(self):
-        cfg = self
-        if cfg is None:
-            raise ValueError("cfg must not be None")
+        # an explicit [] means no feet
+        if "circle_positions" in overrides:
+            self.circle_positions = overrides["circle_positions"]
+        else:
+            self.circle_positions = [
+                # (obj.workboard_length * 0.25, obj.workboard_width * 0.25),
+                # (obj.workboard_length * 0.75, obj.workboard_width * 0.25),
+                (
+                    self.workboard_length * 0.25,
+                    self.workboard_width * 0.65 - self.workboard_width,
+                    self.feet_height / 2,  # 0  # -1 * circle_depth,
+                ),
+                (
+                    self.workboard_length * -0.25,
+                    self.workboard_width * 0.65 - self.workboard_width,
+                    self.feet_height / 2,  # -1 * circle_depth,
+                ),
+            ]
+
+        self.show_feet_as = overrides.get("show_feet_as", "attached")
+        # obj.show_feet_as = 'detached'
 
+        unknown = set(overrides) - set(self.props)
+        if unknown:
+            raise TypeError(f"Unknown Workboard props: {sorted(unknown)}")
+
+
+    # Each sub-part declares the props it reads; it's only rebuilt when one
+    # of them changes (see workboard.subparts). Labels, colors and materials
+    # are applied by render() with relink().
+
+    @subpart(
+        "feet_height",
+        "workboard_length",
+        "workboard_width",
+        "workboard_height",
+        "circle_positions",
+        "circle_diameter",
+        "workboard_magnetic_disc_diameter",
+        "workboard_magnetic_disc_height",
+    )
+    def board_subparts(self, cfg):
         # with BuildPart() as base3d:
         # with BuildSketch() as sketch1:
         #     # Create a rectangle for the base of the stand
@@ -251,13 +310,14 @@ class Workboard(Component):
                     height=cfg.workboard_height,
                 )
 
-            with Locations(*cfg.circle_positions):
-                # Create inset circles for detachable magnetic laptop risers
-                inset = Cylinder(
-                    radius=cfg.circle_diameter / 2,
-                    height=cfg.feet_height,
-                    mode=Mode.SUBTRACT,
-                )
+            if cfg.circle_positions:
+                with Locations(*cfg.circle_positions):
+                    # Create inset circles for detachable magnetic laptop risers
+                    inset = Cylinder(
+                        radius=cfg.circle_diameter / 2,
+                        height=cfg.feet_height,
+                        mode=Mode.SUBTRACT,
+                    )
                 # TODO: chamfer the edges
                 #inset.chamfer(1, None, (inset.faces() >> Axis.Z)[0].edges())
                 
@@ -275,70 +335,92 @@ class Workboard(Component):
             #     )
 
             # print(f"{board.edges()=}")
-            fillet(
-                board.edges(), radius=25.4 * 0.25
-            )  # Fillet the edges with a radius of 10 mm
+            with timing.span("fillet", part="workboard"):
+                quality.fillet(
+                    board.edges(), radius=25.4 * 0.25
+                )  # Fillet the edges with a radius of 10 mm
 
             # Create a line with an inward curve at 0.8 / 1.0 along the right side of the board
             # self.todo_curvy_edge(board)
 
             with BuildPart() as workboard_magnetic_discs:
                 # Create magnetic discs for the insets
-                with Locations(
-                    [
-                        (
-                            x[0],
-                            x[1],
-                            cfg.feet_height + (cfg.workboard_magnetic_disc_height / 2),
+                if cfg.circle_positions:
+                    with Locations(
+                        [
+                            (
+                                x[0],
+                                x[1],
+                                cfg.feet_height
+                                + (cfg.workboard_magnetic_disc_height / 2),
+                            )
+                            for x in cfg.circle_positions
+                        ]
+                    ):
+                        Cylinder(
+                            radius=cfg.workboard_magnetic_disc_diameter / 2,
+                            height=cfg.workboard_magnetic_disc_height,
                         )
-                        for x in cfg.circle_positions
-                    ]
-                ):
-                    Cylinder(
-                        radius=cfg.workboard_magnetic_disc_diameter / 2,
-                        height=cfg.workboard_magnetic_disc_height,
-                    )
-                workboard_magnetic_discs.part.label = "workboard.magnets"
-                workboard_magnetic_discs.part.color = cfg.workboard_magnetic_disc_color
-                workboard_magnetic_discs.part.material = (
-                    cfg.workboard_magnetic_disc_material
-                )
 
-            workboard.part.label = "workboard"
-            workboard.part.color = cfg.workboard_color
-            workboard.part.material = cfg.workboard_material
+        return {
+            "workboard": workboard.part,
+            "workboard_magnetic_discs": workboard_magnetic_discs.part,
+        }
 
+    @subpart(
+        "show_feet_as",
+        "circle_positions",
+        "feet_height",
+        "feet_diameter",
+        "feet_magnetic_disc_diameter",
+        "feet_magnetic_disc_height",
+    )
+    def feet_subparts(self, cfg):
         with BuildPart() as feet:
             # Create magnetic feet
-            if cfg.show_feet_as == "attached":
+            if cfg.show_feet_as == "attached" and cfg.circle_positions:
                 with Locations(*cfg.circle_positions):
                     foot = Cylinder(radius=(cfg.feet_diameter / 2), height=cfg.feet_height)
-                    fillet(
-                        foot.edges().filter_by_position(
-                            Axis.Z, 0, 1, inclusive=(True, False)
-                        ),
-                        radius=cfg.feet_height / 3,
-                    )
+                    with timing.span("fillet", part="feet"):
+                        quality.fillet(
+                            foot.edges().filter_by_position(
+                                Axis.Z, 0, 1, inclusive=(True, False)
+                            ),
+                            radius=cfg.feet_height / 3,
+                        )
 
             with BuildPart() as feet_magnetic_discs:
                 # Create magnetic discs for the insets
-                with Locations(
-                    [
-                        (x[0], x[1], cfg.feet_height - (cfg.feet_magnetic_disc_height / 2))
-                        for x in cfg.circle_positions
-                    ]
-                ):
-                    Cylinder(
-                        radius=cfg.feet_magnetic_disc_diameter / 2,
-                        height=cfg.feet_magnetic_disc_height,
-                    )
-                feet_magnetic_discs.part.label = "feet.magnets"
-                feet_magnetic_discs.part.color = cfg.feet_magnetic_disc_color
-                feet_magnetic_discs.part.material = cfg.feet_magnetic_disc_material
+                if cfg.circle_positions:
+                    with Locations(
+                        [
+                            (
+                                x[0],
+                                x[1],
+                                cfg.feet_height - (cfg.feet_magnetic_disc_height / 2),
+                            )
+                            for x in cfg.circle_positions
+                        ]
+                    ):
+                        Cylinder(
+                            radius=cfg.feet_magnetic_disc_diameter / 2,
+                            height=cfg.feet_magnetic_disc_height,
+                        )
 
-            feet.part.label = "feet"
-            feet.part.color = cfg.feet_color
-            feet.part.material = cfg.feet_material
+        return {
+            "feet": feet.part,
+            "feet_magnetic_discs": feet_magnetic_discs.part,
+        }
+
+    @timing.timed("Workboard.render")
+    @cached_render()
+    def render(self):
+        cfg = self
+        if cfg is None:
+            raise ValueError("cfg must not be None")
+
+        board = self.board_subparts()
+        feet = self.feet_subparts()
 
         # Example usage
         todo_svg_path = """
@@ -353,21 +435,42 @@ class Workboard(Component):
 
         data = {
             "parts": {
-                "workboard": workboard,
-                "workboard_magnetic_discs": workboard_magnetic_discs,
-                "feet_magnetic_discs": feet_magnetic_discs,
-                "feet": feet,
+                "workboard": relink(
+                    board["workboard"],
+                    label="workboard",
+                    color=cfg.workboard_color,
+                    material=cfg.workboard_material,
+                ),
+                "workboard_magnetic_discs": relink(
+                    board["workboard_magnetic_discs"],
+                    label="workboard.magnets",
+                    color=cfg.workboard_magnetic_disc_color,
+                    material=cfg.workboard_magnetic_disc_material,
+                ),
+                "feet_magnetic_discs": relink(
+                    feet["feet_magnetic_discs"],
+                    label="feet.magnets",
+                    color=cfg.feet_magnetic_disc_color,
+                    material=cfg.feet_magnetic_disc_material,
+                ),
+                "feet": relink(
+                    feet["feet"],
+                    label="feet",
+                    color=cfg.feet_color,
+                    material=cfg.feet_material,
+                ),
             },
             "sketches": {},
             "assemblies": {},
         }
 
         workboard_assembly = data["assemblies"]["workboard_assembly"] = Compound(
-            label="workboard", children=[v.part for v in data["parts"].values() if v]
+            label="workboard", children=[v for v in data["parts"].values() if v]
         )
 
-        print("DEBUG: workboard_assembly.show_topology()=")
-        print(workboard_assembly.show_topology())
+        if os.environ.get("WORKBOARD_DEBUG"):
+            print("DEBUG: workboard_assembly.show_topology()=")
+            print(workboard_assembly.show_topology())
         return data
 
 
@@ -381,9 +484,29 @@ class Workboard(Component):
         board.replace_edge(board.edges()[0], curvy_edge)
 
 
-def export_files(*, filenameprefix=None, filenameprefixsuffix=None, partsiterable):
-    exportfilenames = {}
-
+def export_files(
+    *,
+    filenameprefix=None,
+    filenameprefixsuffix=None,
+    partsiterable,
+    max_workers=None,
+    executor=None,
+    force=False,
+    profile=None,
+):
+    """
+    Export each part as STEP, binary STL, ASCII STL and glTF.
+
+    Meshes are tessellated with ``profile`` (see
+    workboard.tessellation.PROFILES; None: "print").
+
+    (part, format) pairs are exported in parallel on a process pool, and
+    files whose part and export settings are unchanged are skipped
+    (see workboard.exporting.export_parts).
+
+    Returns:
+        dict: {name: {ext: path}} for every exported part.
+    """
     if filenameprefix is None:
         filename_prefix = __file__.split(".")[0]  # Use the script name as the prefix
     else:
@@ -392,30 +515,21 @@ def export_files(*, filenameprefix=None, filenameprefixsuffix=None, partsiterabl
     if filenameprefixsuffix:
         filename_prefix = f"{filename_prefix}__{filenameprefixsuffix}_"
 
-    for name, base in partsiterable:
-        if filenameprefixsuffix == "part":
-            part = base.part
-        else:
-            part = base
-
-        exportfilenames[".step"] = f"{filename_prefix}_{name}.step"
-        exportfilenames[".stl"] = f"{filename_prefix}_{name}.stl"
-        exportfilenames[".txt.stl"] = f"{filename_prefix}_{name}.txt.stl"
-        exportfilenames[".gltf"] = f"{filename_prefix}_{name}.gltf"
-
-        # Export the model
-        export_step(part, exportfilenames[".step"])
-
-        # Export the model as an STL file
-        export_stl(part, exportfilenames[".stl"])
-
-        # Export the model as an STL file
-        export_stl(part, exportfilenames[".txt.stl"], ascii_format=True)
-
-        # Export the model as an STL file
-        export_gltf(part, exportfilenames[".gltf"])
-
-    return exportfilenames
+    report = export_parts(
+        partsiterable,
+        filename_prefix=filename_prefix,
+        max_workers=max_workers,
+        executor=executor,
+        force=force,
+        profile=profile,
+    )
+    log.info(
+        "export_files(%r): %d written, %d unchanged",
+        filenameprefixsuffix,
+        len(report.written),
+        len(report.skipped),
+    )
+    return report.files
 
 
 def main_test():
@@ -429,18 +543,24 @@ def running_in_vscode() -> bool:
 
 
 def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     obj = Workboard(id=1, name="workboard01")
     obj.init()
     data = obj.render()
 
     do_export_files = True
     if do_export_files:
-        data["export_part_filenames"] = export_files(
-            filenameprefixsuffix="part", partsiterable=data["parts"].items()
-        )
-        data["export_assembly_filenames"] = export_files(
-            filenameprefixsuffix="assembly", partsiterable=data["assemblies"].items()
-        )
+        with ProcessPoolExecutor() as executor:
+            data["export_part_filenames"] = export_files(
+                filenameprefixsuffix="part",
+                partsiterable=data["parts"].items(),
+                executor=executor,
+            )
+            data["export_assembly_filenames"] = export_files(
+                filenameprefixsuffix="assembly",
+                partsiterable=data["assemblies"].items(),
+                executor=executor,
+            )
 
     print("DEBUG: pprint(data)=")
     pprint.pprint(data, sort_dicts=False)
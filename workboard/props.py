@@ -0,0 +1,117 @@
+"""
+props.py
+
+A change-tracking props store for components.
+
+``Props`` is a dict (so it compares, reprs and serializes like one) that
+also keeps the set of keys changed since the last ``mark_clean()``. A
+component can then ask which props changed instead of re-deriving
+everything.
+
+Usage::
+
+    props = Props({"size": 10, "color": "red"})
+    props.mark_clean()
+    props["size"] = 20
+    props["color"] = "red"  # same value: not a change
+    props.dirty  # {"size"}
+"""
+
+from typing import Any, FrozenSet, Iterable
+
+_MISSING = object()
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except Exception:  # e.g. numpy arrays
+        return False
+
+
+class Props(dict):
+    """
+    dict of props that tracks the keys changed since the last mark_clean().
+
+    Every key of a new Props is dirty (nothing has been rendered from it
+    yet). Setting a key to an equal value doesn't mark it dirty; deleting a
+    key does.
+    """
+
+    __slots__ = ("dirty",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty: set = set(self)
+
+    def __setitem__(self, key, value) -> None:
+        if not _same(self.get(key, _MISSING), value):
+            self.dirty.add(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.dirty.add(key)
+
+    def update(self, *args, **kwargs) -> None:  # type: ignore[override]
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            self.dirty.add(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.dirty.add(key)
+        return key, value
+
+    def clear(self) -> None:
+        self.dirty.update(self)
+        super().clear()
+
+    def copy(self) -> "Props":
+        props = Props(self)
+        props.dirty = set(self.dirty)
+        return props
+
+    def __reduce__(self):
+        return (_restore_props, (dict(self), set(self.dirty)))
+
+    def changed(self, keys: Iterable[str] = None) -> FrozenSet:
+        """
+        Return the dirty keys, or only those of them in keys.
+
+        Args:
+            keys: optional keys of interest (e.g. the props a sub-part reads).
+        """
+        if keys is None:
+            return frozenset(self.dirty)
+        return frozenset(self.dirty.intersection(keys))
+
+    def mark_clean(self, keys: Iterable[str] = None) -> None:
+        """Forget the changes to keys (default: all keys), e.g. after a render."""
+        if keys is None:
+            self.dirty.clear()
+        else:
+            self.dirty.difference_update(keys)
+
+
+def _restore_props(items: dict, dirty: set) -> Props:
+    props = Props(items)
+    props.dirty = dirty
+    return props
@@ -0,0 +1,105 @@
+"""
+quality.py
+
+The render quality: ``"final"`` (the default) or ``"draft"``.
+
+Fillets and chamfers dominate build times. In draft quality, models skip
+them and emit un-rounded proxies: the same parts, at the same places, just
+with sharp edges. Rounding an edge never grows a part, so a proxy's
+bounding box encloses the final part's (and equals it, unless the part was
+rotated after rounding). Iterate on layouts, and run layout tests, in draft; export in
+final quality.
+
+Models round edges with ``quality.fillet()`` (build123d's fillet(), a
+no-op in draft) or check ``quality.is_draft()`` (e.g. around
+``Solid.chamfer()``). Render caches (rendercache.py, subparts.py) key on
+the quality, so draft and final renders never mix.
+
+Usage::
+
+    from workboard import quality
+
+    with quality.use("draft"):
+        asm = Easel().render()
+
+    with BuildPart() as part:
+        Box(10, 10, 10)
+        quality.fillet(part.edges(), radius=1)
+
+    $ workboard --quality draft sweep workboard --grid feet_height=15,20
+    $ WORKBOARD_QUALITY=draft python workboard/projects/easel/easel01.py
+
+Environment:
+    WORKBOARD_QUALITY: the initial quality, "draft" or "final"
+"""
+
+import contextlib
+import os
+from typing import Iterator, Optional
+
+DRAFT = "draft"
+FINAL = "final"
+QUALITIES = (DRAFT, FINAL)
+
+
+def validate(value: str) -> str:
+    """Return value if it's one of QUALITIES, else raise ValueError."""
+    if value not in QUALITIES:
+        raise ValueError(f"Unknown quality {value!r}; choose from {list(QUALITIES)}")
+    return value
+
+
+_quality = validate(os.environ.get("WORKBOARD_QUALITY") or FINAL)
+
+
+def get_quality() -> str:
+    """Return the current quality."""
+    return _quality
+
+
+def set_quality(value: str) -> str:
+    """
+    Set the quality; return the previous one.
+
+    Raises:
+        ValueError: if value isn't one of QUALITIES.
+    """
+    global _quality
+    previous, _quality = _quality, validate(value)
+    return previous
+
+
+def is_draft() -> bool:
+    """Return whether models should skip fillets and chamfers."""
+    return _quality == DRAFT
+
+
+@contextlib.contextmanager
+def use(value: Optional[str]) -> Iterator[str]:
+    """Set the quality for the duration of a with block (None: leave it as it is)."""
+    previous = set_quality(value if value is not None else _quality)
+    try:
+        yield _quality
+    finally:
+        set_quality(previous)
+
+
+def fillet(objects, radius: float):
+    """
+    build123d's fillet(), or in draft, the target left as it is.
+
+    Like fillet(), in a builder context the target is the builder's object,
+    otherwise the shape the edges (or vertices) belong to.
+    """
+    from build123d import Part, fillet as build123d_fillet
+    from build123d.build_common import Builder
+    from build123d.objects_part import BasePartObject
+
+    if not is_draft():
+        return build123d_fillet(objects, radius)
+    context = Builder._get_context("fillet")
+    if context is not None:
+        return context._obj
+    first = objects if hasattr(objects, "wrapped") else next(iter(objects))
+    target = first.topo_parent
+    return Part(target.wrapped) if isinstance(target, BasePartObject) else target
@@ -0,0 +1,365 @@
+"""
+rendercache.py
+
+Content-addressed cache for component renders.
+
+A render is keyed on a hash of the component's resolved props, the render
+arguments, the render quality (see quality.py) and the model source version:
+a hash of the workboard package's sources and of the source file that
+defines the component class, plus the build123d version. Models call
+helpers all over the package, so any source change invalidates the cache.
+Results are kept in an in-memory LRU and, optionally, in an on-disk BREP
+store so that other processes can reuse them.
+
+Usage::
+
+    class Workboard(Component):
+        @cached_render()
+        def render(self):
+            ...
+
+    cache = RenderCache(maxsize=8, directory=".render_cache")
+    data = cache.render(Easel(props), Easel.render)
+    print(cache.stats())
+
+Environment:
+    WORKBOARD_RENDER_CACHE_SIZE: in-memory LRU size of the default cache (32)
+    WORKBOARD_RENDER_CACHE_DIR: directory of the default cache's BREP store
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import build123d
+from build123d import Color, Compound, export_brep, import_brep
+
+from workboard import quality
+from workboard.instancing import reference
+from workboard.shapeio import pack_shape, unpack_shape
+
+
+def _canonical(value: Any) -> Any:
+    """Return a JSON-serializable, order-stable version of a props value."""
+    if isinstance(value, dict):
+        return {
+            str(k): _canonical(v)
+            for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))
+        }
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float):
+        return repr(value)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, Color):
+        return ["Color", *(repr(float(v)) for v in value)]
+    if hasattr(value, "model_dump"):  # pydantic models
+        return _canonical(value.model_dump())
+    return [type(value).__qualname__, repr(value)]
+
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def package_source_version() -> str:
+    """
+    Return a hash of the workboard package's sources (tests excluded).
+
+    Models depend on helpers all over the package (subparts, quality,
+    booleans, placement, textshapes, ...), so any source change invalidates
+    every cached render.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(_PACKAGE_DIR):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py") and not name.startswith("test_"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, _PACKAGE_DIR).encode())
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def model_source_version(cls: type) -> str:
+    """
+    Return a hash of the model sources of cls and the build123d version.
+
+    That's the workboard package's sources (see package_source_version())
+    and the source files that define cls and its bases (which may be outside
+    the package).
+    """
+    digest = hashlib.sha256(build123d.__version__.encode())
+    digest.update(package_source_version().encode())
+    for klass in cls.__mro__:
+        if klass.__module__ in ("builtins", "typing"):
+            continue
+        try:
+            filename = inspect.getsourcefile(klass)
+        except TypeError:
+            filename = None
+        if filename and os.path.exists(filename):
+            with open(filename, "rb") as f:
+                digest.update(f.read())
+        else:
+            digest.update(f"{klass.__module__}.{klass.__qualname__}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _props_of(component) -> Any:
+    props = getattr(component, "props", None)
+    if props is None:
+        props = {k: v for k, v in vars(component).items() if not k.startswith("_")}
+    return props
+
+
+def _copy_shape(value):
+    """Return a new shape tree sharing value's geometry (see instancing.reference()); other values as they are."""
+    if value is None or not hasattr(value, "wrapped"):
+        return value
+    return reference(value)
+
+
+def _copy_result(data):
+    """
+    Return a copy of a cached render result.
+
+    Containers and shape objects are new, so callers can relabel, recolor or
+    reparent them without changing the cache entry; geometry is shared.
+    """
+    if isinstance(data, dict):
+        return {
+            k: (
+                {name: _copy_shape(shape) for name, shape in v.items()}
+                if isinstance(v, dict)
+                else _copy_shape(v)
+            )
+            for k, v in data.items()
+        }
+    return _copy_shape(data)
+
+
+class RenderCache:
+    """
+    LRU cache of render results with an optional on-disk BREP store.
+
+    Args:
+        maxsize (int): maximum number of in-memory entries; the least
+            recently used entry is evicted first. 0 disables the memory LRU.
+        directory (str): optional directory of the on-disk BREP store.
+        disk_maxsize (int): maximum number of entries in the on-disk store;
+            the least recently used entry is evicted first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 32,
+        directory: Optional[str] = None,
+        disk_maxsize: int = 256,
+    ):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.disk_maxsize = disk_maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    def key(self, component, *args, **kwargs) -> str:
+        """Return the content hash for rendering component with args/kwargs."""
+        cls = type(component)
+        payload = json.dumps(
+            [
+                f"{cls.__module__}.{cls.__qualname__}",
+                model_source_version(cls),
+                _canonical(_props_of(component)),
+                _canonical(list(args)),
+                _canonical(kwargs),
+                quality.get_quality(),
+            ],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return a copy of the cached result for key, or None."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_result(self._entries[key])
+        data = self._load(key)
+        if data is not None:
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, data)
+            return _copy_result(data)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, data) -> None:
+        """Store a render result (a shape or a dict of {group: {name: shape}})."""
+        self._remember(key, data)
+        if self.directory:
+            self._store(key, data)
+
+    def render(self, component, render: Callable, *args, **kwargs):
+        """Return render(component, *args, **kwargs), cached on the component's props."""
+        key = self.key(component, *args, **kwargs)
+        data = self.get(key)
+        if data is None:
+            data = render(component, *args, **kwargs)
+            self.put(key, data)
+            data = _copy_result(data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the counters (the disk store is kept)."""
+        self._entries.clear()
+        self.hits = self.misses = self.disk_hits = self.evictions = (
+            self.disk_evictions
+        ) = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _remember(self, key: str, data) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # --- on-disk BREP store ---
+
+    def _entry_dir(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, key)
+
+    def _store(self, key: str, data) -> None:
+        os.makedirs(self.directory, exist_ok=True)  # type: ignore[arg-type]
+        tmpdir = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.directory)
+        counter = iter(range(1 << 30))
+
+        def encode(wrapped) -> str:
+            filename = f"{next(counter)}.brep"
+            export_brep(Compound.cast(wrapped), os.path.join(tmpdir, filename))
+            return filename
+
+        if isinstance(data, dict):
+            index = {
+                "kind": "groups",
+                "groups": {
+                    group: {
+                        name: pack_shape(getattr(value, "part", value), encode)
+                        for name, value in items.items()
+                        if value is not None
+                    }
+                    for group, items in data.items()
+                    if isinstance(items, dict)
+                },
+            }
+        else:
+            index = {"kind": "shape", "shape": pack_shape(data, encode)}
+        with open(os.path.join(tmpdir, "index.json"), "w") as f:
+            json.dump(index, f)
+
+        entry_dir = self._entry_dir(key)
+        try:
+            os.rename(tmpdir, entry_dir)
+        except OSError:  # another process stored the same key first
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        self._evict_disk()
+
+    def _load(self, key: str):
+        if not self.directory:
+            return None
+        entry_dir = self._entry_dir(key)
+        index_path = os.path.join(entry_dir, "index.json")
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path) as f:
+            index = json.load(f)
+        os.utime(index_path)
+
+        def decode(filename: str):
+            return import_brep(os.path.join(entry_dir, filename)).wrapped
+
+        if index["kind"] == "shape":
+            return unpack_shape(index["shape"], decode)
+        return {
+            group: {name: unpack_shape(node, decode) for name, node in items.items()}
+            for group, items in index["groups"].items()
+        }
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):  # type: ignore[arg-type]
+            index_path = os.path.join(self.directory, name, "index.json")  # type: ignore[arg-type]
+            if os.path.exists(index_path):
+                entries.append((os.path.getmtime(index_path), name))
+        entries.sort()
+        while len(entries) > self.disk_maxsize:
+            _, name = entries.pop(0)
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)  # type: ignore[arg-type]
+            self.disk_evictions += 1
+
+
+DEFAULT_RENDER_CACHE = RenderCache(
+    maxsize=int(os.environ.get("WORKBOARD_RENDER_CACHE_SIZE", 32)),
+    directory=os.environ.get("WORKBOARD_RENDER_CACHE_DIR") or None,
+)
+
+
+def cached_render(cache: Optional[RenderCache] = None):
+    """
+    Decorate a component's render() method with a RenderCache.
+
+    Once rendered (or found in the cache), the component's change-tracking
+    props (workboard.props.Props) are marked clean.
+
+    Args:
+        cache (RenderCache): cache to use; defaults to DEFAULT_RENDER_CACHE
+            (looked up at call time, so it can be replaced).
+    """
+
+    def decorator(render: Callable) -> Callable:
+        @functools.wraps(render)
+        def wrapper(self, *args, **kwargs):
+            c = cache if cache is not None else DEFAULT_RENDER_CACHE
+            data = c.render(self, render, *args, **kwargs)
+            mark_clean = getattr(getattr(self, "props", None), "mark_clean", None)
+            if mark_clean is not None:
+                mark_clean()
+            return data
+
+        wrapper.uncached = render  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,310 @@
+"""
+server.py
+
+A long-lived render server on a local Unix domain socket.
+
+The server imports build123d and the project modules once, then forks a
+bounded pool of worker processes that inherit those imports. Requests and
+responses are JSON lines; a connection may send any number of requests.
+The socket is only accessible to the user running the server.
+
+Requests::
+
+    {"op": "ping"}
+    {"op": "render", "model": "workboard", "overrides": {"feet_height": 20}}
+    {"op": "export", "model": "pizzapancoolingmat", "overrides": {"pan.diameter": 350},
+     "formats": [".step", ".stl"], "timeout": 30}
+    {"op": "export", "model": "easel", "formats": [".gltf"], "profile": "preview", "quality": "draft"}
+    {"op": "shutdown"}
+
+Every request may carry an "id", which is echoed in its response::
+
+    {"id": ..., "ok": true, "result": {...}, "error": null}
+
+render and export results are sweep.render_variant() rows: timings,
+bounding box, volume and, for export, the paths of the exported files
+under the server's output directory. Exported files are named after a hash
+of the request's model, overrides, formats, profile and quality, so the
+same request always writes (or, if they're current, skips) the same files,
+and a restarted server never reuses a name for other contents.
+
+Usage::
+
+    $ workboard serve --socket /tmp/workboard.sock -j 2 --output-dir out/server
+
+    with RenderClient("/tmp/workboard.sock") as client:
+        client.export("workboard", {"feet_height": 20}, formats=[".stl"])["files"]
+
+A request that isn't done within its timeout gets a "timeout" error; a
+request that is already running can't be interrupted, so its worker stays
+busy until it finishes (and its result is discarded). When max_pending
+requests are queued or running, including timed-out ones, further
+render/export requests get a "busy" error.
+"""
+
+import contextlib
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from workboard import quality as render_quality
+from workboard.exporting import FORMATS
+from workboard.sweep import MODELS, render_variant
+from workboard.tessellation import PROFILES
+
+# imported by the server before it forks its workers
+PRELOAD_MODULES = (
+    "build123d",
+    "workboard.exporting",
+    "workboard.projects.workboard.workboard01",
+    "workboard.projects.easel.easel01",
+    "workboard.projects.pizzapancoolingmat.pizzapancoolingmat",
+    "workboard.projects.umbrellastandstopper.umbrellastandstopper01",
+)
+
+DEFAULT_TIMEOUT = 120.0  # seconds
+
+
+class RequestError(Exception):
+    """A request that can't be served; its message is the response's error."""
+
+
+def preload(modules: Sequence[str] = PRELOAD_MODULES) -> None:
+    """Import modules (so that forked workers don't have to)."""
+    import importlib
+
+    for name in modules:
+        importlib.import_module(name)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.handle_line(line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serve render/export requests on a Unix domain socket.
+
+    Args:
+        path (str): the socket path; a stale socket file is replaced.
+        max_workers (int): worker processes (None: os.cpu_count()).
+        executor (Executor): optional executor to use instead of a forked
+            process pool (e.g. a ThreadPoolExecutor in tests).
+        timeout (float): default per-request timeout in seconds.
+        max_pending (int): render/export requests in flight before the
+            server answers "busy" (None: 4 per worker).
+        output_dir (str): directory that export requests write to.
+        preload_modules: modules to import before the workers are forked.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_pending: Optional[int] = None,
+        output_dir: str = "out/server",
+        preload_modules: Sequence[str] = PRELOAD_MODULES,
+    ):
+        preload(preload_modules)
+        max_workers = max_workers or os.cpu_count() or 1
+        self.own_executor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+            )
+            # a fork-context pool forks all of its workers on the first
+            # submit(); do that now, from this thread, rather than from a
+            # request handler thread while other threads may hold locks
+            executor.submit(os.getpid).result()
+        self.executor = executor
+        self.timeout = timeout
+        self.output_dir = output_dir
+        self.pending = threading.BoundedSemaphore(max_pending or 4 * max_workers)
+        self.counter = itertools.count()
+        self.counter_lock = threading.Lock()
+        self.path = path
+        _remove_stale_socket(path)
+        super().__init__(path, _Handler)
+
+    def server_bind(self) -> None:
+        # only this user may submit jobs (which write to output_dir): the
+        # socket is created 0600, rather than chmod'ed after bind()
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def handle_line(self, line: bytes) -> Dict[str, Any]:
+        """Return the response to one request line."""
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            return _error_response(None, f"invalid JSON: {exc}")
+        if not isinstance(request, dict):
+            return _error_response(None, "request must be a JSON object")
+        request_id = request.get("id")
+        try:
+            result = self.handle_request(request)
+        except RequestError as exc:
+            return _error_response(request_id, str(exc))
+        except Exception as exc:  # e.g. BrokenProcessPool
+            return _error_response(request_id, f"{type(exc).__name__}: {exc}")
+        ok = not (isinstance(result, dict) and result.get("error"))
+        error = None if ok else result["error"]
+        return {"id": request_id, "ok": ok, "result": result, "error": error}
+
+    def handle_request(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return {"pid": os.getpid(), "models": sorted(MODELS)}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"pid": os.getpid()}
+        if op in ("render", "export"):
+            return self.render(request, export=op == "export")
+        raise RequestError(f"unknown op {op!r}")
+
+    def render(self, request: Dict[str, Any], export: bool) -> Dict[str, Any]:
+        model = request.get("model")
+        if model not in MODELS:
+            raise RequestError(f"unknown model {model!r}; choose from {sorted(MODELS)}")
+        overrides = request.get("overrides") or {}
+        if not isinstance(overrides, dict):
+            raise RequestError("overrides must be a JSON object")
+        formats = request.get("formats") or [".step"]
+        if not isinstance(formats, list) or not all(ext in FORMATS for ext in formats):
+            raise RequestError(
+                f"unknown formats {formats!r}; choose from {list(FORMATS)}"
+            )
+        formats = tuple(formats)
+        profile = request.get("profile")
+        if profile is not None and profile not in PROFILES:
+            raise RequestError(
+                f"unknown profile {profile!r}; choose from {sorted(PROFILES)}"
+            )
+        quality = request.get("quality") or render_quality.get_quality()
+        if quality not in render_quality.QUALITIES:
+            raise RequestError(
+                f"unknown quality {quality!r}; choose from {list(render_quality.QUALITIES)}"
+            )
+        timeout = request.get("timeout") or self.timeout
+        if (
+            isinstance(timeout, bool)
+            or not isinstance(timeout, (int, float))
+            or not 0 < timeout < float("inf")
+        ):
+            raise RequestError(
+                f"timeout must be a positive number of seconds, not {timeout!r}"
+            )
+        if not self.pending.acquire(blocking=False):
+            raise RequestError("busy")
+        with self.counter_lock:
+            index = next(self.counter)
+        try:
+            future = self.executor.submit(
+                render_variant,
+                model,
+                index,
+                overrides,
+                self.output_dir if export else None,
+                formats,
+                profile,
+                quality,
+                _output_name(model, overrides, formats, profile, quality),
+            )
+        except BaseException:
+            self.pending.release()
+            raise
+        # a timed-out request holds its slot until its worker is done with it
+        future.add_done_callback(lambda _: self.pending.release())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise RequestError(f"timeout after {timeout}s") from None
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+
+def _error_response(request_id: Any, error: str) -> Dict[str, Any]:
+    return {"id": request_id, "ok": False, "result": None, "error": error}
+
+
+def _output_name(model: str, overrides, formats, profile, quality) -> str:
+    """Return the stem of a request's output files: the model and a hash of its inputs."""
+    inputs = json.dumps(
+        [model, overrides, list(formats), profile, quality],
+        sort_keys=True,
+        default=repr,
+    )
+    return f"{model}_{hashlib.sha256(inputs.encode()).hexdigest()[:16]}"
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file at path that no server is listening on."""
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)
+        else:
+            raise OSError(f"a server is already listening on {path}")
+
+
+@contextlib.contextmanager
+def running_server(path: str, **kwargs) -> Iterator[RenderServer]:
+    """
+    Run a RenderServer in a background thread for the duration of the block.
+
+    A local stand-in for the daemon: e.g. in tests, with a ThreadPoolExecutor
+    and preload_modules=() so that it starts instantly.
+    """
+    server = RenderServer(path, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def serve(path: str, **kwargs) -> None:
+    """Run a RenderServer until it's sent a shutdown request (or interrupted)."""
+    with RenderServer(path, **kwargs) as server:
+        print(
+            f"workboard render server (pid {os.getpid()}) listening on {path}",
+            flush=True,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,185 @@
+"""
+shapeio.py
+
+Pack build123d shape trees into plain data and back.
+
+build123d shapes with a ``color`` can't be pickled (``Quantity_ColorRGBA``),
+and a ``Compound`` built from ``children`` carries its labels, colors and
+locations on the python side only. ``pack_shape()`` turns a shape (and its
+children) into a dict of plain values plus serialized OCCT geometry, so that
+shapes can be sent to worker processes or written to an on-disk store;
+``unpack_shape()`` rebuilds an equivalent shape tree. Materials are not
+carried over.
+
+Leaves that share geometry (instances placed with ``instancing.place()``)
+are packed once, with a location per leaf, and share their geometry again
+when they're unpacked.
+"""
+
+import hashlib
+import io
+import json
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from build123d import Color, Compound, Location
+from build123d.persistence import deserialize_shape, serialize_shape
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.gp import gp_Trsf
+from OCP.TopLoc import TopLoc_Location
+
+
+def location_to_matrix(location) -> list[list[float]]:
+    """Return a 4x4 row-major matrix (nested lists) for a Location or TopLoc_Location."""
+    loc = getattr(location, "wrapped", location)
+    trsf = loc.Transformation()
+    rows = [[trsf.Value(r, c) for c in (1, 2, 3, 4)] for r in (1, 2, 3)]
+    rows.append([0.0, 0.0, 0.0, 1.0])
+    return rows
+
+
+def matrix_to_location(matrix) -> Location:
+    """Return a build123d Location for a 4x4 (or 3x4) row-major matrix."""
+    trsf = gp_Trsf()
+    (a11, a12, a13, a14), (a21, a22, a23, a24), (a31, a32, a33, a34) = (
+        [float(v) for v in row] for row in list(matrix)[:3]
+    )
+    trsf.SetValues(a11, a12, a13, a14, a21, a22, a23, a24, a31, a32, a33, a34)
+    return Location(TopLoc_Location(trsf))
+
+
+def color_to_tuple(color) -> Optional[tuple[float, float, float, float]]:
+    """Return an (r, g, b, a) tuple for a build123d Color, or None."""
+    if color is None:
+        return None
+    return tuple(float(v) for v in color)  # type: ignore[return-value]
+
+
+def unlocated(wrapped):
+    """Return a TopoDS shape sharing wrapped's geometry, at the identity location."""
+    return wrapped.Located(TopLoc_Location())
+
+
+class GeometryMemo:
+    """
+    Values computed once per shared geometry.
+
+    TopoDS shapes that share a TShape and orientation have the same
+    geometry, whatever their locations; ``get()`` computes a value for the
+    first of them (at the identity location) and returns it for the rest.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, List[Tuple[Any, Any]]] = {}
+
+    def get(self, wrapped, compute: Callable[[Any], Any]) -> Any:
+        """Return compute(unlocated(wrapped)), computed once per geometry."""
+        proto = unlocated(wrapped)
+        bucket = self._buckets.setdefault(hash(proto), [])
+        for other, value in bucket:
+            if other.IsEqual(proto):
+                return value
+        value = compute(proto)
+        bucket.append((proto, value))
+        return value
+
+
+def pack_shape(
+    shape,
+    encode: Callable[[Any], Any] = serialize_shape,
+    _memo: Optional[GeometryMemo] = None,
+) -> Dict[str, Any]:
+    """
+    Pack a shape tree into a dict of plain values.
+
+    Args:
+        shape: build123d Shape, optionally with children.
+        encode: callable turning a leaf's ``wrapped`` TopoDS shape (at the
+            identity location) into something storable and hashable
+            (default: OCCT binary BREP bytes); it's called once per
+            shared geometry.
+
+    Returns:
+        dict: {"label", "color", "location", "geometry", "children"}; a
+        leaf's location is None at the identity location.
+    """
+    memo = GeometryMemo() if _memo is None else _memo
+    children = list(getattr(shape, "children", ()) or ())
+    node: Dict[str, Any] = {
+        "label": getattr(shape, "label", "") or "",
+        "color": color_to_tuple(getattr(shape, "color", None)),
+        "location": None,
+        "geometry": None,
+        "children": [pack_shape(child, encode, memo) for child in children],
+    }
+    location = shape.wrapped.Location()
+    if children:
+        # the compound's own geometry is rebuilt from its children
+        node["location"] = location_to_matrix(location)
+    else:
+        node["geometry"] = memo.get(shape.wrapped, encode)
+        if not location.IsIdentity():
+            node["location"] = location_to_matrix(location)
+    return node
+
+
+def unpack_shape(
+    node: Dict[str, Any],
+    decode: Callable[[Any], Any] = deserialize_shape,
+    _memo: Optional[Dict[Hashable, Any]] = None,
+):
+    """
+    Rebuild a shape tree packed by ``pack_shape()``.
+
+    Args:
+        node (dict): packed shape tree.
+        decode: inverse of the ``encode`` callable given to ``pack_shape()``;
+            it's called once per distinct geometry value.
+
+    Returns:
+        Shape: build123d shape (a Compound with children for assemblies).
+    """
+    memo: Dict[Hashable, Any] = {} if _memo is None else _memo
+    if node["children"]:
+        shape = Compound(
+            children=[unpack_shape(child, decode, memo) for child in node["children"]]
+        )
+        shape.wrapped.Location(matrix_to_location(node["location"]).wrapped)
+    else:
+        geometry = node["geometry"]
+        if geometry not in memo:
+            memo[geometry] = decode(geometry)
+        wrapped = memo[geometry]
+        if node["location"] is not None:
+            wrapped = wrapped.Located(matrix_to_location(node["location"]).wrapped)
+        shape = Compound.cast(wrapped)
+    shape.label = node["label"]
+    if node["color"] is not None:
+        shape.color = Color(*node["color"])
+    return shape
+
+
+def serialize_geometry(wrapped) -> bytes:
+    """Return OCCT binary BREP bytes of a TopoDS shape without any triangulation."""
+    bio = io.BytesIO()
+    BinTools.Write_s(
+        wrapped,
+        bio,
+        False,
+        False,
+        BinTools_FormatVersion.BinTools_FormatVersion_CURRENT,
+    )
+    return bio.getvalue()
+
+
+def shape_fingerprint(shape) -> str:
+    """
+    Return a hash of a shape tree's geometry, labels, colors and locations.
+
+    Triangulations are left out, but meshing a shape in place also updates
+    some edge flags, so a shape that has been meshed (e.g. shown in a viewer)
+    may hash differently from a fresh render of the same geometry.
+    """
+    node = pack_shape(
+        shape, lambda wrapped: hashlib.sha256(serialize_geometry(wrapped)).hexdigest()
+    )
+    return hashlib.sha256(json.dumps(node, sort_keys=True).encode()).hexdigest()
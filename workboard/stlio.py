@@ -0,0 +1,301 @@
+"""
+stlio.py
+
+Read STL exports as NumPy arrays, and diff them.
+
+``read_stl()`` returns the triangles of an STL file as a structured array
+of ``STL_RECORD`` (a facet normal, three vertices and an attribute word
+per triangle). A binary STL is memory-mapped, so nothing is read until
+it's used; an ASCII STL (``.txt.stl``) is parsed in chunks of facets,
+without building a Python object per number.
+
+``stl_diff()`` compares two exports with vectorized NumPy: triangle
+counts, bounding boxes, enclosed volumes and a Hausdorff-style deviation:
+the largest distance from a vertex of either mesh to the nearest *vertex*
+of the other (found with scipy's cKDTree). That's an upper bound on the
+distance between the surfaces; two meshes of the same surface at
+different deflections differ by up to about their triangle size, so
+compare exports made with the same tessellation profile.
+
+Usage::
+
+    triangles = read_stl("workboard01__part__feet.stl")
+    triangles["vertices"].shape  # (n, 3, 3), float32
+    diff = stl_diff("out/a/workboard01__part__feet.stl", "out/b/workboard01__part__feet.stl")
+    diff.changed(tolerance=1e-3)
+
+    $ workboard stl diff out/a/workboard01__part__feet.stl out/b/workboard01__part__feet.stl
+"""
+
+import os
+import re
+import struct
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+# a binary STL triangle: 50 bytes, little-endian
+STL_RECORD = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+)
+
+_HEADER_SIZE = 84
+
+# ASCII STL chunk size, in bytes
+CHUNK_SIZE = 1 << 22
+
+# triangles per chunk when reducing over a (memory-mapped) array
+REDUCE_CHUNK = 1 << 20
+
+_FACET = re.compile(
+    rb"facet\s+normal\s+(\S+)\s+(\S+)\s+(\S+)\s+outer\s+loop"
+    rb"\s+vertex\s+(\S+)\s+(\S+)\s+(\S+)"
+    rb"\s+vertex\s+(\S+)\s+(\S+)\s+(\S+)"
+    rb"\s+vertex\s+(\S+)\s+(\S+)\s+(\S+)"
+    rb"\s+endloop\s+endfacet"
+)
+
+
+class STLError(ValueError):
+    """Raised for files that aren't valid STL."""
+
+
+def is_binary_stl(path: str) -> bool:
+    """
+    Return whether an STL file is binary.
+
+    A file is binary if its size matches the triangle count in its header;
+    ASCII files start with ``solid``, but so do the headers of some binary
+    files.
+    """
+    size = os.path.getsize(path)
+    if size < _HEADER_SIZE:
+        return False
+    with open(path, "rb") as f:
+        f.seek(80)
+        (count,) = struct.unpack("<I", f.read(4))
+    return size == _HEADER_SIZE + count * STL_RECORD.itemsize
+
+
+def read_binary_stl(path: str) -> np.ndarray:
+    """Return the triangles of a binary STL file, memory-mapped read-only."""
+    size = os.path.getsize(path)
+    count = (size - _HEADER_SIZE) // STL_RECORD.itemsize
+    if size < _HEADER_SIZE or size != _HEADER_SIZE + count * STL_RECORD.itemsize:
+        raise STLError(f"{path}: not a binary STL file")
+    if count == 0:
+        return np.zeros(0, dtype=STL_RECORD)
+    return np.memmap(
+        path, dtype=STL_RECORD, mode="r", offset=_HEADER_SIZE, shape=(count,)
+    )
+
+
+def iter_ascii_stl(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Yield the triangles of an ASCII STL file, a chunk of facets at a time.
+
+    Args:
+        path (str): the ASCII STL file.
+        chunk_size (int): bytes read per chunk (a chunk is extended to the
+            end of its last facet).
+
+    Yields:
+        np.ndarray: arrays of STL_RECORD.
+
+    Raises:
+        STLError: if text other than whitespace and ``endsolid``/``solid``
+            lines is left between facets.
+    """
+    with open(path, "rb") as f:
+        head = f.readline()
+        if not head.lstrip().startswith(b"solid"):
+            raise STLError(f"{path}: not an ASCII STL file")
+        rest = b""
+        while True:
+            data = f.read(chunk_size)
+            text = rest + data
+            end = text.rfind(b"endfacet")
+            if end < 0 and data:
+                rest = text
+                continue
+            end = len(text) if end < 0 else end + len(b"endfacet")
+            chunk, rest = text[:end], text[end:]
+            values = _FACET.findall(chunk)
+            leftover = _FACET.sub(b"", chunk)
+            if re.sub(rb"(end)?solid[^\n]*|\s", b"", leftover):
+                raise STLError(f"{path}: unexpected text {leftover.strip()[:40]!r}")
+            if values:
+                numbers = (
+                    np.array(values, dtype=np.bytes_)
+                    .astype(np.float32)
+                    .reshape(-1, 4, 3)
+                )
+                records = np.zeros(len(numbers), dtype=STL_RECORD)
+                records["normal"] = numbers[:, 0]
+                records["vertices"] = numbers[:, 1:]
+                yield records
+            if not data:
+                return
+
+
+def read_ascii_stl(path: str, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """Return the triangles of an ASCII STL file (see iter_ascii_stl())."""
+    chunks = list(iter_ascii_stl(path, chunk_size))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=STL_RECORD)
+
+
+def read_stl(path: str) -> np.ndarray:
+    """
+    Return the triangles of a binary or ASCII STL file.
+
+    Returns:
+        np.ndarray: an array of STL_RECORD; memory-mapped for binary files.
+
+    Raises:
+        STLError: if the file isn't a valid STL file.
+    """
+    if is_binary_stl(path):
+        return read_binary_stl(path)
+    return read_ascii_stl(path)
+
+
+def _chunks(triangles: np.ndarray) -> Iterator[np.ndarray]:
+    """Yield (k, 3, 3) float64 vertex arrays of at most REDUCE_CHUNK triangles."""
+    for start in range(0, len(triangles), REDUCE_CHUNK):
+        yield triangles["vertices"][start : start + REDUCE_CHUNK].astype(np.float64)
+
+
+def bounding_box(
+    triangles: np.ndarray,
+) -> Optional[Tuple[Tuple[float, ...], Tuple[float, ...]]]:
+    """Return ((xmin, ymin, zmin), (xmax, ymax, zmax)) of the triangles, or None if there are none."""
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for tri in _chunks(triangles):
+        lo = np.minimum(lo, tri.min(axis=(0, 1)))
+        hi = np.maximum(hi, tri.max(axis=(0, 1)))
+    if not len(triangles):
+        return None
+    return tuple(lo.tolist()), tuple(hi.tolist())
+
+
+def volume(triangles: np.ndarray) -> float:
+    """Return the signed volume enclosed by the triangles (positive for outward, closed meshes)."""
+    total = 0.0
+    for tri in _chunks(triangles):
+        total += float(np.einsum("ij,ij->", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])))
+    return total / 6
+
+
+def unique_vertices(triangles: np.ndarray) -> np.ndarray:
+    """Return the (n, 3) float64 array of the triangles' distinct vertices."""
+    return np.unique(np.asarray(triangles["vertices"]).reshape(-1, 3), axis=0).astype(
+        np.float64
+    )
+
+
+def vertex_deviation(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """
+    Return (max, mean) distance from each vertex of a to the nearest vertex of b.
+
+    Args:
+        a, b: (n, 3) vertex arrays (see unique_vertices()).
+    """
+    if not len(a):
+        return 0.0, 0.0
+    if not len(b):
+        return float("inf"), float("inf")
+    from scipy.spatial import cKDTree
+
+    distances, _ = cKDTree(b).query(a)
+    return float(distances.max()), float(distances.mean())
+
+
+@dataclass
+class STLDiff:
+    """
+    The differences between two STL exports.
+
+    Attributes:
+        triangles (tuple): triangle counts (a, b).
+        bbox (tuple): bounding boxes (a, b), see bounding_box().
+        volume (tuple): enclosed volumes (a, b), in mm^3.
+        hausdorff (float): the largest distance from a vertex of either mesh
+            to the nearest vertex of the other (0 for identical vertex
+            sets), in mm. Vertex-to-vertex, not vertex-to-surface, so it
+            overstates the deviation of meshes that differ only in
+            tessellation.
+        mean_deviation (tuple): mean distance from the vertices of a to b,
+            and of b to a.
+        identical (bool): whether the files' triangles are bit-for-bit
+            identical.
+    """
+
+    triangles: Tuple[int, int]
+    bbox: Tuple[Any, Any]
+    volume: Tuple[float, float]
+    hausdorff: float
+    mean_deviation: Tuple[float, float]
+    identical: bool
+
+    def changed(self, tolerance: float = 0.0) -> bool:
+        """Return whether the geometry changed by more than tolerance (mm)."""
+        if self.identical:
+            return False
+        return self.triangles[0] != self.triangles[1] or self.hausdorff > tolerance
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def stl_diff(a, b) -> STLDiff:
+    """
+    Compare two STL exports.
+
+    Args:
+        a, b: STL filenames, or arrays of STL_RECORD (see read_stl()).
+
+    Returns:
+        STLDiff
+    """
+    a = read_stl(a) if isinstance(a, (str, os.PathLike)) else a
+    b = read_stl(b) if isinstance(b, (str, os.PathLike)) else b
+    identical = len(a) == len(b) and all(
+        np.array_equal(
+            a["vertices"][i : i + REDUCE_CHUNK], b["vertices"][i : i + REDUCE_CHUNK]
+        )
+        for i in range(0, len(a), REDUCE_CHUNK)
+    )
+    if identical:
+        hausdorff, mean_deviation = 0.0, (0.0, 0.0)
+    else:
+        va, vb = unique_vertices(a), unique_vertices(b)
+        max_ab, mean_ab = vertex_deviation(va, vb)
+        max_ba, mean_ba = vertex_deviation(vb, va)
+        hausdorff, mean_deviation = max(max_ab, max_ba), (mean_ab, mean_ba)
+    return STLDiff(
+        triangles=(len(a), len(b)),
+        bbox=(bounding_box(a), bounding_box(b)),
+        volume=(volume(a), volume(b)),
+        hausdorff=hausdorff,
+        mean_deviation=mean_deviation,
+        identical=identical,
+    )
+
+
+def format_diff(diff: STLDiff) -> str:
+    """Return a human-readable report of an STLDiff."""
+
+    def size(bbox) -> str:
+        return "x".join(f"{hi - lo:.3f}" for lo, hi in zip(*bbox)) if bbox else "-"
+
+    return "\n".join(
+        [
+            f"triangles  {diff.triangles[0]}  {diff.triangles[1]}  ({diff.triangles[1] - diff.triangles[0]:+d})",
+            f"bbox       {size(diff.bbox[0])}  {size(diff.bbox[1])}",
+            f"volume     {diff.volume[0]:.3f}  {diff.volume[1]:.3f}  ({diff.volume[1] - diff.volume[0]:+.3f})",
+            f"hausdorff  {diff.hausdorff:.6f}  (mean {diff.mean_deviation[0]:.6f} / {diff.mean_deviation[1]:.6f})",
+            "identical" if diff.identical else "different",
+        ]
+    )
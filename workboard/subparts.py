@@ -0,0 +1,132 @@
+"""
+subparts.py
+
+Dependency-tracked sub-parts for incremental re-renders.
+
+A component's render() can be split into sub-part builders that each
+declare the props they read. A sub-part is only rebuilt when one of its
+props (or the render quality, see quality.py) changed since it was last
+built; otherwise the previously built shapes are reused, and render()
+re-links them (with their current label, color and material) into new parts
+and assemblies with ``relink()``.
+
+Builders get a read-only view of the component's props that only allows the
+declared props, so a missing declaration fails loudly instead of returning
+stale geometry.
+
+Usage::
+
+    class Thing(Component):
+        @subpart("length", "width", "fillet_radius")
+        def board(self, cfg):
+            with BuildPart() as board:
+                Box(cfg.length, cfg.width, 10)
+                fillet(board.edges(), cfg.fillet_radius)
+            return board.part
+
+        def render(self):
+            board = relink(self.board(), label="board", color=self.board_color)
+            ...
+"""
+
+import functools
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from build123d import Compound, Part
+
+from workboard import quality, timing
+from workboard.rendercache import _canonical
+
+# name of the per-component dict of {subpart name: (props key, result)}
+MEMO_ATTR = "_subparts"
+
+
+class SubpartPropsView:
+    """Read-only attribute view of the declared props of a component."""
+
+    __slots__ = ("_component", "_names")
+
+    def __init__(self, component, names: Iterable[str]):
+        object.__setattr__(self, "_component", component)
+        object.__setattr__(self, "_names", frozenset(names))
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in self._names:
+            raise AttributeError(
+                f"sub-part reads undeclared prop {name!r} (declared: {sorted(self._names)})"
+            )
+        return getattr(self._component, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("sub-part props are read-only")
+
+
+class subpart:
+    """
+    Decorator: declare a method that builds a sub-part from only the named props.
+
+    The decorated method is called as ``build(self, cfg)`` where cfg is a
+    SubpartPropsView; calling it on a component returns the memoized result
+    while the declared props are unchanged.
+
+    Args:
+        *props (str): names of the props the builder reads.
+    """
+
+    def __init__(self, *props: str):
+        self.props = tuple(props)
+        self.build: Optional[Callable] = None
+        self.name = ""
+
+    def __call__(self, build: Callable) -> "subpart":
+        self.build = build
+        self.name = build.__name__
+        functools.update_wrapper(self, build)  # type: ignore[arg-type]
+        return self
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, component, owner=None):
+        if component is None:
+            return self
+        return functools.partial(self.get, component)
+
+    def key(self, component) -> str:
+        """Return the canonical values of the declared props of component, and the quality."""
+        return repr(
+            [
+                quality.get_quality(),
+                _canonical([getattr(component, name) for name in self.props]),
+            ]
+        )
+
+    def get(self, component, rebuild: bool = False):
+        """Return the sub-part of component, building it only if its props changed."""
+        memo: Dict[str, Any] = vars(component).setdefault(MEMO_ATTR, {})
+        key = self.key(component)
+        entry = memo.get(self.name)
+        if entry is not None and entry[0] == key and not rebuild:
+            return entry[1]
+        with timing.span(f"subpart:{self.name}"):
+            result = self.build(component, SubpartPropsView(component, self.props))  # type: ignore[misc]
+        memo[self.name] = (key, result)
+        return result
+
+
+def relink(shape, label: str = "", color=None, material=None):
+    """
+    Return a new Part (or Compound) sharing shape's geometry, with the given
+    label, color and material and no parent, so cached sub-parts are never
+    mutated or reparented.
+    """
+    if shape is None:
+        return None
+    cls = Part if isinstance(shape, Part) else Compound
+    copy = cls(shape.wrapped)
+    copy.label = label
+    if color is not None:
+        copy.color = color
+    if material is not None:
+        copy.material = material
+    return copy
@@ -0,0 +1,312 @@
+"""
+svgcompile.py
+
+Compile SVG files to a module of sketch builders.
+
+Every visible <path> of each SVG file is compiled to a build123d sketch
+(see translatesvgpath2.py, which caches compiled sketches as BREP files).
+Per file, a manifest of its paths and its generated builder code is cached
+too, keyed by a sha256 of the file's content, so that on a warm pass an
+unchanged SVG isn't parsed, compiled or even sent to a worker process.
+Changed files are compiled in parallel on a process pool.
+
+The generated module has a builder function per SVG file, named after the
+file, that returns the file's sketch (from the sketch cache, or compiled
+from the path data embedded in the module)::
+
+    $ workboard svg compile workboard/projects/workboard \\
+        --output workboard/projects/workboard/groove_handles.py
+
+    from workboard.projects.workboard.groove_handles import SKETCHES
+    sketch = SKETCHES["workboard01__groove_handle_2d_v0.0.4.svg"]()
+
+SVG files without visible paths get no builder; they're listed as skipped
+in the generated module's docstring (and by the CLI).
+
+Manifests are stored under ``files/`` in the sketch cache directory
+(WORKBOARD_SVG_CACHE_DIR, see translatesvgpath2.py). When compiled with
+``--cache-dir``, the generated module loads its sketches from that
+directory too; otherwise it uses the default sketch cache.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+# bump when the manifest or the generated code changes
+CODEGEN_VERSION = "1"
+
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def builder_name(filename: str) -> str:
+    """Return a Python identifier for an SVG file's builder function."""
+    stem = os.path.basename(filename)
+    stem = stem[: -len(".svg")] if stem.lower().endswith(".svg") else stem
+    name = re.sub(r"\W", "_", stem)
+    return f"_{name}" if not name or name[0].isdigit() else name
+
+
+def find_svgs(sources: Iterable[str], pattern: str = "*.svg") -> List[str]:
+    """Return the SVG files of sources (files, or directories searched for pattern), sorted."""
+    files = set()
+    for source in sources:
+        if os.path.isdir(source):
+            files.update(glob.glob(os.path.join(source, pattern)))
+        else:
+            files.add(source)
+    return sorted(files)
+
+
+def _manifest_path(directory: str, sha256: str) -> str:
+    return os.path.join(directory, "files", f"{sha256}.json")
+
+
+def load_manifest(path: str, directory: str) -> Optional[Dict[str, Any]]:
+    """Return the cached manifest of an SVG file if it and its sketches are cached, else None."""
+    from workboard.translatesvgpath2 import COMPILER_VERSION, SketchCache
+
+    sha256 = file_sha256(path)
+    try:
+        with open(_manifest_path(directory, sha256)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != [CODEGEN_VERSION, COMPILER_VERSION]:
+        return None
+    # keys depend on the build123d version too, so they're recomputed
+    for p in manifest["paths"]:
+        if not os.path.exists(
+            os.path.join(directory, f"{SketchCache.key(p['d'])}.brep")
+        ):
+            return None
+    return manifest
+
+
+def render_paths_code(paths: List[Dict[str, Any]]) -> str:
+    """Return the generated code of a builder's body: a _sketch() call on the path data."""
+    lines = ["    return _sketch("]
+    for p in paths:
+        lines.append(
+            f"        # {p['id']}" + (f" ({p['label']})" if p["label"] else "")
+        )
+        lines.append(f"        {p['d']!r},")
+    lines.append("    )")
+    return "\n".join(lines)
+
+
+def compile_svg(path: str, directory: str) -> Dict[str, Any]:
+    """
+    Compile the visible paths of an SVG file and cache its manifest.
+
+    Args:
+        path (str): the SVG file.
+        directory (str): the sketch cache directory.
+
+    Returns:
+        dict: the manifest: {"version", "sha256", "paths": [{"id", "label",
+        "d", "key"}], "code"}.
+    """
+    from workboard.translatesvgpath2 import (
+        COMPILER_VERSION,
+        SketchCache,
+        iter_svg_paths,
+    )
+
+    sha256 = file_sha256(path)
+    cache = SketchCache(directory)
+    paths = []
+    for element in iter_svg_paths(path):
+        cache.get(element.d)
+        paths.append(
+            {
+                "id": element.id,
+                "label": element.label,
+                "d": element.d,
+                "key": cache.key(element.d),
+            }
+        )
+    manifest = {
+        "version": [CODEGEN_VERSION, COMPILER_VERSION],
+        "sha256": sha256,
+        "paths": paths,
+        "code": render_paths_code(paths),
+    }
+    manifest_path = _manifest_path(directory, sha256)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def render_module(
+    results: List[Dict[str, Any]], directory: Optional[str] = None
+) -> str:
+    """
+    Return the source of the generated module for compile_svgs() results.
+
+    Args:
+        results: compile_svgs() results; skipped files get no builder.
+        directory (str): sketch cache directory for the module's builders
+            (None: translatesvgpath2.DEFAULT_SKETCH_CACHE).
+    """
+    skipped = [r for r in results if r["skipped"]]
+    results = [r for r in results if not r["skipped"]]
+    lines = [
+        '"""',
+        "Sketch builders generated by `workboard svg compile`; don't edit, regenerate.",
+        "",
+        "Sources:",
+        *(
+            f"    {os.path.basename(r['source'])} (sha256 {r['manifest']['sha256'][:16]})"
+            for r in results
+        ),
+    ]
+    if skipped:
+        lines += ["", "Skipped (no visible paths):"]
+        lines += [f"    {os.path.basename(r['source'])}" for r in skipped]
+    lines += [
+        '"""',
+        "from build123d import Sketch",
+        "",
+    ]
+    if directory is None:
+        lines += [
+            "from workboard.translatesvgpath2 import svg_path_to_build123d",
+            "",
+            "_CACHE = None",
+        ]
+    else:
+        lines += [
+            "from workboard.translatesvgpath2 import SketchCache, svg_path_to_build123d",
+            "",
+            f"_CACHE = SketchCache({os.path.abspath(directory)!r})",
+        ]
+    lines += [
+        "",
+        "",
+        "def _sketch(*paths: str) -> Sketch:",
+        "    sketches = [svg_path_to_build123d(d, cache=_CACHE) for d in paths]",
+        "    if len(sketches) == 1:",
+        "        return sketches[0]",
+        "    return Sketch([face for sketch in sketches for face in sketch.faces()])",
+        "",
+    ]
+    for r in results:
+        lines += [
+            "",
+            f"def {r['name']}() -> Sketch:",
+            f'    """{os.path.basename(r["source"])}"""',
+            r["manifest"]["code"],
+            "",
+        ]
+    lines += ["", "SKETCHES = {"]
+    lines += [f"    {os.path.basename(r['source'])!r}: {r['name']}," for r in results]
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def compile_svgs(
+    files: Iterable[str],
+    directory: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compile SVG files, reusing cached manifests of unchanged files.
+
+    Args:
+        files: SVG filenames.
+        directory (str): sketch cache directory (default: the directory of
+            translatesvgpath2.DEFAULT_SKETCH_CACHE).
+        max_workers (int): process pool size for the files that aren't
+            cached (None: os.cpu_count(), 0: compile in this process).
+
+    Returns:
+        list: a dict per file, in order: {"source", "name", "manifest",
+        "cached", "skipped", "seconds"}; "skipped" is set for files
+        without visible paths.
+    """
+    if directory is None:
+        from workboard.translatesvgpath2 import DEFAULT_SKETCH_CACHE
+
+        directory = DEFAULT_SKETCH_CACHE.directory
+    files = list(files)
+    results: List[Dict[str, Any]] = []
+    names = set()
+    for path in files:
+        name = builder_name(path)
+        while name in names:
+            name += "_"
+        names.add(name)
+        start = time.perf_counter()
+        manifest = load_manifest(path, directory)
+        results.append(
+            {
+                "source": path,
+                "name": name,
+                "manifest": manifest,
+                "cached": manifest is not None,
+                "seconds": time.perf_counter() - start,
+            }
+        )
+
+    cold = [r for r in results if not r["cached"]]
+    if cold:
+        if max_workers == 0 or len(cold) == 1:
+            for r in cold:
+                start = time.perf_counter()
+                r["manifest"] = compile_svg(r["source"], directory)
+                r["seconds"] = time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                manifests = executor.map(
+                    compile_svg, [r["source"] for r in cold], [directory] * len(cold)
+                )
+                for r, manifest in zip(cold, manifests):
+                    r["manifest"] = manifest
+                    r["seconds"] = time.perf_counter() - start
+    for r in results:
+        r["skipped"] = not r["manifest"]["paths"]
+    return results
+
+
+def compile_to_module(
+    sources: Iterable[str],
+    output: Optional[str] = None,
+    pattern: str = "*.svg",
+    directory: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compile the SVG files of sources and write the generated module to output.
+
+    Args:
+        sources: SVG files and/or directories (searched for pattern).
+        output (str): filename of the generated module (None: don't write).
+        directory (str): sketch cache directory, also used by the generated
+            module (default: see compile_svgs()).
+
+    Returns:
+        list: compile_svgs() results.
+    """
+    results = compile_svgs(
+        find_svgs(sources, pattern), directory=directory, max_workers=max_workers
+    )
+    if output is not None:
+        source = render_module(results, directory=directory)
+        tmp_path = f"{output}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(source)
+        os.replace(tmp_path, output)
+    return results
@@ -0,0 +1,276 @@
+"""
+sweep.py
+
+Parameter sweeps: render a grid (or list) of props overrides of a project
+model on a process pool.
+
+Each worker imports build123d (and the model's module) once; variants are
+rendered, measured (bounding box, volume, timings) and optionally exported,
+and their results are yielded as they finish.
+
+Usage::
+
+    variants = expand_grid({"circle_diameter": [28, 30, 32], "feet_height": [15, 20]})
+    for result in sweep("workboard", variants, output_dir="out/sweep"):
+        print(result["index"], result["overrides"], result["volume"], result["render_s"])
+
+    $ workboard sweep workboard --grid circle_diameter=28,30,32 --grid feet_height=15,20
+
+Models:
+    workboard: workboard01.Workboard, overrides are init() props
+    easel: easel01.Easel, overrides are props
+    pizzapancoolingmat: PizzaPanCoolingMatAssembly, overrides are dotted
+        props (e.g. "pan.diameter")
+    mushroom: umbrellastandstopper01.mushroom(), overrides are keyword arguments
+"""
+
+import copy
+import itertools
+import os
+import time
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from workboard import quality as render_quality
+from workboard import timing
+from workboard.exporting import InlineExecutor
+
+
+def _render_workboard(overrides: Dict[str, Any]):
+    from workboard.projects.workboard.workboard01 import Workboard
+
+    obj = Workboard(id=1, name="workboard01")
+    obj.init(**overrides)
+    return obj.render()
+
+
+def _render_easel(overrides: Dict[str, Any]):
+    from workboard.projects.easel.easel01 import Easel
+
+    unknown = set(overrides) - set(Easel.defaultProps())
+    if unknown:
+        raise TypeError(f"Unknown Easel props: {sorted(unknown)}")
+    return Easel(overrides).render()
+
+
+def _render_pizzapancoolingmat(overrides: Dict[str, Any]):
+    from workboard.projects.pizzapancoolingmat.pizzapancoolingmat import (
+        PizzaPanCoolingMatAssembly,
+    )
+
+    props = copy.deepcopy(PizzaPanCoolingMatAssembly.defaultProps())
+    for key, value in overrides.items():
+        *path, name = key.split(".")
+        node = props
+        for part in path:
+            node = node[part]
+        if not isinstance(node, dict) or name not in node:
+            raise TypeError(f"Unknown PizzaPanCoolingMatAssembly prop: {key!r}")
+        node[name] = value
+    return PizzaPanCoolingMatAssembly(props).render()
+
+
+def _render_mushroom(overrides: Dict[str, Any]):
+    from workboard.projects.umbrellastandstopper.umbrellastandstopper01 import mushroom
+
+    return mushroom(**overrides)
+
+
+# {model name: render(overrides) -> {group: {name: shape}} or shape}
+MODELS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "workboard": _render_workboard,
+    "easel": _render_easel,
+    "pizzapancoolingmat": _render_pizzapancoolingmat,
+    "mushroom": _render_mushroom,
+}
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the cartesian product of a props grid as a list of overrides.
+
+    >>> expand_grid({"a": [1, 2], "b": ["x"]})
+    [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'x'}]
+    """
+    names = list(grid)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(grid[n] for n in names))
+    ]
+
+
+def result_shapes(data) -> Tuple[Any, List[Tuple[str, Any]]]:
+    """
+    Return (main shape, [(name, shape) to export]) of a model's render result.
+
+    The main shape of a {group: {name: shape}} result is its first assembly
+    (or its first part).
+    """
+    if isinstance(data, dict):
+        named = [
+            (name, getattr(shape, "part", shape))
+            for group in ("parts", "assemblies")
+            for name, shape in data.get(group, {}).items()
+            if shape is not None
+        ]
+        assemblies = [s for s in data.get("assemblies", {}).values() if s is not None]
+        main = assemblies[0] if assemblies else (named[0][1] if named else None)
+        return main, named
+    return data, [("model", data)]
+
+
+def shape_volume(shape) -> float:
+    """Return the volume of shape, summed over the leaves of a Compound tree."""
+    children = list(getattr(shape, "children", ()) or ())
+    if children:
+        return sum(shape_volume(child) for child in children)
+    return shape.volume
+
+
+def _init_worker() -> None:
+    import build123d  # noqa: F401  imported once per worker
+
+
+def render_variant(
+    model: str,
+    index: int,
+    overrides: Dict[str, Any],
+    output_dir: Optional[str] = None,
+    formats: Sequence[str] = (".step",),
+    profile: Optional[str] = None,
+    quality: Optional[str] = None,
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Render (and optionally export) one variant of model.
+
+    ``profile`` is the tessellation profile of the mesh formats (see
+    workboard.tessellation.PROFILES); ``quality`` is the render quality
+    (see workboard.quality; None: the current quality). Exported files are
+    named ``f"{name}__{part}{ext}"`` in output_dir (default name:
+    ``f"{model}_{index:04d}"``).
+
+    Returns:
+        dict: a JSON-serializable result row with the variant's index,
+        overrides, quality, render/export timings in seconds, bounding box,
+        volume, output paths and error (None if it rendered).
+    """
+    result: Dict[str, Any] = {
+        "model": model,
+        "index": index,
+        "overrides": overrides,
+        "quality": quality or render_quality.get_quality(),
+        "render_s": None,
+        "export_s": None,
+        "bbox": None,
+        "volume": None,
+        "files": {},
+        "error": None,
+    }
+    try:
+        start = time.perf_counter()
+        with render_quality.use(result["quality"]):
+            data = MODELS[model](dict(overrides))
+        result["render_s"] = time.perf_counter() - start
+        main, named = result_shapes(data)
+        if main is not None:
+            bbox = main.bounding_box()
+            result["bbox"] = [list(bbox.min), list(bbox.max)]
+            result["volume"] = shape_volume(main)
+        if output_dir is not None:
+            from workboard.exporting import export_parts
+
+            start = time.perf_counter()
+            report = export_parts(
+                named,
+                filename_prefix=os.path.join(
+                    output_dir, f"{name or f'{model}_{index:04d}'}_"
+                ),
+                formats=formats,
+                max_workers=0,
+                profile=profile,
+            )
+            result["export_s"] = time.perf_counter() - start
+            result["files"] = report.files
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def sweep(
+    model: str,
+    variants: Iterable[Dict[str, Any]],
+    *,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    output_dir: Optional[str] = None,
+    formats: Sequence[str] = (".step",),
+    profile: Optional[str] = None,
+    quality: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Render every variant of model in parallel, yielding results as they finish.
+
+    Args:
+        model (str): a key of MODELS.
+        variants: iterable of props overrides, e.g. from expand_grid().
+        max_workers (int): process pool size (None: os.cpu_count(),
+            0: render in the calling process).
+        executor (Executor): optional executor to use instead of creating
+            (and shutting down) a process pool.
+        output_dir (str): if set, export each variant's parts there.
+        formats: export formats (see workboard.exporting.FORMATS).
+        profile (str): tessellation profile of the mesh formats
+            ("preview", "print" or "archival"; None: "print").
+        quality (str): render quality, "draft" or "final" (None: the
+            current quality of the calling process).
+
+    Yields:
+        dict: render_variant() results, in completion order.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}; choose from {sorted(MODELS)}")
+    variants = list(variants)
+    # workers may not have inherited the quality of this process
+    quality = render_quality.validate(quality or render_quality.get_quality())
+    own_executor = executor is None
+    if executor is None:
+        if max_workers == 0:
+            executor = InlineExecutor()
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker
+            )
+    try:
+        pending = {
+            timing.submit(
+                executor,
+                render_variant,
+                model,
+                index,
+                overrides,
+                output_dir,
+                tuple(formats),
+                profile,
+                quality,
+            )
+            for index, overrides in enumerate(variants)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield timing.result(future)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,441 @@
+"""
+tessellation.py
+
+Tessellate once, write many.
+
+``tessellate()`` meshes each leaf of a shape tree once at a given
+linear/angular tolerance and keeps the result as NumPy vertex/index arrays
+(in the shape tree's coordinates, with every ancestor Compound's location
+applied). The binary STL, ASCII STL and glTF writers in this module all
+consume those arrays, and so can a viewer.
+
+How finely to mesh depends on the output's target, so deflections come in
+named ``TessellationProfile``s (see ``PROFILES``): ``preview`` for viewers
+(coarse, with a linear deflection scaled by each part's size), ``print``
+(the default, for STL files to slice) and ``archival`` (finer still). A
+profile's linear deflection is scaled per leaf geometry, so small parts
+(magnets, screws) aren't meshed as coarsely as the board they sit in.
+
+Leaves that share geometry (see instancing.py) are meshed once: their
+meshes share the triangles of one ``base`` mesh and keep the placement
+``matrix``, so ``write_gltf()`` writes a single glTF mesh with a node per
+instance.
+
+Usage::
+
+    meshes = tessellate(part, tolerance=1e-3, angular_tolerance=0.1)
+    meshes = tessellate(part, profile="preview")
+    write_stl(meshes, "part.stl")
+    write_stl(meshes, "part.txt.stl", ascii_format=True)
+    write_gltf(meshes, "part.gltf")
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+from OCP.BRep import BRep_Tool
+from OCP.BRepBuilderAPI import BRepBuilderAPI_Copy
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.TopAbs import TopAbs_REVERSED
+from OCP.TopLoc import TopLoc_Location
+from build123d import BoundBox, Shape
+
+from workboard.shapeio import GeometryMemo, color_to_tuple, location_to_matrix
+
+
+@dataclass(frozen=True)
+class TessellationProfile:
+    """
+    Mesh deflections for an output target.
+
+    Attributes:
+        name (str): the profile's name, recorded in export manifests.
+        tolerance (float): linear deflection in mm; with ``relative``, the
+            smallest linear deflection.
+        angular_tolerance (float): angular deflection in radians.
+        relative (float): if set, the linear deflection of a part is this
+            fraction of the diagonal of its bounding box (but at least
+            ``tolerance``).
+    """
+
+    name: str
+    tolerance: float
+    angular_tolerance: float
+    relative: Optional[float] = None
+
+    def deflection(self, size: float) -> float:
+        """Return the linear deflection for a part with a bounding box diagonal of size (mm)."""
+        if self.relative is None:
+            return self.tolerance
+        return max(self.tolerance, self.relative * size)
+
+    def settings(self) -> Dict[str, object]:
+        """Return the profile as a JSON-serializable dict."""
+        return {
+            "profile": self.name,
+            "tolerance": self.tolerance,
+            "angular_tolerance": self.angular_tolerance,
+            "relative": self.relative,
+        }
+
+
+PROFILES: Dict[str, TessellationProfile] = {
+    profile.name: profile
+    for profile in (
+        TessellationProfile(
+            "preview", tolerance=0.05, angular_tolerance=0.5, relative=2e-3
+        ),
+        TessellationProfile("print", tolerance=1e-3, angular_tolerance=0.1),
+        TessellationProfile("archival", tolerance=1e-4, angular_tolerance=0.05),
+    )
+}
+
+DEFAULT_PROFILE = "print"
+
+
+def get_profile(
+    profile: Union[str, TessellationProfile, None] = None,
+) -> TessellationProfile:
+    """
+    Return a TessellationProfile by name (None: DEFAULT_PROFILE).
+
+    Raises:
+        ValueError: if there's no profile by that name.
+    """
+    if isinstance(profile, TessellationProfile):
+        return profile
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown tessellation profile {name!r}; choose from {sorted(PROFILES)}"
+        )
+    return PROFILES[name]
+
+
+@dataclass
+class Mesh:
+    """
+    A triangle mesh.
+
+    Attributes:
+        vertices (np.ndarray): (n, 3) float64 vertex positions in mm.
+        triangles (np.ndarray): (m, 3) uint32 vertex indices, counter-clockwise.
+        label (str): label of the shape the mesh was made from.
+        color (tuple): (r, g, b, a) color of that shape, or None.
+        base (Mesh): for an instance of shared geometry, the mesh of that
+            geometry at the identity location; None otherwise.
+        matrix (np.ndarray): for an instance, the 4x4 matrix placing base
+            (None: the identity).
+    """
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+    label: str = ""
+    color: Optional[tuple] = None
+    base: Optional["Mesh"] = None
+    matrix: Optional[np.ndarray] = None
+
+    @property
+    def triangle_vertices(self) -> np.ndarray:
+        """(m, 3, 3) array of each triangle's three vertex positions."""
+        return self.vertices[self.triangles]
+
+    @property
+    def normals(self) -> np.ndarray:
+        """(m, 3) array of unit face normals."""
+        tri = self.triangle_vertices
+        normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        return np.divide(
+            normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+        )
+
+    def transformed(self, matrix) -> "Mesh":
+        """Return a copy with a 4x4 transformation matrix applied to the vertices."""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        vertices = self.vertices @ matrix[:3, :3].T + matrix[:3, 3]
+        return Mesh(vertices, self.triangles, self.label, self.color)
+
+    def placed(self, matrix, label: str = "", color: Optional[tuple] = None) -> "Mesh":
+        """Return an instance of this mesh, placed by a 4x4 matrix (None: the identity)."""
+        vertices = (
+            self.vertices if matrix is None else self.transformed(matrix).vertices
+        )
+        return Mesh(vertices, self.triangles, label, color, base=self, matrix=matrix)
+
+    @staticmethod
+    def merge(meshes: Iterable["Mesh"], label: str = "") -> "Mesh":
+        """Concatenate meshes into one."""
+        meshes = list(meshes)
+        offsets = np.cumsum([0] + [len(m.vertices) for m in meshes[:-1]])
+        vertices = np.concatenate([m.vertices for m in meshes] or [np.empty((0, 3))])
+        triangles = np.concatenate(
+            [m.triangles + np.uint32(offset) for m, offset in zip(meshes, offsets)]
+            or [np.empty((0, 3), dtype=np.uint32)]
+        )
+        return Mesh(vertices, triangles.astype(np.uint32), label)
+
+
+def _tessellate_leaf(shape, tolerance: float, angular_tolerance: float) -> Mesh:
+    """Mesh a single shape (without walking its children)."""
+    # OCCT keeps any triangulation finer than asked for (it only refines
+    # coarser ones), so a shape meshed for print would be previewed at print
+    # resolution. Mesh a copy without triangulations (sharing the surfaces),
+    # so the mesh only depends on the deflections and the caller's shape
+    # (and every instance sharing its geometry) keeps its own.
+    copy = BRepBuilderAPI_Copy(shape.wrapped, False, False).Shape()
+    BRepMesh_IncrementalMesh(copy, tolerance, True, angular_tolerance, True)
+    vertices, triangles = [], []
+    for face in Shape.cast(copy).faces():
+        loc = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face.wrapped, loc)
+        if poly is None:
+            continue
+        nb_nodes, nb_triangles = poly.NbNodes(), poly.NbTriangles()
+        nodes = np.fromiter(
+            (c for i in range(1, nb_nodes + 1) for c in poly.Node(i).Coord()),
+            dtype=np.float64,
+            count=3 * nb_nodes,
+        ).reshape(-1, 3)
+        if not loc.IsIdentity():
+            matrix = np.array(location_to_matrix(loc))
+            nodes = nodes @ matrix[:3, :3].T + matrix[:3, 3]
+        tris = (
+            np.fromiter(
+                (n for i in range(1, nb_triangles + 1) for n in poly.Triangle(i).Get()),
+                dtype=np.int64,
+                count=3 * nb_triangles,
+            ).reshape(-1, 3)
+            - 1
+        )
+        if face.wrapped.Orientation() == TopAbs_REVERSED:
+            tris = tris[:, [0, 2, 1]]
+        vertices.append(nodes)
+        triangles.append(tris)
+    mesh = Mesh.merge(
+        [Mesh(v, t.astype(np.uint32)) for v, t in zip(vertices, triangles)]
+    )
+    mesh.label = getattr(shape, "label", "") or ""
+    mesh.color = color_to_tuple(getattr(shape, "color", None))
+    return mesh
+
+
+def tessellate(
+    shape,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+    profile: Union[str, TessellationProfile, None] = None,
+) -> list[Mesh]:
+    """
+    Mesh every leaf of a shape tree once.
+
+    Args:
+        shape: build123d Shape, optionally a Compound with children.
+        tolerance (float): linear deflection, as in build123d.export_stl().
+        angular_tolerance (float): angular deflection in radians.
+        profile: a TessellationProfile or the name of one in PROFILES; if
+            given, it sets the deflections instead of tolerance and
+            angular_tolerance.
+
+    Returns:
+        list[Mesh]: one mesh per leaf, in tree order, positioned in the
+        coordinates of ``shape``'s parent; leaves that share geometry share
+        a ``base`` mesh.
+    """
+    meshes: list[Mesh] = []
+    memo = GeometryMemo()
+
+    if profile is not None:
+        profile = get_profile(profile)
+    else:
+        profile = TessellationProfile("", tolerance, angular_tolerance)
+
+    def mesh_geometry(proto) -> Mesh:
+        leaf = Shape.cast(proto)
+        size = 0.0
+        if profile.relative is not None:
+            size = BoundBox.from_topo_ds(proto, optimal=False).diagonal
+        return _tessellate_leaf(
+            leaf, profile.deflection(size), profile.angular_tolerance
+        )
+
+    def walk(node, matrix):
+        children = list(getattr(node, "children", ()) or ())
+        loc = node.wrapped.Location()
+        if not loc.IsIdentity():
+            local = np.array(location_to_matrix(loc))
+            matrix = local if matrix is None else matrix @ local
+        if not children:
+            base = memo.get(node.wrapped, mesh_geometry)
+            label = getattr(node, "label", "") or ""
+            meshes.append(
+                base.placed(matrix, label, color_to_tuple(getattr(node, "color", None)))
+            )
+            return
+        for child in children:
+            walk(child, matrix)
+
+    walk(shape, None)
+    return meshes
+
+
+def _as_mesh(meshes: Union[Mesh, Sequence[Mesh]]) -> Mesh:
+    return meshes if isinstance(meshes, Mesh) else Mesh.merge(meshes)
+
+
+def write_stl(
+    meshes: Union[Mesh, Sequence[Mesh]], path: str, ascii_format: bool = False
+) -> str:
+    """Write meshes as one binary (or ASCII) STL file."""
+    mesh = _as_mesh(meshes)
+    normals = mesh.normals.astype(np.float32)
+    tri = mesh.triangle_vertices.astype(np.float32)
+    if ascii_format:
+        facet = (
+            " facet normal %e %e %e\n  outer loop\n"
+            "   vertex %e %e %e\n   vertex %e %e %e\n   vertex %e %e %e\n"
+            "  endloop\n endfacet\n"
+        )
+        values = np.concatenate([normals, tri.reshape(-1, 9)], axis=1)
+        with open(path, "w") as f:
+            f.write("solid\n")
+            f.write((facet * len(values)) % tuple(values.ravel().tolist()))
+            f.write("endsolid\n")
+    else:
+        record = np.dtype(
+            [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+        )
+        data = np.zeros(len(tri), dtype=record)
+        data["normal"] = normals
+        data["vertices"] = tri
+        with open(path, "wb") as f:
+            f.write(b"\0" * 80)
+            f.write(struct.pack("<I", len(data)))
+            data.tofile(f)
+    return path
+
+
+def _srgb_to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# glTF is +Y up, in meters; rotate the Z-up mm model like build123d.export_gltf()
+_GLTF_Z_UP_TO_Y_UP = [-0.7071067811865475, 0.0, 0.0, 0.7071067811865475]
+
+
+def write_gltf(
+    meshes: Sequence[Mesh], path: str, name: str = "", scale: float = 0.001
+) -> str:
+    """
+    Write meshes as a glTF 2.0 file with a .bin buffer next to it.
+
+    Each mesh becomes a node under one root node; meshes with the same color
+    share a material. Instances of the same base mesh with the same color
+    share one glTF mesh, placed by their node's matrix.
+    """
+    if isinstance(meshes, Mesh):
+        meshes = [meshes]
+    bin_name = os.path.splitext(os.path.basename(path))[0] + ".bin"
+    buffer = bytearray()
+    accessors, buffer_views, gltf_meshes, nodes, materials = [], [], [], [], []
+    material_index: dict = {}
+    mesh_index: dict = {}
+
+    def add_view(array: np.ndarray, target: int) -> int:
+        while len(buffer) % 4:
+            buffer.append(0)
+        buffer_views.append(
+            {
+                "buffer": 0,
+                "byteOffset": len(buffer),
+                "byteLength": array.nbytes,
+                "target": target,
+            }
+        )
+        buffer.extend(array.tobytes())
+        return len(buffer_views) - 1
+
+    for mesh in meshes:
+        node = {"name": mesh.label}
+        if mesh.base is not None and mesh.matrix is not None:
+            matrix = np.array(mesh.matrix, dtype=np.float64)
+            matrix[:3, 3] *= scale
+            node["matrix"] = matrix.T.ravel().tolist()  # column-major
+        source = mesh.base if mesh.base is not None else mesh
+        key = (id(source), mesh.color)
+        if key in mesh_index:
+            node["mesh"] = mesh_index[key]
+            nodes.append(node)
+            continue
+
+        positions = (source.vertices * scale).astype(np.float32)
+        indices = source.triangles.astype(np.uint32).ravel()
+        accessors.append(
+            {
+                "bufferView": add_view(positions, 34962),
+                "componentType": 5126,
+                "count": len(positions),
+                "type": "VEC3",
+                "min": positions.min(axis=0).tolist() if len(positions) else [0, 0, 0],
+                "max": positions.max(axis=0).tolist() if len(positions) else [0, 0, 0],
+            }
+        )
+        accessors.append(
+            {
+                "bufferView": add_view(indices, 34963),
+                "componentType": 5125,
+                "count": len(indices),
+                "type": "SCALAR",
+            }
+        )
+        primitive = {
+            "attributes": {"POSITION": len(accessors) - 2},
+            "indices": len(accessors) - 1,
+            "mode": 4,
+        }
+        color = mesh.color or (0.8, 0.8, 0.8, 1.0)
+        if color not in material_index:
+            material = {
+                "name": f"mat_{len(materials)}",
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": [
+                        *(_srgb_to_linear(c) for c in color[:3]),
+                        color[3],
+                    ],
+                },
+                "doubleSided": True,
+            }
+            if color[3] < 1:
+                material["alphaMode"] = "BLEND"
+            material_index[color] = len(materials)
+            materials.append(material)
+        primitive["material"] = material_index[color]
+        gltf_meshes.append({"name": mesh.label, "primitives": [primitive]})
+        mesh_index[key] = node["mesh"] = len(gltf_meshes) - 1
+        nodes.append(node)
+
+    root = {
+        "children": list(range(1, len(nodes) + 1)),
+        "rotation": _GLTF_Z_UP_TO_Y_UP,
+        "name": name,
+    }
+    gltf = {
+        "asset": {"version": "2.0", "generator": "workboard.tessellation"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [root, *nodes],
+        "meshes": gltf_meshes,
+        "materials": materials,
+        "accessors": accessors,
+        "bufferViews": buffer_views,
+        "buffers": [{"uri": bin_name, "byteLength": len(buffer)}],
+    }
+    with open(os.path.join(os.path.dirname(path), bin_name), "wb") as f:
+        f.write(buffer)
+    with open(path, "w") as f:
+        json.dump(gltf, f)
+    return path
@@ -0,0 +1,66 @@
+"""
+test_bbox.py
+"""
+
+import pytest
+from build123d import Box, Compound, Cylinder, Location, Part
+
+from workboard.bbox import CACHE, BoundingBoxCache, bounding_box, center, extent
+from workboard.instancing import place
+
+
+def _corners(bbox):
+    return [*bbox.min, *bbox.max]
+
+
+def test_bounding_box_matches_build123d():
+    shape = Compound(children=[Box(10, 20, 30), Cylinder(5, 10).translate((20, 0, 0))])
+    assert _corners(bounding_box(shape)) == pytest.approx(
+        _corners(shape.bounding_box())
+    )
+    assert tuple(center(shape)) == pytest.approx(tuple(shape.bounding_box().center()))
+    assert tuple(extent(shape)) == pytest.approx((30, 20, 30))
+    fast = bounding_box(shape, optimal=False)
+    assert all(a <= b + 1e-9 for a, b in zip(fast.min, bounding_box(shape).min))
+
+
+def test_cache_hits_and_invalidation():
+    cache = BoundingBoxCache()
+    box = Box(2, 2, 2)
+    first = cache.get(box)
+    assert cache.get(box) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    moved = box.translate((10, 0, 0))
+    assert cache.get(moved).min.X == pytest.approx(9)
+    assert cache.get(box).min.X == pytest.approx(-1)
+
+    # moving in place changes the key too
+    box.move(Location((0, 0, 5)))
+    assert cache.get(box).min.Z == pytest.approx(4)
+    assert cache.misses == 3
+
+    # shapes sharing geometry and location share an entry
+    twin = Part(moved.wrapped)
+    assert cache.get(twin) is cache.get(moved)
+    assert cache.get(place(moved, (0, 0, 1))).min.Z == pytest.approx(0)
+
+
+def test_cache_is_bounded():
+    cache = BoundingBoxCache(maxsize=2)
+    boxes = [Box(1, 1, 1).translate((i, 0, 0)) for i in range(3)]
+    for box in boxes:
+        cache.get(box)
+    assert len(cache) == 2
+    cache.get(boxes[0])
+    assert cache.misses == 4
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_default_cache():
+    box = Box(1, 2, 3)
+    hits = CACHE.hits
+    bounding_box(box)
+    bounding_box(box)
+    assert CACHE.hits == hits + 1
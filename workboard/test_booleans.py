@@ -0,0 +1,69 @@
+"""
+test_booleans.py
+"""
+
+import pytest
+from build123d import Box, Cylinder
+
+from workboard.booleans import clip_all, cut_all, fuse_all
+from workboard.projects.umbrellastandstopper.umbrellastandstopper01 import (
+    MushroomModes,
+    hole_centers,
+    mushroom,
+)
+
+
+def test_cut_all_matches_sequential_cuts():
+    plate = Box(100, 100, 5)
+    holes = [
+        Cylinder(2, 10).translate((x, y, 0)) for x in (-30, 0, 30) for y in (-30, 0, 30)
+    ]
+    expected = plate
+    for hole in holes:
+        expected = expected - hole
+    cut = cut_all(plate, holes)
+    assert cut.volume == pytest.approx(expected.volume)
+    assert len(cut.faces()) == len(expected.faces())
+    assert cut_all(plate, []) is plate
+
+
+def test_fuse_all_overlapping():
+    boxes = [
+        Box(10, 10, 10),
+        Box(10, 10, 10).translate((5, 0, 0)),
+        Box(10, 10, 10).translate((20, 0, 0)),
+    ]
+    fused = fuse_all(boxes)
+    assert fused.volume == pytest.approx(1500 + 1000)
+    assert len(fused.solids()) == 2
+    assert fuse_all(boxes[:1]) is boxes[0]
+    with pytest.raises(ValueError):
+        fuse_all([])
+
+
+def test_clip_all_skips_shapes_outside_tool():
+    tool = Box(20, 20, 20)
+    shapes = [
+        Box(10, 10, 10).translate((10, 10, 10)),
+        Box(2, 2, 2).translate((100, 0, 0)),
+    ]
+    clipped = clip_all(shapes, tool)
+    assert clipped.volume == pytest.approx(5 * 5 * 5)
+
+
+def test_hole_centers():
+    centers = hole_centers(40, 15, 3)
+    assert len(centers) == 21  # a 5x5 grid without its corners
+    assert ((centers**2).sum(axis=1) <= 37**2).all()
+    assert centers[0].tolist() == [-30, -15]
+    assert len(hole_centers(2, 15, 3)) == 0
+
+
+def test_mushroom_cylinder_holes():
+    m = mushroom(mode=MushroomModes.cylinder_holes, cap_radius=40)
+    one_hole = mushroom(
+        mode=MushroomModes.cylinder_holes, cap_radius=40, hole_spacing=1000
+    )
+    assert len(m.solids()) == 1
+    assert len(m.faces()) > len(one_hole.faces())
+    assert m.volume < one_hole.volume
@@ -0,0 +1,207 @@
+"""
+test_exporting.py
+"""
+
+import os
+
+import pytest
+from build123d import Box, Color, Compound, Cylinder
+
+from workboard.exporting import (
+    FORMATS,
+    MANIFEST_FILENAME,
+    InlineExecutor,
+    export_parts,
+    read_manifest,
+)
+from workboard.tessellation import PROFILES
+
+
+def _parts():
+    box = Box(10, 10, 10)
+    box.label = "box"
+    box.color = Color(1, 0, 0, 1)
+    cyl = Cylinder(5, 10).translate((20, 0, 0))
+    cyl.label = "cyl"
+    return {"box": box, "cyl": cyl}
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_export_parts_manifest(tmp_path, max_workers):
+    prefix = str(tmp_path / "thing__part_")
+    report = export_parts(
+        _parts().items(), filename_prefix=prefix, max_workers=max_workers
+    )
+    files = report.files
+    assert list(files) == ["box", "cyl"]
+    for name, filenames in files.items():
+        assert list(filenames) == list(FORMATS)
+        for ext, path in filenames.items():
+            assert path == f"{prefix}_{name}{ext}"
+            assert os.path.getsize(path) > 0
+    assert os.path.exists(str(tmp_path / "thing__part__box.bin"))
+    # temporary directories are cleaned up
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(".export-")]
+
+
+def test_export_parts_assembly_with_parent(tmp_path):
+    parts = _parts()
+    asm = Compound(label="asm", children=list(parts.values()))
+    prefix = str(tmp_path / "thing__assembly_")
+    files = export_parts(
+        [("asm", asm), *parts.items()], filename_prefix=prefix, max_workers=0
+    ).files
+    assert os.path.getsize(files["asm"][".step"]) > 0
+    assert os.path.getsize(files["box"][".step"]) > 0
+
+
+def test_export_parts_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_parts(
+            _parts().items(), filename_prefix=str(tmp_path / "x"), formats=[".obj"]
+        )
+
+
+def test_export_parts_skips_unchanged(tmp_path):
+    prefix = str(tmp_path / "thing__part_")
+    first = export_parts(_parts().items(), filename_prefix=prefix, max_workers=0)
+    assert len(first.written) == 2 * len(FORMATS)
+    assert first.skipped == []
+    manifest = read_manifest(str(tmp_path))
+    assert manifest["thing__part__box.gltf"]["files"] == [
+        "thing__part__box.bin",
+        "thing__part__box.gltf",
+    ]
+
+    mtime = os.path.getmtime(first.files["box"][".step"])
+    second = export_parts(_parts().items(), filename_prefix=prefix, max_workers=0)
+    assert second.written == []
+    assert sorted(second.skipped) == sorted(first.written)
+    assert os.path.getmtime(first.files["box"][".step"]) == mtime
+
+    forced = export_parts(
+        _parts().items(), filename_prefix=prefix, max_workers=0, force=True
+    )
+    assert len(forced.written) == 2 * len(FORMATS)
+
+
+def test_export_parts_rewrites_changed(tmp_path):
+    prefix = str(tmp_path / "thing__part_")
+    export_parts(_parts().items(), filename_prefix=prefix, max_workers=0)
+
+    parts = _parts()
+    parts["box"] = parts["box"].translate((0, 0, 1))
+    report = export_parts(parts.items(), filename_prefix=prefix, max_workers=0)
+    assert sorted(report.written) == sorted(report.files["box"].values())
+
+    # mesh settings only affect the mesh formats
+    report = export_parts(
+        parts.items(), filename_prefix=prefix, max_workers=0, tolerance=0.01
+    )
+    assert sorted(report.written) == sorted(
+        path
+        for name in ("box", "cyl")
+        for ext, path in report.files[name].items()
+        if ext != ".step"
+    )
+
+    # a deleted output is written again
+    os.remove(report.files["cyl"][".step"])
+    report = export_parts(
+        parts.items(), filename_prefix=prefix, max_workers=0, tolerance=0.01
+    )
+    assert report.written == [report.files["cyl"][".step"]]
+    assert os.path.exists(str(tmp_path / MANIFEST_FILENAME))
+
+
+def test_export_profile_is_in_the_manifest(tmp_path):
+    prefix = str(tmp_path / "thing__part_")
+    formats = (".step", ".stl")
+    export_parts(
+        _parts().items(), filename_prefix=prefix, formats=formats, max_workers=0
+    )
+    manifest = read_manifest(str(tmp_path))
+    assert manifest["thing__part__cyl.stl"]["settings"]["profile"] == "print"
+    assert "profile" not in manifest["thing__part__cyl.step"]["settings"]
+    print_size = os.path.getsize(f"{prefix}_cyl.stl")
+
+    # a different profile only rewrites the mesh formats
+    report = export_parts(
+        _parts().items(),
+        filename_prefix=prefix,
+        formats=formats,
+        max_workers=0,
+        profile="preview",
+    )
+    assert sorted(report.written) == [f"{prefix}_box.stl", f"{prefix}_cyl.stl"]
+    settings = read_manifest(str(tmp_path))["thing__part__cyl.stl"]["settings"]
+    assert settings["profile"] == "preview"
+    assert settings["relative"] == PROFILES["preview"].relative
+    assert os.path.getsize(f"{prefix}_cyl.stl") < print_size
+
+    with pytest.raises(ValueError):
+        export_parts(
+            _parts().items(), filename_prefix=prefix, formats=formats, profile="draft"
+        )
+
+
+def test_concurrent_exports_keep_each_others_manifest_entries(tmp_path):
+    prefix = str(tmp_path / "thing__part_")
+    parts = _parts()
+
+    class InterleavingExecutor(InlineExecutor):
+        """Runs another export into the same directory during the first job."""
+
+        def submit(self, fn, /, *args, **kwargs):
+            if not getattr(self, "interleaved", False):
+                self.interleaved = True
+                export_parts(
+                    [("cyl", parts["cyl"])],
+                    filename_prefix=prefix,
+                    formats=[".step"],
+                    max_workers=0,
+                )
+            return super().submit(fn, *args, **kwargs)
+
+    export_parts(
+        [("box", parts["box"])],
+        filename_prefix=prefix,
+        formats=[".step"],
+        executor=InterleavingExecutor(),
+    )
+    assert sorted(read_manifest(str(tmp_path))) == [
+        "thing__part__box.step",
+        "thing__part__cyl.step",
+    ]
+    again = export_parts(
+        parts.items(), filename_prefix=prefix, formats=[".step"], max_workers=0
+    )
+    assert again.written == []
+
+
+def test_worker_spans_are_in_the_timing_report(tmp_path):
+    from workboard import timing
+
+    timing.reset()
+    timing.enable()
+    try:
+        export_parts(
+            _parts().items(),
+            filename_prefix=str(tmp_path / "x_"),
+            formats=[".step", ".stl"],
+            max_workers=2,
+        )
+        (root,) = timing.report()["spans"]
+    finally:
+        timing.disable()
+        timing.reset()
+    assert root["name"] == "export_parts"
+    names = sorted(child["name"] for child in root["children"])
+    assert names == [
+        "tessellate",
+        "tessellate",
+        "write.step",
+        "write.step",
+        "write.stl",
+        "write.stl",
+    ]
@@ -0,0 +1,138 @@
+"""
+test_fingerprints.py
+"""
+
+import json
+
+import pytest
+from build123d import Axis, Box, Compound, Cylinder
+
+from workboard import fingerprints
+from workboard.cli import main
+from workboard.fingerprints import (
+    Fingerprint,
+    FingerprintCache,
+    _mass_properties,
+    GOLDEN_SNAPSHOT,
+    check_snapshot,
+    fingerprint,
+    part_fingerprints,
+    read_snapshot,
+    take_snapshot,
+)
+from workboard.instancing import place
+
+
+def _assembly():
+    box = Box(10, 20, 30).rotate(Axis.X, 30).translate((5, 6, 7))
+    box.label = "box"
+    cyl = Cylinder(5, 10).translate((20, 0, 0))
+    cyl.label = "cyl"
+    return (
+        Compound(label="asm", children=[box, cyl])
+        .translate((1, 2, 3))
+        .rotate(Axis.Z, 45)
+    )
+
+
+def _assert_close(a: Fingerprint, b: Fingerprint):
+    assert a.compare(b, rel=1e-9, tolerance=1e-9) == []
+
+
+def test_fingerprint_box():
+    fp = fingerprint(Box(10, 20, 30).translate((1, 2, 3)))
+    assert fp.volume == pytest.approx(6000)
+    assert fp.area == pytest.approx(2 * (200 + 300 + 600))
+    assert fp.centroid == pytest.approx((1, 2, 3))
+    # Ixx = m (b^2 + c^2) / 12
+    assert fp.inertia[:3] == pytest.approx(
+        (6000 * (400 + 900) / 12, 6000 * (100 + 900) / 12, 6000 * 500 / 12)
+    )
+    assert fp.inertia[3:] == pytest.approx((0, 0, 0), abs=1e-6)
+
+
+def test_assembly_fingerprint_matches_occt():
+    asm = _assembly()
+    _assert_close(fingerprint(asm), _mass_properties(asm.wrapped))
+    parts = part_fingerprints(asm)
+    assert list(parts) == ["asm", "asm/box", "asm/cyl"]
+    _assert_close(
+        parts["asm/cyl"],
+        _mass_properties(asm.children[1].wrapped.Moved(asm.wrapped.Location())),
+    )
+
+
+def test_cache_shares_instances(monkeypatch):
+    cache = FingerprintCache()
+    monkeypatch.setattr(fingerprints, "CACHE", cache)
+    cyl = Cylinder(2, 10)
+    asm = Compound(children=[place(cyl, (x, 0, 0)) for x in range(0, 50, 10)])
+    fp = fingerprint(asm)
+    assert (cache.misses, cache.hits) == (1, 4)
+    assert fp.centroid == pytest.approx((20, 0, 0))
+    _assert_close(fp, _mass_properties(asm.wrapped))
+
+
+def test_compare_and_serialize():
+    fp = fingerprint(Box(10, 20, 30))
+    assert (
+        Fingerprint.from_dict(json.loads(json.dumps(fp.to_dict()))).compare(
+            fp, rel=1e-10
+        )
+        == []
+    )
+    assert fingerprint(Box(10, 20, 30.001)).compare(fp) == ["volume", "area", "inertia"]
+    moved = fingerprint(Box(10, 20, 30).translate((0, 0, 0.01)))
+    assert moved.compare(fp) == ["centroid"]
+    assert moved.compare(fp, tolerance=0.1) == []
+
+
+def test_snapshot(monkeypatch):
+    renders = []
+
+    def render_fingerprints(model, overrides=None, quality=None):
+        renders.append(model)
+        return part_fingerprints(
+            Box(10, 20, overrides.get("height", 30)), prefix="model"
+        )
+
+    monkeypatch.setattr(fingerprints, "render_fingerprints", render_fingerprints)
+    snapshot = take_snapshot(["easel"], {"easel": {"height": 30}})
+    assert list(snapshot["models"]["easel"]["parts"]) == ["model"]
+
+    (report,) = check_snapshot(snapshot)
+    assert report["ok"] and not report["rendered"]
+    (report,) = check_snapshot(snapshot, force=True)
+    assert report["ok"] and report["rendered"]
+
+    snapshot["models"]["easel"]["overrides"] = {"height": 31}
+    (report,) = check_snapshot(snapshot)
+    assert report["rendered"] and not report["ok"]
+    assert report["changed"] == {"model": ["volume", "area", "inertia"]}
+    assert renders == ["easel"] * 3
+
+
+def test_cli_snapshot_and_check(tmp_path, capsys):
+    path = str(tmp_path / "fingerprints.json")
+    assert main(["fingerprint", "snapshot", "pizzapancoolingmat", "-o", path]) == 0
+    snapshot = json.loads(open(path).read())
+    assert "model/Pan 1" in snapshot["models"]["pizzapancoolingmat"]["parts"]
+    assert main(["fingerprint", "check", path]) == 0
+    assert main(["fingerprint", "check", path, "--force"]) == 0
+    snapshot["models"]["pizzapancoolingmat"]["parts"]["model/Pan 1"]["volume"] += 1
+    with open(path, "w") as f:
+        json.dump(snapshot, f)
+    assert main(["fingerprint", "check", path, "--force"]) == 1
+    assert "changed  model/Pan 1: volume" in capsys.readouterr().out
+
+
+def test_golden_snapshot():
+    """If this fails after an intended geometry change: make fingerprints-snapshot"""
+    snapshot = read_snapshot(GOLDEN_SNAPSHOT)
+    assert set(snapshot["models"]) == set(fingerprints.MODEL_PROJECTS)
+    assert {golden["quality"] for golden in snapshot["models"].values()} == {"draft"}
+    # models whose sources changed since the snapshot are re-rendered
+    reports = check_snapshot(snapshot)
+    assert [r["model"] for r in reports if not r["ok"]] == [], reports
+    # and the snapshot matches a fresh render, whatever changed
+    assert check_snapshot(snapshot, ["workboard"], force=True)[0]["ok"]
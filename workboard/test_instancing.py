@@ -0,0 +1,112 @@
+"""
+test_instancing.py
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from build123d import Axis, Box, Color, Compound, Cylinder, Location, Part, import_step
+
+from workboard.exporting import export_parts
+from workboard.instancing import geometry_groups, leaves, place
+from workboard.shapeio import pack_shape, unpack_shape
+from workboard.tessellation import tessellate
+
+ROTATE_Z90 = Location((0, 0, 0), (0, 0, 90))
+
+
+def _instances():
+    box = Box(10, 20, 30)
+    box.color = Color(1, 0, 0, 1)
+    placed = [
+        place(box, Location((x, 0, 0)) * ROTATE_Z90, label=f"box{i}")
+        for i, x in enumerate((0, 50, 100))
+    ]
+    cyl = Cylinder(5, 10)
+    cyl.label = "cyl"
+    return Compound(label="asm", children=[*placed, cyl])
+
+
+def _bbox(shape):
+    bbox = shape.bounding_box()
+    return [*bbox.min, *bbox.max]
+
+
+def test_place_matches_rotate_and_translate():
+    box = Box(10, 20, 30)
+    box.label = "box"
+    placed = place(box, Location((1, 2, 3)) * ROTATE_Z90)
+    copied = box.rotate(Axis.Z, 90).translate((1, 2, 3))
+    assert _bbox(placed) == pytest.approx(_bbox(copied))
+    assert placed.volume == pytest.approx(copied.volume)
+    assert isinstance(placed, Part)
+    assert placed.label == "box"
+    assert placed.wrapped.IsPartner(box.wrapped)
+    # the prototype is left where it was
+    assert _bbox(box) == pytest.approx([-5, -10, -15, 5, 10, 15])
+    assert place(box, (0, 0, 5), label="up", color=Color(0, 0, 1)).label == "up"
+
+
+def test_geometry_groups():
+    asm = _instances()
+    assert [leaf.label for leaf in leaves(asm)] == ["box0", "box1", "box2", "cyl"]
+    groups = geometry_groups(asm)
+    assert [[leaf.label for leaf in group] for group in groups] == [
+        ["box0", "box1", "box2"],
+        ["cyl"],
+    ]
+    copies = Compound(children=[Box(1, 1, 1), Box(1, 1, 1).translate((5, 0, 0))])
+    assert len(geometry_groups(copies)) == 2
+
+
+def test_pack_shape_keeps_instances():
+    asm = _instances()
+    encoded = []
+    packed = pack_shape(asm, lambda wrapped: encoded.append(wrapped) or len(encoded))
+    assert len(encoded) == 2
+    assert [child["geometry"] for child in packed["children"]] == [1, 1, 1, 2]
+
+    unpacked = unpack_shape(pack_shape(asm))
+    assert len(geometry_groups(unpacked)) == 2
+    for original, copy in zip(leaves(asm), leaves(unpacked)):
+        assert copy.label == original.label
+        assert _bbox(copy) == pytest.approx(_bbox(original))
+
+
+def test_tessellate_shares_instance_meshes():
+    meshes = tessellate(_instances())
+    box0, box1, box2, cyl = meshes
+    assert box0.base is box1.base is box2.base
+    assert cyl.base is not box0.base
+    assert box1.triangles is box0.triangles
+    np.testing.assert_allclose(box1.vertices.min(axis=0), [40, -5, -15])
+    np.testing.assert_allclose(box1.matrix @ [0, 0, 0, 1], [50, 0, 0, 1], atol=1e-12)
+
+
+def test_export_instances(tmp_path):
+    asm = _instances()
+    prefix = str(tmp_path / "asm")
+    report = export_parts(
+        [("asm", asm)],
+        filename_prefix=prefix,
+        formats=(".gltf", ".step"),
+        max_workers=0,
+    )
+
+    with open(report.files["asm"][".gltf"]) as f:
+        gltf = json.load(f)
+    assert len(gltf["meshes"]) == 2
+    nodes = gltf["nodes"][1:]
+    assert [node["name"] for node in nodes] == ["box0", "box1", "box2", "cyl"]
+    assert [node["mesh"] for node in nodes] == [0, 0, 0, 1]
+    translation = np.array(nodes[1]["matrix"]).reshape(4, 4).T[:3, 3]
+    np.testing.assert_allclose(translation, [0.05, 0, 0], atol=1e-12)  # meters
+
+    step = report.files["asm"][".step"]
+    with open(step) as f:
+        text = f.read()
+    assert text.count("MANIFOLD_SOLID_BREP") == 2
+    assert _bbox(import_step(step)) == pytest.approx(_bbox(asm))
+    assert os.path.getsize(step) > 0
@@ -0,0 +1,88 @@
+"""
+test_labelindex.py
+"""
+
+import sys
+
+from build123d import Box, Compound
+
+from workboard.labelindex import iter_tree, label_index, label_prefix
+
+
+def _box(label):
+    box = Box(1, 1, 1)
+    box.label = label
+    return box
+
+
+def _asm():
+    front = Compound(label="Front", children=[_box("A. Leg (L)"), _box("B. Leg (R)")])
+    back = Compound(label="Back", children=[_box("C. Leg (rear)")])
+    return Compound(label="Easel", children=[front, back, _box("Board1")])
+
+
+def test_iter_tree_order_and_paths():
+    asm = _asm()
+    assert [(path, node.label) for path, node in iter_tree(asm)] == [
+        ((0,), "Front"),
+        ((0, 0), "A. Leg (L)"),
+        ((0, 1), "B. Leg (R)"),
+        ((1,), "Back"),
+        ((1, 0), "C. Leg (rear)"),
+        ((2,), "Board1"),
+    ]
+    assert next(iter_tree(asm, include_root=True)) == ((), asm)
+
+
+def test_iter_tree_deep():
+    node = _box("leaf")
+    for i in range(sys.getrecursionlimit() + 100):
+        node = Compound(label=f"level{i}", children=[node])
+    *_, (path, leaf) = iter_tree(node)
+    assert leaf.label == "leaf"
+    assert len(path) == sys.getrecursionlimit() + 100
+
+
+def test_label_prefix():
+    assert label_prefix("A. Leg (L)") == "A"
+    assert label_prefix("Board1") is None
+
+
+def test_lookup():
+    asm = _asm()
+    index = label_index(asm)
+    assert index.by_prefix("A").label == "A. Leg (L)"
+    assert index.get("Board1") is asm.children[2]
+    assert index.path("C. Leg (rear)") == (1, 0)
+    assert index.by_prefix("Z") is None
+    assert "Front" in index
+    assert index.labels() == [
+        "Front",
+        "A. Leg (L)",
+        "B. Leg (R)",
+        "Back",
+        "C. Leg (rear)",
+        "Board1",
+    ]
+    assert label_index(asm) is index
+
+
+def test_invalidated_when_children_change():
+    asm = _asm()
+    index = label_index(asm)
+    back = asm.children[1]
+    back.children = [*back.children, _box("D. Crossbar")]
+    assert index.is_stale()
+    fresh = label_index(asm)
+    assert fresh is not index
+    assert fresh.path("D. Crossbar") == (1, 1)
+
+    asm.children[2].parent = None
+    assert label_index(asm).get("Board1") is None
+
+
+def test_refresh_after_relabel():
+    asm = _asm()
+    label_index(asm).by_prefix("A").label = "E. Leg (L)"
+    assert label_index(asm).by_prefix("E") is None
+    assert label_index(asm, refresh=True).by_prefix("E").label == "E. Leg (L)"
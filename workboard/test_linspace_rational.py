@@ -0,0 +1,137 @@
+"""
+test_linspace_rational.py
+"""
+
+import subprocess
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sy
+
+from workboard.linspace_rational import iter_linspace_rational, linspace_rational
+
+test_cases = [
+    [[1, 2], (1, 2, 2), None],
+    [[1, 2, 3], (1, 3, 3), None],
+    [
+        [1, 2],
+        (1, 3, 2),
+        dict(endpoint=False),
+    ],
+    [[0, 1, 2, 3], (0, 3, 4), None],
+    [
+        [0, 1, 2],
+        (0, 3, 3),
+        dict(endpoint=False),
+    ],
+    [[0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5], (0, 5, 11), None],
+]
+
+
+@pytest.mark.parametrize("output_expected, args, kwargs", test_cases)
+def test_linspace_rational(output_expected, args, kwargs):
+    kwargs = kwargs if kwargs else {}
+    output_nplinspa = np.linspace(*args, **kwargs)
+    output_thisfunc = linspace_rational(*args, **kwargs)
+
+    np.testing.assert_allclose(output_expected, output_nplinspa)
+
+    np.testing.assert_allclose(output_expected, [float(n) for n in output_thisfunc])  # type: ignore
+
+
+@pytest.mark.parametrize("output_expected, args, kwargs", test_cases)
+def test_linspace_rational_float_and_int(output_expected, args, kwargs):
+    kwargs = kwargs if kwargs else {}
+    np.testing.assert_allclose(
+        linspace_rational(*args, dtype=float, **kwargs), output_expected
+    )
+    np.testing.assert_array_equal(
+        linspace_rational(*args, dtype=int, **kwargs),
+        np.linspace(*args, dtype=int, **kwargs),
+    )
+
+
+def test_exact():
+    points, step = linspace_rational(0, "1/3", 4, retstep=True, dtype=Fraction)
+    assert points == [0, Fraction(1, 9), Fraction(2, 9), Fraction(1, 3)]
+    assert all(type(p) is Fraction for p in points)
+    assert step == Fraction(1, 9)
+    assert list(iter_linspace_rational(Fraction(1, 2), 1, 3, endpoint=False)) == [
+        Fraction(1, 2),
+        Fraction(2, 3),
+        Fraction(5, 6),
+    ]
+    assert linspace_rational(5, 7, 1, retstep=True, dtype=Fraction) == ([5], None)
+    with pytest.raises(ValueError):
+        linspace_rational(0, 1, 0)
+
+
+def test_sympy_rational():
+    points = linspace_rational(0, 1, 3, dtype=sy.Rational)
+    assert points == [0, sy.Rational(1, 2), 1]
+    assert all(isinstance(p, sy.Rational) for p in points)
+    # the default, as before Fraction support
+    points, step = linspace_rational(0, "1/3", 4, retstep=True)
+    assert points == [0, sy.Rational(1, 9), sy.Rational(2, 9), sy.Rational(1, 3)]
+    assert all(isinstance(p, sy.Rational) for p in points) and isinstance(
+        step, sy.Rational
+    )
+
+
+def test_int_rounds_towards_negative_infinity():
+    np.testing.assert_array_equal(
+        linspace_rational(-1, 1, 5, dtype=int), [-1, -1, 0, 0, 1]
+    )
+    assert linspace_rational(0, 10, 3, dtype=np.int32).dtype == np.int32
+
+
+def test_float_is_correctly_rounded():
+    points = linspace_rational(0, 1, 11, dtype=float)
+    assert points.dtype == np.float64
+    assert points.tolist() == [i / 10 for i in range(11)]
+    # numerators too large for int64 fall back to Python ints
+    big = linspace_rational(0, 10**30, 3, dtype=float)
+    assert big.tolist() == [0.0, 5e29, 1e30]
+
+
+def test_array_valued_start_stop_and_axis():
+    start, stop = [0, 1], [1, 3]
+    np.testing.assert_allclose(
+        linspace_rational(start, stop, 3, dtype=float), np.linspace(start, stop, 3)
+    )
+    np.testing.assert_allclose(
+        linspace_rational(start, stop, 3, dtype=float, axis=1),
+        np.linspace(start, stop, 3, axis=1),
+    )
+    points, step = linspace_rational(
+        start, stop, 3, retstep=True, axis=-1, dtype=Fraction
+    )
+    assert points.shape == (2, 3)
+    assert points[1].tolist() == [1, 2, 3]
+    assert step.tolist() == [Fraction(1, 2), 1]
+    points, step = linspace_rational(start, stop, 3, retstep=True, axis=-1)
+    assert points[0].tolist() == [0, sy.Rational(1, 2), 1]
+    assert all(isinstance(p, sy.Rational) for p in points.flat) and isinstance(
+        step[0], sy.Rational
+    )
+    with pytest.raises(ValueError):
+        linspace_rational(start, stop, 3, dtype=complex)
+
+
+def test_fast():
+    start = time.perf_counter()
+    points = linspace_rational(0, "1/7", 10**5, dtype=float)
+    elapsed = time.perf_counter() - start
+    assert points[-1] == 1 / 7
+    assert elapsed < 0.05
+
+
+def test_import_is_light():
+    code = "import sys, workboard.linspace_rational; print(sorted({'numpy', 'sympy', 'pytest'} & set(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,86 @@
+"""
+test_placement.py
+"""
+
+import numpy as np
+import pytest
+from build123d import Axis, Box, Compound, Vector
+
+from workboard.placement import Placement, rotation_matrix, translation_matrix
+
+
+def _bbox(shape):
+    bbox = shape.bounding_box()
+    return [*bbox.min, *bbox.max]
+
+
+def _box(label="box"):
+    box = Box(10, 20, 30)
+    box.label = label
+    return box
+
+
+def test_rotation_matrix():
+    matrix = rotation_matrix((0, 0, 1), 90)
+    assert matrix @ [1, 0, 0, 1] == pytest.approx([0, 1, 0, 1])
+    assert translation_matrix((1, 2, 3)) @ [0, 0, 0, 1] == pytest.approx([1, 2, 3, 1])
+
+
+def test_chain_matches_build123d():
+    box = _box()
+    expected = box.rotate(Axis.Y, 70).translate((100, 0, 50)).rotate(Axis.X, 42)
+    placed = (
+        Placement()
+        .rotate(Axis.Y, 70)
+        .translate((100, 0, 50))
+        .rotate(Axis.X, 42)
+        .apply(box)
+    )
+    assert _bbox(placed) == pytest.approx(_bbox(expected))
+    assert placed.volume == pytest.approx(box.volume)
+    assert placed.label == "box"
+
+
+def test_rotate_about_point():
+    box = _box()
+    point = Vector(5, -20, 0)
+    expected = box.translate(-point).rotate(Axis.X, 42).translate(point)
+    placed = Placement().rotate(Axis.X, 42, about=point).apply(box)
+    assert _bbox(placed) == pytest.approx(_bbox(expected))
+
+
+def test_rotate_about_offset_axis():
+    box = _box()
+    axis = Axis((10, 0, 0), (0, 0, 1))
+    expected = box.rotate(axis, 90)
+    assert _bbox(Placement().rotate(axis, 90).apply(box)) == pytest.approx(
+        _bbox(expected)
+    )
+
+
+def test_compound_children_share_geometry():
+    children = [_box("a"), Box(5, 5, 5).translate((30, 0, 0))]
+    children[1].label = "b"
+    asm = Compound(label="asm", children=children)
+    before = [_bbox(c) for c in children]
+    expected = asm.rotate(Axis.Z, 30).translate((0, 0, 10))
+    placed = (
+        Placement().rotate(Axis.Z, 30).translate((0, 0, 10)).apply(asm, label="moved")
+    )
+    assert placed.label == "moved"
+    assert [c.label for c in placed.children] == ["a", "b"]
+    assert _bbox(placed) == pytest.approx(_bbox(expected))
+    for child, original in zip(placed.children, children):
+        assert child.wrapped.TShape() == original.wrapped.TShape()
+    for child, box in zip(children, before):
+        assert _bbox(child) == pytest.approx(box)
+
+
+def test_apply_all_and_matmul():
+    boxes = [_box("a"), _box("b")]
+    first, second = Placement().translate((1, 0, 0)), Placement().rotate(Axis.Z, 90)
+    placed = (second @ first).apply_all(boxes)
+    expected = first.then(second).apply(boxes[0])
+    assert [p.label for p in placed] == ["a", "b"]
+    assert _bbox(placed[0]) == pytest.approx(_bbox(expected))
+    assert np.allclose((second @ first).matrix, first.then(second).matrix)
@@ -0,0 +1,65 @@
+"""
+test_props.py
+"""
+
+import pickle
+
+import pytest
+
+from workboard.props import Props
+from workboard.projects.workboard.workboard01 import Component, test_thing
+
+
+def test_props_dirty_tracking():
+    props = Props({"a": 1, "b": [1, 2]})
+    assert props.changed() == {"a", "b"}
+    props.mark_clean()
+    props["a"] = 1
+    props["b"] = [1, 2]
+    assert props.changed() == set()
+    props["a"] = 2
+    props.update(c=3)
+    props.setdefault("b", None)
+    assert props.changed() == {"a", "c"}
+    assert props.changed(["a", "b"]) == {"a"}
+    props.mark_clean(["a"])
+    assert props.changed() == {"c"}
+    props.pop("b")
+    assert props.changed() == {"b", "c"}
+    assert props == {"a": 2, "c": 3}
+    assert repr(props) == "{'a': 2, 'c': 3}"
+
+
+def test_props_pickle_and_copy():
+    props = Props({"a": 1})
+    props.mark_clean()
+    props["b"] = 2
+    for clone in (pickle.loads(pickle.dumps(props)), props.copy()):
+        assert isinstance(clone, Props)
+        assert clone == props
+        assert clone.changed() == {"b"}
+
+
+def test_component_props():
+    assert test_thing()
+    obj = Component(id=1, name="x", props={"size": 1})
+    assert isinstance(obj.props, Props)
+    assert "size" not in vars(obj)
+    assert pickle.loads(pickle.dumps(obj)) == obj
+
+
+def test_component_changed_props():
+    obj = Component(id=1, name="Bob", props={"location": "Mars", "status": "active"})
+    obj.planet = "Jupiter"
+    assert obj.changed_props() == {"location", "status", "planet"}
+    obj.props.mark_clean()
+    obj.planet = "Jupiter"  # unchanged value
+    obj.status = "idle"
+    assert obj.changed_props() == {"status"}
+    assert obj.changed_props(["planet"]) == set()
+
+    del obj.location
+    assert "location" not in obj.props
+    assert obj.changed_props() == {"location", "status"}
+    with pytest.raises(AttributeError):
+        obj.location
@@ -0,0 +1,100 @@
+"""
+test_quality.py
+"""
+
+import pytest
+from build123d import Box, BuildPart, Part
+
+from workboard import quality
+from workboard.cli import main
+from workboard.labelindex import iter_tree
+from workboard.rendercache import RenderCache
+from workboard.sweep import MODELS, render_variant, result_shapes, shape_volume
+
+
+def _bboxes(shape):
+    boxes = {}
+    for path, node in iter_tree(shape, include_root=True):
+        bbox = node.bounding_box()
+        boxes[path] = (tuple(bbox.min), tuple(bbox.max))
+    return boxes
+
+
+def _assert_bboxes_enclose(draft, final):
+    """Assert that each draft node's bbox encloses the final node's (equal, unless the node is rotated)."""
+    draft, final = _bboxes(draft), _bboxes(final)
+    assert list(draft) == list(final)
+    for path, ((lo, hi), (final_lo, final_hi)) in (
+        (p, (draft[p], final[p])) for p in final
+    ):
+        assert all(a <= b + 1e-3 for a, b in zip(lo, final_lo)), path
+        assert all(a >= b - 1e-3 for a, b in zip(hi, final_hi)), path
+
+
+def test_use_and_validate():
+    assert quality.get_quality() == "final"
+    with quality.use("draft") as value:
+        assert value == "draft" and quality.is_draft()
+        with quality.use(None):
+            assert quality.is_draft()
+    assert not quality.is_draft()
+    with pytest.raises(ValueError):
+        quality.set_quality("fast")
+    with pytest.raises(ValueError):
+        with quality.use("fast"):
+            pass
+    assert quality.get_quality() == "final"
+
+
+def test_fillet():
+    box = Box(10, 10, 10)
+    rounded = quality.fillet(box.edges(), 1)
+    assert rounded.volume < box.volume
+    with quality.use("draft"):
+        proxy = quality.fillet(box.edges(), 1)
+        assert isinstance(proxy, Part)
+        assert proxy.volume == pytest.approx(box.volume)
+        with BuildPart() as part:
+            Box(10, 10, 10)
+            quality.fillet(part.edges(), 1)
+        assert part.part.volume == pytest.approx(1000)
+    with BuildPart() as part:
+        Box(10, 10, 10)
+        quality.fillet(part.edges(), 1)
+    assert part.part.volume == pytest.approx(rounded.volume)
+
+
+@pytest.mark.parametrize("model", ["workboard", "easel", "mushroom"])
+def test_draft_proxies_enclose_final_parts(model, monkeypatch):
+    monkeypatch.setattr(
+        "workboard.rendercache.DEFAULT_RENDER_CACHE", RenderCache(maxsize=4)
+    )
+    final = MODELS[model]({})
+    with quality.use("draft"):
+        draft = MODELS[model]({})
+    (_, final_named), (_, draft_named) = result_shapes(final), result_shapes(draft)
+    assert [name for name, _ in draft_named] == [name for name, _ in final_named]
+    for (_, d), (_, f) in zip(draft_named, final_named):
+        _assert_bboxes_enclose(d, f)
+    # sharp edges: more volume, and the render cache doesn't mix the two
+    assert shape_volume(result_shapes(draft)[0]) > shape_volume(result_shapes(final)[0])
+
+
+def test_render_variant_quality():
+    final = render_variant("workboard", 0, {})
+    draft = render_variant("workboard", 1, {}, quality="draft")
+    assert (final["quality"], draft["quality"]) == ("final", "draft")
+    assert sum(draft["bbox"], []) == pytest.approx(sum(final["bbox"], []))
+    assert draft["volume"] > final["volume"]
+    assert render_variant("workboard", 2, {}, quality="fast")["error"].startswith(
+        "ValueError"
+    )
+
+
+def test_cli_quality(capsys):
+    assert (
+        main(["--quality", "draft", "sweep", "mushroom", "-j", "0", "--jsonl", "-"])
+        == 0
+    )
+    assert '"quality": "draft"' in capsys.readouterr().out
+    assert quality.get_quality() == "final"
@@ -0,0 +1,135 @@
+"""
+test_rendercache.py
+"""
+
+import pytest
+from build123d import Box, Color, Compound
+
+from workboard.rendercache import RenderCache, cached_render
+
+
+class Thing:
+    def __init__(self, props):
+        self.props = props
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        box = Box(self.props["size"], self.props["size"], 1)
+        box.label = "box"
+        box.color = Color(1, 0, 0, 1)
+        return {
+            "parts": {"box": box},
+            "assemblies": {"asm": Compound(label="asm", children=[box])},
+        }
+
+
+def test_render_cache_hits_and_misses():
+    cache = RenderCache(maxsize=4)
+    thing = Thing({"size": 10})
+    data1 = cache.render(thing, Thing.render)
+    data2 = cache.render(thing, Thing.render)
+    assert thing.renders == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    # containers and shape objects are copied, geometry is shared
+    assert data1 is not data2
+    assert data1["parts"]["box"] is not data2["parts"]["box"]
+    assert data1["parts"]["box"].wrapped.IsSame(data2["parts"]["box"].wrapped)
+
+    thing.props["size"] = 20
+    cache.render(thing, Thing.render)
+    assert thing.renders == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_render_cache_hits_are_not_shared():
+    cache = RenderCache(maxsize=4)
+    thing = Thing({"size": 10})
+    data = cache.render(thing, Thing.render)
+    data["parts"]["box"].label = "relabeled"
+    data["assemblies"]["asm"].color = Color(0, 0, 1, 1)
+    Compound(label="other", children=[data["assemblies"]["asm"], data["parts"]["box"]])
+    hit = cache.render(thing, Thing.render)
+    assert hit["parts"]["box"].label == "box"
+    assert hit["parts"]["box"].parent is None
+    assert hit["assemblies"]["asm"].parent is None
+    assert hit["assemblies"]["asm"].color is None
+    assert [child.label for child in hit["assemblies"]["asm"].children] == ["box"]
+    assert tuple(hit["assemblies"]["asm"].children[0].color) == tuple(Color(1, 0, 0, 1))
+
+
+def test_render_cache_lru_eviction():
+    cache = RenderCache(maxsize=2)
+    things = [Thing({"size": size}) for size in (1, 2, 3)]
+    for thing in things:
+        cache.render(thing, Thing.render)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.key(things[0]) not in cache
+    cache.render(things[0], Thing.render)
+    assert things[0].renders == 2
+
+
+def test_render_cache_disk_store(tmp_path):
+    directory = str(tmp_path / "cache")
+    thing = Thing({"size": 10})
+    RenderCache(directory=directory).render(thing, Thing.render)
+
+    cache = RenderCache(directory=directory)
+    data = cache.render(thing, Thing.render)
+    assert thing.renders == 1
+    assert cache.disk_hits == 1
+    box = data["parts"]["box"]
+    assert box.label == "box"
+    assert tuple(box.color) == pytest.approx((1, 0, 0, 1))
+    assert box.volume == pytest.approx(100)
+    asm = data["assemblies"]["asm"]
+    assert [child.label for child in asm.children] == ["box"]
+
+
+def test_render_cache_disk_eviction(tmp_path):
+    cache = RenderCache(maxsize=0, directory=str(tmp_path), disk_maxsize=1)
+    cache.render(Thing({"size": 1}), Thing.render)
+    cache.render(Thing({"size": 2}), Thing.render)
+    assert cache.disk_evictions == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_cached_render_decorator():
+    cache = RenderCache()
+
+    class CachedThing(Thing):
+        @cached_render(cache)
+        def render(self):
+            return super().render()
+
+    thing = CachedThing({"size": 5})
+    thing.render()
+    thing.render()
+    assert thing.renders == 1
+    assert cache.hits == 1
+
+
+def test_model_source_version_covers_package_helpers(tmp_path, monkeypatch):
+    from workboard import rendercache
+
+    def version():
+        rendercache.package_source_version.cache_clear()
+        rendercache.model_source_version.cache_clear()
+        return rendercache.model_source_version(Thing)
+
+    package = tmp_path / "workboard"
+    package.mkdir()
+    (package / "helpers.py").write_text("RADIUS = 1\n")
+    (package / "test_helpers.py").write_text("")
+    monkeypatch.setattr(rendercache, "_PACKAGE_DIR", str(package))
+    try:
+        before = version()
+        (package / "test_helpers.py").write_text("# tests don't change renders\n")
+        assert version() == before
+        (package / "helpers.py").write_text("RADIUS = 2\n")
+        assert version() != before
+    finally:
+        monkeypatch.undo()
+        version()
@@ -0,0 +1,195 @@
+"""
+test_server.py
+
+Runs the render server in a thread with a thread pool and stand-in models,
+so no CAD kernel is needed.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from workboard import sweep
+from workboard.client import RenderClient, ServerError
+from workboard.server import RenderServer, running_server
+
+
+class FakeBox:
+    def __init__(self, size):
+        self.min = (0.0, 0.0, 0.0)
+        self.max = (size, size, size)
+
+
+class FakeShape:
+    children = ()
+
+    def __init__(self, size):
+        self.size = size
+        self.volume = size**3
+
+    def bounding_box(self):
+        return FakeBox(self.size)
+
+
+@pytest.fixture
+def models(monkeypatch):
+    release = threading.Event()
+
+    def cube(overrides):
+        if overrides.get("fail"):
+            raise ValueError("bad cube")
+        return FakeShape(overrides.get("size", 1.0))
+
+    def slow(overrides):
+        release.wait(5)
+        return FakeShape(1.0)
+
+    monkeypatch.setitem(sweep.MODELS, "cube", cube)
+    monkeypatch.setitem(sweep.MODELS, "slow", slow)
+    yield release
+    release.set()
+
+
+@pytest.fixture
+def server(tmp_path, models):
+    path = str(tmp_path / "render.sock")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with running_server(
+            path,
+            executor=executor,
+            preload_modules=(),
+            timeout=0.2,
+            max_pending=2,
+            output_dir=str(tmp_path),
+        ) as server:
+            yield server
+        models.set()
+
+
+def test_ping_and_render(server):
+    with RenderClient(server.path, timeout=10) as client:
+        assert client.ping()["pid"] == os.getpid()
+        assert "cube" in client.ping()["models"]
+        row = client.render("cube", {"size": 2.0})
+        assert row["bbox"] == [[0, 0, 0], [2, 2, 2]]
+        assert row["volume"] == 8.0
+        assert row["error"] is None
+        # several requests per connection; ids are echoed
+        response = client.request("render", model="cube", overrides={"size": 3.0})
+        assert response["ok"] and response["id"] == 3
+        assert response["result"]["volume"] == 27.0
+
+
+def test_errors(server):
+    with RenderClient(server.path, timeout=10) as client:
+        with pytest.raises(ServerError, match="bad cube"):
+            client.render("cube", {"fail": True})
+        with pytest.raises(ServerError, match="unknown model"):
+            client.render("nope")
+        with pytest.raises(ServerError, match="unknown op"):
+            client.call("draw")
+        with pytest.raises(ServerError, match="unknown profile"):
+            client.export("cube", profile="draft")
+        with pytest.raises(ServerError, match="unknown formats"):
+            client.export("cube", formats=[".obj"])
+        with pytest.raises(ServerError, match="unknown formats"):
+            client.call("export", model="cube", formats=".stl")
+        for timeout in ("soon", -1, float("nan")):
+            with pytest.raises(ServerError, match="timeout must be a positive number"):
+                client.call("render", model="cube", timeout=timeout)
+        client.sock.sendall(b"not json\n")
+        assert "invalid JSON" in client.rfile.readline().decode()
+        assert client.ping()
+
+
+def test_worker_failures_are_error_responses(server, monkeypatch):
+    def broken(*args):
+        raise BrokenProcessPool("a worker died")
+
+    monkeypatch.setattr("workboard.server.render_variant", broken)
+    with RenderClient(server.path, timeout=10) as client:
+        response = client.request("render", model="cube")
+        assert not response["ok"]
+        assert response["error"] == "BrokenProcessPool: a worker died"
+        assert client.ping()
+
+
+def test_export_names_hash_the_request(server, monkeypatch):
+    names = []
+
+    def record(model, index, overrides, output_dir, formats, profile, quality, name):
+        names.append(name)
+        return {"error": None}
+
+    monkeypatch.setattr("workboard.server.render_variant", record)
+    with RenderClient(server.path, timeout=10) as client:
+        client.export("cube", {"size": 2.0}, formats=[".stl"])
+        client.export("cube", {"size": 2.0}, formats=[".stl"])
+        client.export("cube", {"size": 3.0}, formats=[".stl"])
+        client.export("cube", {"size": 2.0}, formats=[".stl"], quality="draft")
+    assert names[0] == names[1] and names[0].startswith("cube_")
+    assert len(set(names)) == 3
+
+
+def test_socket_is_private(server):
+    assert os.stat(server.path).st_mode & 0o777 == 0o600
+
+
+def test_workers_are_forked_before_serving(tmp_path, models):
+    server = RenderServer(
+        str(tmp_path / "render.sock"), max_workers=2, preload_modules=()
+    )
+    try:
+        assert len(server.executor._processes) == 2
+    finally:
+        server.server_close()
+
+
+def test_timeout_and_busy(server, models):
+    with RenderClient(server.path, timeout=10) as client:
+        start = time.perf_counter()
+        with pytest.raises(ServerError, match="timeout"):
+            client.render("slow")
+        assert time.perf_counter() - start < 2
+        with pytest.raises(ServerError, match="timeout"):
+            client.render("slow", timeout=0.1)
+        # both timed-out renders are still running
+        with pytest.raises(ServerError, match="busy"):
+            client.render("cube")
+        models.set()
+        for _ in range(50):
+            response = client.request("render", model="cube")
+            if response["ok"]:
+                break
+            time.sleep(0.02)
+        assert response["ok"]
+
+
+def test_concurrent_clients(server):
+    def render(size):
+        with RenderClient(server.path, timeout=10) as client:
+            return client.render("cube", {"size": size})["volume"]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert sorted(pool.map(render, [1.0, 2.0])) == [1.0, 8.0]
+
+
+def test_shutdown_and_stale_socket(tmp_path, models):
+    path = str(tmp_path / "render.sock")
+    with running_server(path, executor=ThreadPoolExecutor(1), preload_modules=()):
+        with pytest.raises(OSError, match="already listening"):
+            running_server(
+                path, executor=ThreadPoolExecutor(1), preload_modules=()
+            ).__enter__()
+        with RenderClient(path) as client:
+            client.shutdown()
+    assert not os.path.exists(path)
+    # a socket file left behind by a dead server is replaced
+    open(path, "w").close()
+    with running_server(path, executor=ThreadPoolExecutor(1), preload_modules=()):
+        with RenderClient(path) as client:
+            assert client.ping()
@@ -0,0 +1,80 @@
+"""
+test_stlio.py
+"""
+
+import json
+
+import numpy as np
+import pytest
+from build123d import Box, Cylinder
+
+from workboard.cli import main
+from workboard.stlio import STLError, iter_ascii_stl, read_stl, stl_diff
+from workboard.tessellation import tessellate, write_stl
+
+
+@pytest.fixture
+def box_stls(tmp_path):
+    meshes = tessellate(Box(10, 20, 30))
+    binary = write_stl(meshes, str(tmp_path / "box.stl"))
+    ascii_ = write_stl(meshes, str(tmp_path / "box.txt.stl"), ascii_format=True)
+    return binary, ascii_
+
+
+def test_read_stl(box_stls):
+    binary, ascii_ = box_stls
+    b = read_stl(binary)
+    assert isinstance(b, np.memmap)
+    assert b["vertices"].shape == (12, 3, 3)
+    a = read_stl(ascii_)
+    np.testing.assert_allclose(a["vertices"], b["vertices"], atol=1e-5)
+    np.testing.assert_allclose(a["normal"], b["normal"], atol=1e-6)
+    # facets split across chunk boundaries
+    chunks = list(iter_ascii_stl(ascii_, chunk_size=100))
+    assert len(chunks) > 1
+    np.testing.assert_array_equal(np.concatenate(chunks), a)
+
+
+def test_read_stl_errors(tmp_path):
+    path = tmp_path / "bad.stl"
+    path.write_text("solid x\n facet normal 0 0 1\n bogus\nendsolid\n")
+    with pytest.raises(STLError):
+        read_stl(str(path))
+    path.write_bytes(b"\0" * 10)
+    with pytest.raises(STLError):
+        read_stl(str(path))
+
+
+def test_stl_diff(box_stls, tmp_path):
+    binary, ascii_ = box_stls
+    same = stl_diff(binary, binary)
+    assert same.identical and not same.changed()
+    assert same.volume[0] == pytest.approx(6000)
+    assert same.bbox[0] == ((-5, -10, -15), (5, 10, 15))
+
+    assert not stl_diff(binary, ascii_).changed(tolerance=1e-4)
+
+    moved = write_stl(
+        tessellate(Box(10, 20, 30).translate((0, 0, 0.5))), str(tmp_path / "moved.stl")
+    )
+    diff = stl_diff(binary, moved)
+    assert diff.changed(tolerance=0.1)
+    assert diff.hausdorff == pytest.approx(0.5)
+    assert diff.volume[1] == pytest.approx(6000)
+
+    other = stl_diff(
+        binary, write_stl(tessellate(Cylinder(5, 10)), str(tmp_path / "cyl.stl"))
+    )
+    assert other.triangles[0] == 12 and other.triangles[1] > 12
+    assert other.changed(tolerance=100)
+
+
+def test_cli(box_stls, tmp_path, capsys):
+    binary, ascii_ = box_stls
+    assert main(["stl", "diff", binary, ascii_, "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["triangles"] == [12, 12]
+    moved = write_stl(
+        tessellate(Box(10, 20, 30).translate((0, 0, 0.5))), str(tmp_path / "moved.stl")
+    )
+    assert main(["stl", "diff", binary, moved]) == 1
+    assert main(["stl", "diff", binary, moved, "--tolerance", "1"]) == 0
@@ -0,0 +1,93 @@
+"""
+test_subparts.py
+"""
+
+import pickle
+
+import pytest
+from build123d import Box, Color
+
+from workboard.projects.workboard.workboard01 import Component, Workboard
+from workboard.rendercache import RenderCache, cached_render
+from workboard.subparts import relink, subpart
+
+
+class Thing(Component):
+    @subpart("size")
+    def block(self, cfg):
+        vars(self)["builds"] = vars(self).get("builds", 0) + 1
+        return Box(cfg.size, cfg.size, 1)
+
+    @subpart("size")
+    def sloppy(self, cfg):
+        return Box(cfg.size, cfg.other, 1)
+
+    @cached_render(RenderCache(maxsize=0))
+    def render(self):
+        return {
+            "parts": {"block": relink(self.block(), label="block", color=self.color)}
+        }
+
+
+def test_subpart_rebuilds_only_on_declared_props():
+    thing = Thing(id=1, name="thing", props={"size": 2, "color": Color(1, 0, 0, 1)})
+    block = thing.render()["parts"]["block"]
+    assert vars(thing)["builds"] == 1
+
+    thing.color = Color(0, 1, 0, 1)
+    recolored = thing.render()["parts"]["block"]
+    assert vars(thing)["builds"] == 1
+    assert recolored.wrapped.TShape() == block.wrapped.TShape()
+    assert tuple(recolored.color) == pytest.approx((0, 1, 0, 1))
+    assert tuple(block.color) == pytest.approx((1, 0, 0, 1))
+
+    thing.size = 3
+    assert thing.render()["parts"]["block"].volume == pytest.approx(9)
+    assert vars(thing)["builds"] == 2
+
+
+def test_subpart_undeclared_prop():
+    thing = Thing(id=1, name="thing", props={"size": 2, "other": 3})
+    with pytest.raises(AttributeError, match="undeclared prop 'other'"):
+        thing.sloppy()
+
+
+def test_subpart_memo_not_pickled():
+    thing = Thing(id=1, name="thing", props={"size": 2, "color": None})
+    thing.block()
+    clone = pickle.loads(pickle.dumps(thing))
+    assert clone == thing
+    assert "_subparts" not in vars(clone)
+
+
+def test_workboard_feet_edit_keeps_board():
+    obj = Workboard(id=1, name="workboard01")
+    obj.init()
+    data = Workboard.render.uncached(obj)
+    obj.feet_color = Color(1, 0, 0, 1)
+    obj.feet_magnetic_disc_height = 2.0
+    data2 = Workboard.render.uncached(obj)
+    board, board2 = data["parts"]["workboard"], data2["parts"]["workboard"]
+    assert board2 is not board
+    assert board2.wrapped.TShape() == board.wrapped.TShape()
+    assert data2["parts"]["feet_magnetic_discs"].bounding_box().size.Z == pytest.approx(
+        2.0
+    )
+    assert [c.label for c in data2["assemblies"]["workboard_assembly"].children] == [
+        "workboard",
+        "workboard.magnets",
+        "feet.magnets",
+        "feet",
+    ]
+
+
+def test_workboard_without_feet():
+    obj = Workboard(id=1, name="workboard01")
+    obj.init(circle_positions=[])
+    assert obj.circle_positions == []
+    with pytest.warns(UserWarning, match="BuildPart didn't create anything"):
+        data = Workboard.render.uncached(obj)
+    assert [c.label for c in data["assemblies"]["workboard_assembly"].children] == [
+        "workboard"
+    ]
+    assert data["parts"]["feet"] is None
@@ -0,0 +1,112 @@
+"""
+test_svgcompile.py
+"""
+
+import importlib.util
+import os
+import shutil
+
+import pytest
+
+from workboard import translatesvgpath2
+from workboard.cli import main
+from workboard.svgcompile import builder_name, compile_to_module
+
+SVG_DIR = os.path.join(os.path.dirname(__file__), "projects", "workboard")
+SVGS = [
+    "workboard01__groove_handle_2d_v0.0.1.svg",
+    "workboard01__groove_handle_2d_v0.0.4.svg",
+]
+
+
+@pytest.fixture
+def svg_dir(tmp_path):
+    directory = tmp_path / "svgs"
+    directory.mkdir()
+    for name in SVGS:
+        shutil.copy(os.path.join(SVG_DIR, name), directory / name)
+    return directory
+
+
+def _import(path):
+    spec = importlib.util.spec_from_file_location("generated_sketches", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_builder_name():
+    assert (
+        builder_name("a/workboard01__groove_handle_2d_v0.0.4.svg")
+        == "workboard01__groove_handle_2d_v0_0_4"
+    )
+    assert builder_name("2d-handle.svg") == "_2d_handle"
+
+
+def test_compile_to_module(svg_dir, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    output = str(tmp_path / "sketches.py")
+    results = compile_to_module(
+        [str(svg_dir)], output=output, directory=cache_dir, max_workers=0
+    )
+    assert [r["name"] for r in results] == [builder_name(name) for name in SVGS]
+    assert [r["cached"] for r in results] == [False, False]
+    assert [len(r["manifest"]["paths"]) for r in results] == [1, 1]
+
+    # the generated module loads sketches from the cache directory it was compiled with
+    default_cache = translatesvgpath2.SketchCache()
+    monkeypatch.setattr(translatesvgpath2, "DEFAULT_SKETCH_CACHE", default_cache)
+    module = _import(output)
+    assert module._CACHE.directory == os.path.abspath(cache_dir)
+    sketch = module.SKETCHES[SVGS[1]]()
+    assert sketch.area == pytest.approx(693128.6, abs=0.1)
+    assert (module._CACHE.disk_hits, module._CACHE.misses) == (1, 0)
+    assert default_cache.misses == 0
+
+    # unchanged files are cached; a changed file is recompiled
+    with open(svg_dir / SVGS[0], "a") as f:
+        f.write("<!-- changed -->\n")
+    results = compile_to_module(
+        [str(svg_dir)], output=output, directory=cache_dir, max_workers=0
+    )
+    assert [r["cached"] for r in results] == [False, True]
+
+
+def test_svg_without_visible_paths_is_skipped(svg_dir, tmp_path):
+    with open(svg_dir / "empty.svg", "w") as f:
+        f.write(
+            '<svg xmlns="http://www.w3.org/2000/svg"><path d="M 0 0 L 1 1 Z" style="display:none"/></svg>\n'
+        )
+    output = str(tmp_path / "sketches.py")
+    results = compile_to_module(
+        [str(svg_dir)], output=output, directory=str(tmp_path / "cache"), max_workers=0
+    )
+    assert [r["skipped"] for r in results] == [True, False, False]
+    source = open(output).read()
+    assert (
+        "def empty()" not in source
+        and "Skipped (no visible paths):\n    empty.svg" in source
+    )
+    assert sorted(_import(output).SKETCHES) == SVGS
+
+
+def test_cli(svg_dir, tmp_path, capsys):
+    output = str(tmp_path / "sketches.py")
+    args = [
+        "svg",
+        "compile",
+        str(svg_dir / SVGS[1]),
+        "-o",
+        output,
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "-j",
+        "0",
+    ]
+    assert main(args) == 0
+    assert main(args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == ["compiled", "cached"]
+    source = open(output).read()
+    assert "def workboard01__groove_handle_2d_v0_0_4() -> Sketch:" in source
+    assert f"_CACHE = SketchCache({str(tmp_path / 'cache')!r})" in source
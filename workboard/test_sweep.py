@@ -0,0 +1,84 @@
+"""
+test_sweep.py
+"""
+
+import json
+
+import pytest
+
+from workboard.cli import build_parser, main, sweep_variants
+from workboard.sweep import expand_grid, sweep
+
+
+def test_expand_grid():
+    assert expand_grid({"a": [1, 2], "b": ["x", "y"]}) == [
+        {"a": 1, "b": "x"},
+        {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"},
+        {"a": 2, "b": "y"},
+    ]
+
+
+def test_sweep_workboard(tmp_path):
+    variants = expand_grid({"feet_height": [15, 20]})
+    results = sorted(
+        sweep("workboard", variants, max_workers=0, output_dir=str(tmp_path)),
+        key=lambda r: r["index"],
+    )
+    assert [r["overrides"] for r in results] == variants
+    assert [r["error"] for r in results] == [None, None]
+    # the feet set the height of the board
+    assert results[0]["bbox"][1][2] == pytest.approx(results[1]["bbox"][1][2] - 5)
+    assert results[0]["render_s"] > 0
+    assert (tmp_path / "workboard_0001__feet.step").exists()
+    assert results[1]["files"]["feet"][".step"] == str(
+        tmp_path / "workboard_0001__feet.step"
+    )
+    json.dumps(results)
+
+
+def test_sweep_records_errors():
+    (result,) = sweep("pizzapancoolingmat", [{"pan.nope": 1}], max_workers=0)
+    assert result["error"].startswith("TypeError")
+    with pytest.raises(ValueError):
+        list(sweep("nope", [{}], max_workers=0))
+
+
+def test_cli_sweep_variants(tmp_path):
+    variants_file = tmp_path / "variants.json"
+    variants_file.write_text(json.dumps([{"a": 1}, {"a": 2}]))
+    args = build_parser().parse_args(
+        [
+            "sweep",
+            "easel",
+            "--variants",
+            str(variants_file),
+            "--grid",
+            "b=[1.5, 2]",
+            "--set",
+            "c=x",
+        ]
+    )
+    assert sweep_variants(args) == [
+        {"a": 1, "b": 1.5, "c": "x"},
+        {"a": 1, "b": 2, "c": "x"},
+        {"a": 2, "b": 1.5, "c": "x"},
+        {"a": 2, "b": 2, "c": "x"},
+    ]
+
+
+def test_cli_sweep_jsonl(tmp_path):
+    jsonl = tmp_path / "results.jsonl"
+    args = [
+        "sweep",
+        "pizzapancoolingmat",
+        "--grid",
+        "pan.diameter=300,330",
+        "-j",
+        "0",
+        "--jsonl",
+        str(jsonl),
+    ]
+    assert main(args) == 0
+    rows = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert sorted(r["overrides"]["pan.diameter"] for r in rows) == [300, 330]
@@ -0,0 +1,137 @@
+"""
+test_tessellation.py
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from build123d import Box, Color, Compound, Cylinder, Sphere, export_stl
+
+from workboard.tessellation import (
+    PROFILES,
+    Mesh,
+    TessellationProfile,
+    get_profile,
+    tessellate,
+    write_gltf,
+    write_stl,
+)
+
+
+def _assembly():
+    box = Box(10, 20, 30)
+    box.label = "box"
+    box.color = Color(1, 0, 0, 1)
+    cyl = Cylinder(5, 10).translate((20, 0, 0))
+    cyl.label = "cyl"
+    return Compound(label="asm", children=[box, cyl])
+
+
+def test_tessellate_box():
+    (mesh,) = tessellate(Box(10, 20, 30))
+    assert mesh.triangles.shape == (12, 3)
+    assert mesh.triangles.dtype == np.uint32
+    np.testing.assert_allclose(mesh.vertices.min(axis=0), [-5, -10, -15])
+    np.testing.assert_allclose(mesh.vertices.max(axis=0), [5, 10, 15])
+    # outward normals: the signed volume of a closed mesh is positive
+    tri = mesh.triangle_vertices
+    volume = np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])).sum() / 6
+    assert volume == pytest.approx(10 * 20 * 30)
+
+
+def test_tessellate_applies_compound_location():
+    asm = _assembly().translate((0, 0, 100))
+    meshes = tessellate(asm)
+    assert [m.label for m in meshes] == ["box", "cyl"]
+    assert meshes[0].color == pytest.approx((1, 0, 0, 1))
+    vertices = Mesh.merge(meshes).vertices
+    bbox = asm.bounding_box()
+    np.testing.assert_allclose(vertices.min(axis=0), tuple(bbox.min), atol=1e-6)
+    np.testing.assert_allclose(vertices.max(axis=0), tuple(bbox.max), atol=1e-6)
+
+
+def test_write_stl_matches_occt_triangle_count(tmp_path):
+    shape = Cylinder(5, 10)
+    meshes = tessellate(shape)
+    write_stl(meshes, str(tmp_path / "a.stl"))
+    export_stl(shape, str(tmp_path / "b.stl"))
+    assert os.path.getsize(tmp_path / "a.stl") == os.path.getsize(tmp_path / "b.stl")
+
+    write_stl(meshes, str(tmp_path / "a.txt.stl"), ascii_format=True)
+    text = (tmp_path / "a.txt.stl").read_text()
+    assert text.startswith("solid")
+    assert text.count("facet normal") == len(meshes[0].triangles)
+
+
+def test_write_gltf(tmp_path):
+    meshes = tessellate(_assembly())
+    path = str(tmp_path / "asm.gltf")
+    write_gltf(meshes, path)
+    gltf = json.loads(open(path).read())
+    assert gltf["buffers"][0]["uri"] == "asm.bin"
+    assert os.path.getsize(tmp_path / "asm.bin") == gltf["buffers"][0]["byteLength"]
+    assert [n.get("name") for n in gltf["nodes"][1:]] == ["box", "cyl"]
+    assert len(gltf["materials"]) == 2
+    position = gltf["accessors"][
+        gltf["meshes"][0]["primitives"][0]["attributes"]["POSITION"]
+    ]
+    assert position["max"] == pytest.approx([0.005, 0.01, 0.015])
+
+
+def test_profiles():
+    assert get_profile() is PROFILES["print"]
+    with pytest.raises(ValueError):
+        get_profile("draft")
+    preview = get_profile("preview")
+    assert preview.deflection(10) == preview.tolerance
+    assert preview.deflection(1000) == pytest.approx(1000 * preview.relative)
+
+    sphere = Sphere(50)
+    counts = {
+        name: len(tessellate(sphere, profile=name)[0].triangles)
+        for name in ("preview", "print", "archival")
+    }
+    assert counts["preview"] * 10 < counts["print"] < counts["archival"]
+    assert counts["print"] == len(tessellate(sphere)[0].triangles)
+    # a previous, finer triangulation of the shape isn't reused for a coarser profile
+    assert len(tessellate(sphere, profile="preview")[0].triangles) == counts["preview"]
+
+
+def test_relative_deflection_is_per_leaf():
+    profile = TessellationProfile(
+        "test", tolerance=0.01, angular_tolerance=1.0, relative=0.01
+    )
+    small, large = Sphere(1), Sphere(100).translate((300, 0, 0))
+    meshes = tessellate(Compound(children=[small, large]), profile=profile)
+    assert [len(m.triangles) for m in meshes] == [
+        len(
+            tessellate(Sphere(1), 0.01 * small.bounding_box().diagonal, 1.0)[
+                0
+            ].triangles
+        ),
+        len(
+            tessellate(Sphere(100), 0.01 * large.bounding_box().diagonal, 1.0)[
+                0
+            ].triangles
+        ),
+    ]
+
+
+def test_tessellate_leaves_the_shape_untouched():
+    from OCP.BRep import BRep_Tool
+    from OCP.BRepMesh import BRepMesh_IncrementalMesh
+    from OCP.TopLoc import TopLoc_Location
+
+    from workboard.shapeio import shape_fingerprint
+
+    sphere = Sphere(50)
+    BRepMesh_IncrementalMesh(sphere.wrapped, 0.5, True, 0.5, True)
+    fingerprint = shape_fingerprint(sphere)
+    face = sphere.faces()[0].wrapped
+    before = BRep_Tool.Triangulation_s(face, TopLoc_Location()).NbTriangles()
+    tessellate(sphere, profile="archival")
+    assert BRep_Tool.Triangulation_s(face, TopLoc_Location()).NbTriangles() == before
+    assert shape_fingerprint(sphere) == fingerprint
+    assert len(tessellate(sphere, 0.5, 0.5)[0].triangles) == before
@@ -0,0 +1,45 @@
+"""
+test_textshapes.py
+"""
+
+import pytest
+from build123d import Axis, Text
+
+from workboard.annotations import Annotation, read_annotations, write_annotations
+from workboard.textshapes import cache_clear, cache_info, text_shape
+
+
+def _corners(shape):
+    bbox = shape.bounding_box()
+    return [*bbox.min, *bbox.max]
+
+
+def test_text_shape_is_cached():
+    cache_clear()
+    first = text_shape("A. Leg (L)", 40)
+    second = text_shape("A. Leg (L)", 40)
+    assert cache_info().hits == 1
+    assert first is not second
+    assert first.wrapped.IsPartner(second.wrapped)
+    assert _corners(first) == pytest.approx(_corners(Text("A. Leg (L)", 40)))
+    assert not text_shape("A. Leg (L)", 20).wrapped.IsPartner(first.wrapped)
+
+
+def test_text_shape_copies_are_independent():
+    first = text_shape("B", 40)
+    first.label = "label:B"
+    moved = first.rotate(Axis.X, 90).translate((100, 0, 0))
+    second = text_shape("B", 40)
+    assert second.label == ""
+    assert _corners(second) == pytest.approx(_corners(Text("B", 40)))
+    assert moved.bounding_box().min.X > 50
+
+
+def test_annotations_round_trip(tmp_path):
+    annotations = [
+        Annotation("A. Leg (L)", (1.0, 2.0, 3.0), (0.0, 0.0, 0.0), target="A. Leg (L)")
+    ]
+    path = write_annotations(
+        annotations, str(tmp_path / "out" / "easel.annotations.json")
+    )
+    assert read_annotations(path) == annotations
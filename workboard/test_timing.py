@@ -0,0 +1,95 @@
+"""
+test_timing.py
+"""
+
+import json
+
+import pytest
+
+from workboard import timing
+
+
+@pytest.fixture
+def enabled_timing():
+    timing.reset()
+    timing.enable()
+    yield timing
+    timing.disable()
+    timing.reset()
+
+
+def test_disabled_span_is_a_noop():
+    assert not timing.enabled
+    assert timing.span("x") is timing.NO_SPAN
+    with timing.span("x") as s:
+        assert s is None
+    assert timing.report()["spans"] == []
+
+
+def test_span_tree(enabled_timing):
+    @timing.timed()
+    def render():
+        with timing.span("fillet", edges=12):
+            pass
+        with timing.span("boolean"):
+            pass
+
+    with timing.span("outer"):
+        render()
+    (outer,) = timing.report()["spans"]
+    assert outer["name"] == "outer"
+    (inner,) = outer["children"]
+    assert inner["name"].endswith("render")
+    assert [c["name"] for c in inner["children"]] == ["fillet", "boolean"]
+    assert inner["children"][0]["attrs"] == {"edges": 12}
+    assert outer["duration_s"] >= inner["duration_s"] >= 0
+
+
+def test_write_reports(enabled_timing, tmp_path):
+    with timing.span("a"):
+        with timing.span("b", shape=object()):
+            pass
+    timing.write_json(str(tmp_path / "timing.json"))
+    timing.write_chrome_trace(str(tmp_path / "trace.json"))
+    assert json.loads((tmp_path / "timing.json").read_text())["spans"][0]["name"] == "a"
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [(e["name"], e["ph"]) for e in events] == [("a", "X"), ("b", "X")]
+    assert events[0]["dur"] >= events[1]["dur"]
+
+
+def _job(size):
+    with timing.span("job", size=size):
+        with timing.span("write"):
+            pass
+    return size * 2
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_spans_from_workers_are_merged(enabled_timing, processes):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool = ProcessPoolExecutor(1) if processes else ThreadPoolExecutor(1)
+    with pool:
+        with timing.span("export"):
+            futures = [timing.submit(pool, _job, size) for size in (1, 2)]
+            assert [timing.result(future) for future in futures] == [2, 4]
+    (export,) = timing.report()["spans"]
+    assert [(c["name"], c["attrs"]) for c in export["children"]] == [
+        ("job", {"size": 1}),
+        ("job", {"size": 2}),
+    ]
+    assert [c["name"] for c in export["children"][0]["children"]] == ["write"]
+    job = export["children"][0]
+    assert (
+        export["start_s"] - 0.01
+        <= job["start_s"]
+        <= export["start_s"] + export["duration_s"]
+    )
+    assert ("pid" in job) == processes
+    pids = {e["pid"] for e in timing.chrome_trace()["traceEvents"]}
+    assert len(pids) == (2 if processes else 1)
+
+
+def test_disabled_workers_return_no_spans():
+    assert timing.traced_call(False, _job, 1) == (2, [])
+    assert timing.report()["spans"] == []
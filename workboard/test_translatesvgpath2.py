@@ -0,0 +1,120 @@
+"""
+test_translatesvgpath2.py
+"""
+
+import math
+import os
+
+import pytest
+
+from workboard.translatesvgpath2 import (
+    SketchCache,
+    SVGPathError,
+    iter_segments,
+    iter_svg_paths,
+    segment_edge,
+    svg_path_to_build123d,
+    tokenize,
+)
+
+GROOVE_HANDLE_SVG = os.path.join(
+    os.path.dirname(__file__),
+    "projects",
+    "workboard",
+    "workboard01__groove_handle_2d_v0.0.4.svg",
+)
+
+
+def test_tokenize():
+    assert list(tokenize("M10-20.5.5e1 3L1,2zm1 1a5 5 0 014 4")) == [
+        ("M", [10, -20.5]),
+        ("L", [5, 3]),
+        ("L", [1, 2]),
+        ("z", []),
+        ("m", [1, 1]),
+        ("a", [5, 5, 0, 0, 1, 4, 4]),
+    ]
+    with pytest.raises(SVGPathError):
+        list(tokenize("M 0,0 L 1"))
+    with pytest.raises(SVGPathError):
+        list(tokenize("10,10"))
+    with pytest.raises(SVGPathError):
+        list(tokenize("M 0,0 X 1,1"))
+
+
+def test_relative_commands_advance_the_current_point():
+    segments = list(
+        iter_segments("m 1,1 2,0 v 3 h -2 c 0,1 1,1 1,0 s 1,-1 1,0 q 1,1 2,0 t 2,0 z")
+    )
+    assert [(s.kind, s.end) for s in segments] == [
+        ("M", (1, 1)),
+        ("L", (3, 1)),
+        ("L", (3, 4)),
+        ("L", (1, 4)),
+        ("C", (2, 4)),
+        ("C", (3, 4)),
+        ("Q", (5, 4)),
+        ("Q", (7, 4)),
+        ("Z", (1, 1)),
+    ]
+    # S and T reflect the previous control point
+    assert segments[5].points[0] == (2, 3)
+    assert segments[7].points[0] == (6, 3)
+
+
+def test_arc_edges_end_at_the_segment_end_points():
+    for d in (
+        "M0,0 A5,5 0 0 1 10,0",
+        "M0,0 A10,5 30 1 0 10,0",
+        "M0,0 a1,1 0 0 0 10,0",
+        "M3,4 A4,8 -20 1 1 -2,1",
+    ):
+        arc = list(iter_segments(d))[-1]
+        edge = segment_edge(arc)
+        ends = sorted([tuple(edge @ 0)[:2], tuple(edge @ 1)[:2]])
+        assert ends == [
+            pytest.approx(p, abs=1e-6) for p in sorted([arc.start, arc.end])
+        ]
+
+
+def test_faces_and_holes():
+    square = svg_path_to_build123d("M0,0 H10 V10 H0 Z", use_cache=False)
+    assert square.area == pytest.approx(100)
+    with_hole = svg_path_to_build123d(
+        "M0,0 H10 V10 H0 Z M2,2 h2 v2 h-2 z", use_cache=False
+    )
+    assert with_hole.area == pytest.approx(96)
+    half_disc = svg_path_to_build123d("M0,0 A5,5 0 0 1 10,0 Z", use_cache=False)
+    assert half_disc.area == pytest.approx(math.pi * 25 / 2)
+    assert half_disc.bounding_box().min.Y == pytest.approx(-5)
+    # open subpaths are ignored
+    assert svg_path_to_build123d("M0,0 L10,10", use_cache=False).faces() == []
+
+
+def test_groove_handle_document():
+    elements = list(iter_svg_paths(GROOVE_HANDLE_SVG))
+    assert [e.id for e in elements] == ["path2"]
+    assert [e.id for e in iter_svg_paths(GROOVE_HANDLE_SVG, include_hidden=True)] == [
+        "rect1",
+        "path2",
+    ]
+    sketch = svg_path_to_build123d(elements[0].d, use_cache=False)
+    assert len(sketch.faces()) == 1
+    bbox = sketch.bounding_box()
+    assert (bbox.min.X, bbox.max.X) == pytest.approx((69.77, 773.54))
+    assert (bbox.min.Y, bbox.max.Y) == pytest.approx((35.94, 1024.54))
+
+
+def test_sketch_cache(tmp_path):
+    d = "M0,0 H10 V10 H0 Z"
+    cache = SketchCache(str(tmp_path))
+    sketch = svg_path_to_build123d(d, cache=cache)
+    assert svg_path_to_build123d(d, cache=cache) is sketch
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert os.listdir(tmp_path) == [f"{SketchCache.key(d)}.brep"]
+
+    other = SketchCache(str(tmp_path))
+    loaded = svg_path_to_build123d(d, cache=other)
+    assert (other.disk_hits, other.misses) == (1, 0)
+    assert loaded.area == pytest.approx(100)
+    assert SketchCache.key(d) != SketchCache.key(d + " ")
@@ -0,0 +1,62 @@
+"""
+textshapes.py
+
+A cache of build123d Text shapes.
+
+Building a ``Text`` shape loads the font and builds a face per glyph,
+which costs milliseconds per label (tens of milliseconds for the first).
+``text_shape()`` builds each (string, size, font) once and returns a new
+Sketch sharing the cached geometry, so callers can label, move and rotate
+it freely.
+
+Usage::
+
+    text_obj = text_shape("A. Leg (L)", 40)
+    text_obj.label = "label:A. Leg (L)"
+    text_obj = text_obj.rotate(Axis.X, 90).translate(position)
+"""
+
+import functools
+from typing import Optional
+
+from build123d import FontStyle, Sketch, Text
+
+
+@functools.lru_cache(maxsize=512)
+def _text_prototype(
+    text: str, size: float, font: str, font_path: Optional[str], font_style: FontStyle
+) -> Sketch:
+    return Text(text, size, font=font, font_path=font_path, font_style=font_style)
+
+
+def text_shape(
+    text: str,
+    size: float,
+    font: str = "Arial",
+    font_path: Optional[str] = None,
+    font_style: FontStyle = FontStyle.REGULAR,
+) -> Sketch:
+    """
+    Return Text(text, size, font=..., ...) centered at the origin, built once.
+
+    Args:
+        text (str): the string.
+        size (float): font size in mm.
+        font (str): font name, as in build123d.Text.
+        font_path (str): optional path to a font file.
+        font_style (FontStyle): regular, bold or italic.
+
+    Returns:
+        Sketch: a new Sketch (without a label) sharing the cached faces.
+    """
+    prototype = _text_prototype(text, float(size), font, font_path, font_style)
+    return Sketch(prototype.wrapped)
+
+
+def cache_info():
+    """Return the functools cache statistics of the text shape cache."""
+    return _text_prototype.cache_info()
+
+
+def cache_clear() -> None:
+    _text_prototype.cache_clear()
@@ -0,0 +1,311 @@
+"""
+timing.py
+
+Lightweight, nestable timing spans for render, fillet, boolean,
+bounding-box and export stages.
+
+Timing is off by default; then ``span()`` returns a shared no-op context
+manager and ``@timed`` functions call straight through, so instrumented code
+costs about one global lookup per span. When on, spans are recorded as a
+tree that can be written as JSON or as a Chrome trace (chrome://tracing,
+https://ui.perfetto.dev).
+
+Spans recorded in worker processes are sent back with each job's result:
+submit jobs with ``timing.submit()`` and get their results with
+``timing.result()``, which adds the job's spans under the caller's current
+span (keeping the worker's pid, so the trace shows a row per process).
+
+Usage::
+
+    from workboard import timing
+
+    @timing.timed("render")
+    def render(self):
+        with timing.span("fillet", edges=len(edges)):
+            ...
+
+    timing.enable()
+    render()
+    future = timing.submit(executor, export_job, part)
+    timing.result(future)  # export_job's return value
+    timing.write_json("timing.json")
+    timing.write_chrome_trace("trace.json")
+
+Environment:
+    WORKBOARD_TIMING: path to write the JSON timing tree to at exit;
+        enables timing
+    WORKBOARD_TIMING_TRACE: path to write a Chrome trace to at exit;
+        enables timing
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Span:
+    """A timed stage: name, attributes, start/duration in seconds and child spans."""
+
+    __slots__ = ("name", "attrs", "start", "duration", "children", "thread", "pid")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.children: List["Span"] = []
+        self.thread = threading.get_ident()
+        self.pid = os.getpid()
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        (stack[-1].children if stack else _root_list()).append(self)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.duration = time.perf_counter() - self.start
+        _stack().pop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        node: Dict[str, Any] = {
+            "name": self.name,
+            "start_s": self.start - _epoch,
+            "duration_s": self.duration,
+        }
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if self.pid != os.getpid():
+            node["pid"] = self.pid
+        if self.children:
+            node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+    def export(self) -> Dict[str, Any]:
+        """Return the span tree for another process (see traced_call()), with wall-clock start times."""
+        return {
+            "name": self.name,
+            "attrs": {
+                k: v if isinstance(v, (int, float, str, bool)) else repr(v)
+                for k, v in self.attrs.items()
+            },
+            "wall_start": time.time() - (time.perf_counter() - self.start),
+            "duration": self.duration,
+            "thread": self.thread,
+            "pid": self.pid,
+            "children": [child.export() for child in self.children],
+        }
+
+    @classmethod
+    def from_export(cls, node: Dict[str, Any]) -> "Span":
+        """Rebuild a span tree from export(), in this process's perf_counter() time."""
+        span = cls(node["name"], node["attrs"])
+        span.start = node["wall_start"] - (time.time() - time.perf_counter())
+        span.duration = node["duration"]
+        span.thread = node["thread"]
+        span.pid = node["pid"]
+        span.children = [cls.from_export(child) for child in node["children"]]
+        return span
+
+
+class _NoSpan:
+    """The span of disabled timing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+NO_SPAN = _NoSpan()
+
+enabled = False
+_epoch = time.perf_counter()
+_roots: List[Span] = []
+_local = threading.local()
+
+
+def _root_list() -> List[Span]:
+    """The list new root spans go to: _roots, or a traced_call()'s in this thread."""
+    return getattr(_local, "roots", _roots)
+
+
+def _stack() -> List[Span]:
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def enable() -> None:
+    """Start recording spans."""
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording spans (recorded spans are kept)."""
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Drop all recorded spans."""
+    global _epoch
+    _roots.clear()
+    _epoch = time.perf_counter()
+
+
+def span(name: str, **attrs):
+    """Return a context manager that times a stage (a no-op when timing is off)."""
+    if not enabled:
+        return NO_SPAN
+    return Span(name, attrs)
+
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorate a function so that each call is a span (default name: its qualname)."""
+
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with Span(label, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_call(
+    record: bool, fn: Callable, *args, **kwargs
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Call fn (e.g. in a worker process) and return (its result, the spans it recorded).
+
+    Args:
+        record (bool): whether to record spans (timing.enabled of the
+            submitting process; workers may not have inherited it).
+    """
+    if not record:
+        return fn(*args, **kwargs), []
+    global enabled
+    was_enabled, enabled = enabled, True
+    roots: List[Span] = []
+    _local.roots, stack = roots, _stack()
+    _local.stack = []
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        del _local.roots
+        _local.stack = stack
+        enabled = was_enabled
+    return result, [root.export() for root in roots]
+
+
+def merge(spans: List[Dict[str, Any]]) -> None:
+    """Add spans from traced_call() under the current span (or as roots)."""
+    if not enabled or not spans:
+        return
+    stack = _stack()
+    (stack[-1].children if stack else _root_list()).extend(
+        Span.from_export(node) for node in spans
+    )
+
+
+def submit(executor: Executor, fn: Callable, *args, **kwargs) -> Future:
+    """Submit fn to executor, recording its spans in the worker; get its result with result()."""
+    return executor.submit(traced_call, enabled, fn, *args, **kwargs)
+
+
+def result(future: Future, timeout: Optional[float] = None) -> Any:
+    """Return the result of a job from submit(), merging its spans into this process's."""
+    value, spans = future.result(timeout)
+    merge(spans)
+    return value
+
+
+def report() -> Dict[str, Any]:
+    """Return the recorded spans as a nested, JSON-serializable tree."""
+    return {
+        "pid": os.getpid(),
+        "total_s": sum(root.duration for root in _roots),
+        "spans": [root.to_dict() for root in _roots],
+    }
+
+
+def chrome_trace() -> Dict[str, Any]:
+    """Return the recorded spans in Chrome's trace event format."""
+    events = []
+
+    def walk(node: Span) -> None:
+        events.append(
+            {
+                "name": node.name,
+                "ph": "X",
+                "ts": (node.start - _epoch) * 1e6,
+                "dur": node.duration * 1e6,
+                "pid": node.pid,
+                "tid": node.thread,
+                "args": {
+                    k: v if isinstance(v, (int, float, str, bool)) else repr(v)
+                    for k, v in node.attrs.items()
+                },
+            }
+        )
+        for child in node.children:
+            walk(child)
+
+    for root in _roots:
+        walk(root)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _write(path: str, data: Dict[str, Any]) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, default=repr)
+
+
+def write_json(path: str) -> None:
+    """Write report() to path."""
+    _write(path, report())
+
+
+def write_chrome_trace(path: str) -> None:
+    """Write chrome_trace() to path."""
+    _write(path, chrome_trace())
+
+
+def _write_at_exit(json_path: Optional[str], trace_path: Optional[str]) -> None:
+    if json_path:
+        write_json(json_path)
+    if trace_path:
+        write_chrome_trace(trace_path)
+
+
+def configure_from_env() -> None:
+    """Enable timing and write the reports at exit if WORKBOARD_TIMING(_TRACE) are set."""
+    json_path = os.environ.get("WORKBOARD_TIMING")
+    trace_path = os.environ.get("WORKBOARD_TIMING_TRACE")
+    if json_path or trace_path:
+        enable()
+        atexit.register(_write_at_exit, json_path, trace_path)
+
+
+configure_from_env()
@@ -1,42 +1,481 @@
+"""
+translatesvgpath2.py
 
-def svg_path_to_build123d(svg_path: str):
+Compile SVG path data (the ``d`` attribute of a <path>) to build123d sketches.
+
+The compiler has three stages:
+
+- ``tokenize(d)`` scans the path data with a regex state machine into
+  commands and numbers (and arc flags, which may be written without
+  separators, e.g. ``a5 5 0 013 4``).
+- ``iter_segments(d)`` streams absolute segments (line, cubic, quadratic,
+  arc, close) for the full SVG path grammar: M L H V C S Q T A Z, absolute
+  and relative, with implicit repeated commands.
+- ``svg_path_to_build123d(d)`` builds an edge per segment, a wire per
+  subpath and a face per closed subpath; closed subpaths nested inside
+  others are holes (the even-odd rule). Open subpaths are ignored.
+
+Coordinates are used as they are in the SVG (user units, y pointing
+down). build123d is imported on first use of a geometry stage, so tokenizing,
+streaming documents and cache lookups stay cheap.
+
+Compiled sketches are cached on disk by a hash of the path data (and the
+compiler and build123d versions), as BREP files, so that building the same
+path again reads the sketch instead of re-parsing it and rebuilding its
+wires. ``iter_svg_paths()`` streams the <path> elements of an SVG document
+(e.g. projects/workboard/workboard01__groove_handle_2d_v0.0.4.svg).
+
+Usage::
+
+    sketch = svg_path_to_build123d("m 0,0 h 10 v 10 h -10 z")
+    for element in iter_svg_paths("groove_handle.svg"):
+        sketch = svg_path_to_build123d(element.d)
+
+Environment:
+    WORKBOARD_SVG_CACHE_DIR: directory of the compiled sketch cache
+        (default: $XDG_CACHE_HOME/workboard/svg, or ~/.cache/workboard/svg)
+"""
+import functools
+import hashlib
+import importlib.metadata
+import math
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from build123d import Edge, Sketch
+
+# bump when compiled sketches change, to invalidate the disk cache
+COMPILER_VERSION = "1"
+
+# lines, arcs and closes shorter than this are dropped (e.g. a "z" after
+# relative moves that end a rounding error away from the subpath's start)
+TOLERANCE = 1e-7
+
+Point = Tuple[float, float]
+
+# number of arguments per repetition of each command
+ARITY = {"M": 2, "Z": 0, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7}
+
+_SEPARATOR = re.compile(r"[\s,]*")
+_COMMAND = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_FLAG = re.compile(r"[01]")
+
+
+class SVGPathError(ValueError):
+    """Path data that doesn't follow the SVG path grammar."""
+
+
+def tokenize(d: str) -> Iterator[Tuple[str, List[float]]]:
+    """
+    Yield (command, arguments) for each command repetition in path data.
+
+    Implicit repetitions are yielded separately, with a moveto's implicit
+    repetitions yielded as (relative) linetos, e.g. "m 1,2 3,4" yields
+    ("m", [1, 2]) and ("l", [3, 4]).
+
+    Raises:
+        SVGPathError: on a token that isn't a command or a number, or a
+            command with a missing argument.
+    """
+    pos = _SEPARATOR.match(d).end()
+    command = None
+    while pos < len(d):
+        match = _COMMAND.match(d, pos)
+        if match:
+            command = match.group()
+            pos = _SEPARATOR.match(d, match.end()).end()
+            if command in "Zz":
+                yield command, []
+                continue
+        elif command is None or command in "Zz":
+            raise SVGPathError(f"expected a command at {pos}: {d[pos:pos + 20]!r}")
+        args: List[float] = []
+        for i in range(ARITY[command.upper()]):
+            pattern = _FLAG if command in "Aa" and i in (3, 4) else _NUMBER
+            match = pattern.match(d, pos)
+            if not match:
+                expected = "a flag" if pattern is _FLAG else "a number"
+                raise SVGPathError(
+                    f"expected {expected} for {command!r} at {pos}: {d[pos:pos + 20]!r}"
+                )
+            args.append(float(match.group()))
+            pos = _SEPARATOR.match(d, match.end()).end()
+        yield command, args
+        if command in "Mm":  # subsequent pairs are implicit linetos
+            command = "L" if command == "M" else "l"
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    One absolute path segment.
+
+    kind is "M" (start of a subpath, at end), "L", "C" (points: 2 control
+    points), "Q" (1 control point), "A" (arc: see arc) or "Z" (close, back
+    to end).
+    """
+
+    kind: str
+    start: Point
+    end: Point
+    points: Tuple[Point, ...] = ()
+    # rx, ry, x-axis rotation (degrees), large-arc flag, sweep flag
+    arc: Tuple[float, float, float, bool, bool] = (0.0, 0.0, 0.0, False, False)
+
+
+def iter_segments(d: str) -> Iterator[Segment]:
+    """Yield the absolute segments of path data (see tokenize())."""
+    current = (0.0, 0.0)
+    subpath_start = current
+    last_control: Optional[Point] = None  # for S/T reflection
+    last_kind = ""
+    for command, args in tokenize(d):
+        kind = command.upper()
+        relative = command.islower()
+        ox, oy = current if relative else (0.0, 0.0)
+
+        def point(i: int) -> Point:
+            return (args[i] + ox, args[i + 1] + oy)
+
+        if kind == "M":
+            current = subpath_start = point(0)
+            yield Segment("M", current, current)
+        elif kind == "Z":
+            yield Segment("Z", current, subpath_start)
+            current = subpath_start
+        elif kind in "LHV":
+            if kind == "L":
+                end = point(0)
+            elif kind == "H":
+                end = (args[0] + ox, current[1])
+            else:
+                end = (current[0], args[0] + oy)
+            yield Segment("L", current, end)
+            current = end
+        elif kind in "CS":
+            if kind == "C":
+                c1, c2, end = point(0), point(2), point(4)
+            else:
+                c1 = _reflect(last_control, current) if last_kind in "CS" else current
+                c2, end = point(0), point(2)
+            yield Segment("C", current, end, (c1, c2))
+            last_control, current = c2, end
+        elif kind in "QT":
+            if kind == "Q":
+                c, end = point(0), point(2)
+            else:
+                c = _reflect(last_control, current) if last_kind in "QT" else current
+                end = point(0)
+            yield Segment("Q", current, end, (c,))
+            last_control, current = c, end
+        elif kind == "A":
+            end = point(5)
+            yield Segment(
+                "A",
+                current,
+                end,
+                arc=(abs(args[0]), abs(args[1]), args[2], bool(args[3]), bool(args[4])),
+            )
+            current = end
+        last_kind = kind
+
+
+def _reflect(control: Optional[Point], about: Point) -> Point:
+    if control is None:
+        return about
+    return (2 * about[0] - control[0], 2 * about[1] - control[1])
+
+
+def arc_center(segment: Segment) -> Tuple[Point, float, float, float, float]:
+    """
+    Return the center parameterization of an arc segment.
+
+    See the SVG spec, "Conversion from endpoint to center parameterization".
+
+    Returns:
+        tuple: (center, rx, ry, start angle, sweep angle), angles in
+        degrees; the radii are scaled up if they're too small to reach the
+        end point.
+    """
+    (x1, y1), (x2, y2) = segment.start, segment.end
+    rx, ry, phi, large_arc, sweep = segment.arc
+    cos_phi, sin_phi = math.cos(math.radians(phi)), math.sin(math.radians(phi))
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+    scale = x1p**2 / rx**2 + y1p**2 / ry**2
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    numerator = rx**2 * ry**2 - rx**2 * y1p**2 - ry**2 * x1p**2
+    denominator = rx**2 * y1p**2 + ry**2 * x1p**2
+    coef = math.sqrt(max(0.0, numerator / denominator))
+    if large_arc == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    center = (
+        cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2,
+        sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2,
+    )
+
+    def angle(ux, uy, vx, vy) -> float:
+        return math.degrees(math.atan2(ux * vy - uy * vx, ux * vx + uy * vy))
+
+    start_angle = angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    sweep_angle = angle(
+        (x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry
+    )
+    if not sweep and sweep_angle > 0:
+        sweep_angle -= 360
+    elif sweep and sweep_angle < 0:
+        sweep_angle += 360
+    return center, rx, ry, start_angle, sweep_angle
+
+
+def segment_edge(segment: Segment) -> Optional["Edge"]:
+    """Return the build123d Edge of a segment, or None for a (nearly) zero-length one."""
+    from build123d import AngularDirection, Bezier, Edge, Line, Plane, Vector
+
+    if (
+        segment.kind == "M"
+        or segment.kind in "LZA"
+        and math.dist(segment.start, segment.end) < TOLERANCE
+    ):
+        return None
+    start, end = Vector(*segment.start), Vector(*segment.end)
+    if segment.kind in "LZ":
+        return Line(start, end)
+    if segment.kind in "CQ":
+        return Bezier(start, *(Vector(*p) for p in segment.points), end)
+    rx, ry = segment.arc[:2]
+    if rx == 0 or ry == 0:
+        return Line(start, end)
+    center, rx, ry, start_angle, sweep_angle = arc_center(segment)
+    plane = Plane(origin=(*center, 0)).rotated((0, 0, segment.arc[2]))
+    return Edge.make_ellipse(
+        rx,
+        ry,
+        plane,
+        start_angle,
+        start_angle + sweep_angle,
+        (
+            AngularDirection.COUNTER_CLOCKWISE
+            if sweep_angle > 0
+            else AngularDirection.CLOCKWISE
+        ),
+    )
+
+
+def iter_subpaths(d: str) -> Iterator[Tuple[List["Edge"], bool]]:
+    """Yield (edges, closed) for each non-empty subpath of path data."""
+    edges: List["Edge"] = []
+    for segment in iter_segments(d):
+        if segment.kind == "M" and edges:
+            yield edges, False
+            edges = []
+        edge = segment_edge(segment)
+        if edge is not None:
+            edges.append(edge)
+        if segment.kind == "Z" and edges:
+            yield edges, True
+            edges = []
+    if edges:
+        yield edges, False
+
+
+def compile_path(d: str) -> "Sketch":
+    """Build the sketch of path data (uncached; see svg_path_to_build123d())."""
+    from build123d import Face, Sketch, Wire
+
+    outlines = [Face(Wire(edges)) for edges, closed in iter_subpaths(d) if closed]
+    outlines.sort(key=lambda face: face.area, reverse=True)
+    # even-odd: a closed subpath inside an odd number of others is a hole
+    depths: List[int] = []
+    parents: List[Optional[int]] = []
+    for i, face in enumerate(outlines):
+        point = face.outer_wire().vertices()[0].center()
+        parent = next(
+            (j for j in reversed(range(i)) if outlines[j].is_inside(point)), None
+        )
+        parents.append(parent)
+        depths.append(0 if parent is None else depths[parent] + 1)
+    faces = []
+    for i, face in enumerate(outlines):
+        if depths[i] % 2:
+            continue
+        holes = [
+            outlines[j].outer_wire() for j in range(len(outlines)) if parents[j] == i
+        ]
+        faces.append(Face(face.outer_wire(), holes) if holes else face)
+    return Sketch(faces)
+
+
+# --- compiled sketch cache ---
+
+
+@functools.lru_cache(maxsize=None)
+def build123d_version() -> str:
+    """Return the installed build123d version (without importing build123d)."""
+    return importlib.metadata.version("build123d")
+
+
+def _default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.environ.get("WORKBOARD_SVG_CACHE_DIR") or os.path.join(
+        base, "workboard", "svg"
+    )
+
+
+class SketchCache:
     """
-    Translates an SVG path string to build123d Python code.
-# 
+    Compiled sketches, in memory and as BREP files keyed by a hash of the path data.
+
     Args:
-        svg_path (str): The SVG path string.
-# 
+        directory (str): directory of the BREP files (None: memory only).
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._sketches: Dict[str, "Sketch"] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(d: str) -> str:
+        payload = "\0".join((COMPILER_VERSION, build123d_version(), d))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, f"{key}.brep")
+
+    def get(self, d: str) -> "Sketch":
+        """Return the sketch of path data, compiling it if it isn't cached."""
+        from build123d import Sketch, import_brep
+
+        key = self.key(d)
+        sketch = self._sketches.get(key)
+        if sketch is not None:
+            self.hits += 1
+            return sketch
+        if self.directory and os.path.exists(self.path(key)):
+            sketch = Sketch(import_brep(self.path(key)).wrapped)
+            self.hits += 1
+            self.disk_hits += 1
+        else:
+            sketch = compile_path(d)
+            self.misses += 1
+            if self.directory:
+                self._store(key, sketch)
+        self._sketches[key] = sketch
+        return sketch
+
+    def _store(self, key: str, sketch: "Sketch") -> None:
+        from build123d import export_brep
+
+        os.makedirs(self.directory, exist_ok=True)  # type: ignore[arg-type]
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{key[:12]}-", suffix=".brep", dir=self.directory
+        )
+        os.close(fd)
+        try:
+            export_brep(sketch, tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """Drop the in-memory sketches and reset the counters (the BREP files are kept)."""
+        self._sketches.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+
+DEFAULT_SKETCH_CACHE = SketchCache(directory=_default_cache_dir())
+
+
+def svg_path_to_build123d(
+    svg_path: str, cache: Optional[SketchCache] = None, use_cache: bool = True
+) -> "Sketch":
+    """
+    Translate an SVG path string to a build123d sketch.
+
+    Args:
+        svg_path (str): the SVG path data.
+        cache (SketchCache): cache to use; defaults to DEFAULT_SKETCH_CACHE.
+        use_cache (bool): set to False to always compile.
+
     Returns:
-        BuildSketch: A build123d sketch object representing the path.
-    """
-    with BuildSketch() as sketch:
-        for svg_path_line in svg_path.splitlines():
-            commands = svg_path_line.split()
-            i = 0
-            while i < len(commands):
-                command = commands[i]
-                if command == 'm':  # Move to
-                    x, y = map(float, commands[i + 1].split(','))
-                    #sketch.move_to(Vector(x, y))
-                    sketch.current_position = Vector(x,y)
-                    i += 2
-                elif command == 'c':  # Cubic Bezier curve
-                    control1 = tuple(map(float, commands[i + 1].split(',')))
-                    control2 = tuple(map(float, commands[i + 2].split(',')))
-                    end_point = tuple(map(float, commands[i + 3].split(',')))
-                    Bezier(sketch.current_position, Vector(*control1), Vector(*control2), Vector(*end_point))
-                    i += 4
-                elif command == 'V':  # Vertical line
-                    y = float(commands[i + 1])
-                    Line(sketch.current_position, Vector(sketch.current_position.X, y))
-                    i += 2
-                elif command == 'H':  # Horizontal line
-                    x = float(commands[i + 1])
-                    Line(sketch.current_position, Vector(x, sketch.current_position.Y))
-                    i += 2
-                elif command == 'z':  # Close path
-                    # sketch.close()  # TODO
-                    i += 1
-                else:
-                    i += 1  # Skip unrecognized commands
-    return sketch
\ No newline at end of file
+        Sketch: a face per closed subpath (with holes); shared with other
+        callers when cached, so move or copy it rather than changing it.
+
+    Raises:
+        SVGPathError: if svg_path isn't valid path data.
+    """
+    if not use_cache:
+        return compile_path(svg_path)
+    return (cache if cache is not None else DEFAULT_SKETCH_CACHE).get(svg_path)
+
+
+# --- SVG documents ---
+
+
+@dataclass(frozen=True)
+class SVGPathElement:
+    """A <path> element of an SVG document."""
+
+    id: Optional[str]
+    label: Optional[str]
+    d: str
+    hidden: bool
+
+
+_INKSCAPE_LABEL = "{http://www.inkscape.org/namespaces/inkscape}label"
+
+
+def _is_hidden(element: ET.Element) -> bool:
+    style = element.get("style") or ""
+    return "display:none" in style.replace(" ", "") or element.get("display") == "none"
+
+
+def iter_svg_paths(
+    source: Union[str, "os.PathLike[str]"], include_hidden: bool = False
+) -> Iterator[SVGPathElement]:
+    """
+    Stream the <path> elements of an SVG document, in document order.
+
+    Elements are parsed incrementally and discarded once yielded, so large
+    documents aren't held in memory.
+
+    Args:
+        source: filename (or file object) of the SVG document.
+        include_hidden (bool): also yield paths that are hidden
+            (display:none) themselves or in a hidden group.
+    """
+    hidden_depth = 0  # number of open hidden ancestors
+    stack: List[bool] = []
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            hidden = _is_hidden(element)
+            stack.append(hidden)
+            hidden_depth += hidden
+            continue
+        hidden = hidden_depth > 0
+        hidden_depth -= stack.pop()
+        if element.tag.rsplit("}", 1)[-1] == "path" and element.get("d"):
+            if include_hidden or not hidden:
+                yield SVGPathElement(
+                    element.get("id"),
+                    element.get(_INKSCAPE_LABEL),
+                    element.get("d"),
+                    hidden,
+                )
+        element.clear()